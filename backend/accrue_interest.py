@@ -0,0 +1,57 @@
+"""
+Interest accrual job — rolls daily simple interest into loans.accrued_interest_cents
+for every active loan. Schedule it nightly (cron / systemd timer).
+
+Run from backend/ directory:
+    python accrue_interest.py
+    python accrue_interest.py --chunk-size 50000
+    python accrue_interest.py --as-of 2026-10-16T00:00:00+00:00
+
+Each chunk of loans is one set-based UPDATE committed with a checkpoint, so
+the job can be killed at any point: the next invocation resumes the
+unfinished run from its last committed chunk, with the same as-of date.
+"""
+import argparse
+import sys
+from datetime import datetime
+
+from app.accrual_service import DEFAULT_CHUNK_SIZE, run_accrual
+from app.database import SessionLocal
+from app.models import AccrualRun
+
+
+def _progress(run: AccrualRun) -> None:
+    print(f"  chunk {run.chunks_done:,}: {run.loans_accrued:,} loan(s) accrued, checkpoint {run.last_loan_id}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="loans per transaction")
+    parser.add_argument("--as-of", type=datetime.fromisoformat, help="accrue up to this time (default: now)")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = run_accrual(
+            db,
+            as_of=args.as_of,
+            chunk_size=args.chunk_size,
+            on_chunk=None if args.quiet else _progress,
+        )
+    except ValueError as e:
+        print(f"  ! {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    rate = result.loans_accrued / result.elapsed_seconds if result.elapsed_seconds else 0.0
+    print(
+        f"\nAccrual {'resumed and ' if result.resumed else ''}complete as of {result.as_of.isoformat()}: "
+        f"{result.loans_accrued:,} loan(s) in {result.chunks:,} chunk(s), "
+        f"{result.elapsed_seconds:.1f}s ({rate:,.0f} loans/s)."
+    )
+
+
+if __name__ == "__main__":
+    main()
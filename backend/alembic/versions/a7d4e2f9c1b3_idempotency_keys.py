@@ -0,0 +1,33 @@
+"""idempotency_keys — stored responses for Idempotency-Key retries
+
+Revision ID: a7d4e2f9c1b3
+Revises: f3c7a9e1d2b8
+Create Date: 2026-10-16 00:00:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'a7d4e2f9c1b3'
+down_revision: Union[str, Sequence[str], None] = 'f3c7a9e1d2b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('idempotency_keys',
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('key', sa.String(length=255), nullable=False),
+    sa.Column('fingerprint', sa.String(length=64), nullable=False),
+    sa.Column('status_code', sa.Integer(), nullable=True),
+    sa.Column('response_body', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('idempotency_keys')
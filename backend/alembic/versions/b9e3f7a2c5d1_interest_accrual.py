@@ -0,0 +1,61 @@
+"""loans.interest_days_accrued and accrual_runs — nightly interest accrual
+
+Revision ID: b9e3f7a2c5d1
+Revises: a7d4e2f9c1b3
+Create Date: 2026-10-16 00:00:00.000000
+
+Existing active loans are marked accrued through today, so the first accrual
+run only adds new days. Their accrued_interest is restated to the interest
+repay_loan used to compute from scratch (principal_remaining × rate × UTC days
+since activation / 365, rounded to the cent), unless the stored balance is
+already larger — a balance left over from an earlier repayment is never
+written down by the migration.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'b9e3f7a2c5d1'
+down_revision: Union[str, Sequence[str], None] = 'a7d4e2f9c1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+DAYS_ACTIVE = {
+    "postgresql": "(CAST(now() AT TIME ZONE 'utc' AS DATE) - CAST(activated_at AS DATE))",
+    "sqlite":     "CAST(julianday(date('now')) - julianday(date(activated_at)) AS INTEGER)",
+}
+
+
+def upgrade() -> None:
+    op.add_column('loans', sa.Column('interest_days_accrued', sa.Integer(), nullable=False, server_default='0'))
+
+    days     = DAYS_ACTIVE[op.get_bind().dialect.name]
+    restated = f"""ROUND(CAST(
+            CASE WHEN amount > amount_repaid THEN amount - amount_repaid ELSE 0 END
+            * COALESCE(interest_rate, 0.05) * {days} / 365.0
+        AS NUMERIC), 2)"""
+    op.execute(f"""
+        UPDATE loans
+        SET accrued_interest = CASE WHEN COALESCE(accrued_interest, 0) > {restated}
+                                    THEN accrued_interest ELSE {restated} END,
+            interest_days_accrued = {days}
+        WHERE status = 'active' AND activated_at IS NOT NULL
+    """)
+
+    op.create_table('accrual_runs',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('as_of', sa.DateTime(), nullable=False),
+    sa.Column('last_loan_id', sa.String(), nullable=True),
+    sa.Column('loans_accrued', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('chunks_done', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('accrual_runs')
+    op.drop_column('loans', 'interest_days_accrued')
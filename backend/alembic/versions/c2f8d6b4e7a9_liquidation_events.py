@@ -0,0 +1,38 @@
+"""liquidation_events — results of the liquidation scanner
+
+Revision ID: c2f8d6b4e7a9
+Revises: b9e3f7a2c5d1
+Create Date: 2026-10-16 00:00:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c2f8d6b4e7a9'
+down_revision: Union[str, Sequence[str], None] = 'b9e3f7a2c5d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('liquidation_events',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('scan_id', sa.String(), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('action', sa.String(), nullable=False),
+    sa.Column('health_factor', sa.Float(), nullable=False),
+    sa.Column('liquidation_collateral', sa.Float(), nullable=False),
+    sa.Column('debt', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_liquidation_events_scan_id'), 'liquidation_events', ['scan_id'], unique=False)
+    op.create_index(op.f('ix_liquidation_events_user_id'), 'liquidation_events', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_liquidation_events_user_id'), table_name='liquidation_events')
+    op.drop_index(op.f('ix_liquidation_events_scan_id'), table_name='liquidation_events')
+    op.drop_table('liquidation_events')
@@ -0,0 +1,43 @@
+"""composite and partial indexes on assets/loans (user_id, status)
+
+Revision ID: c4d9e8a7f210
+Revises: b3f1c2d4e5a6
+Create Date: 2026-10-16 00:00:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c4d9e8a7f210'
+down_revision: Union[str, Sequence[str], None] = 'b3f1c2d4e5a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ACTIVE_ONLY = sa.text("status = 'active'")
+
+
+def upgrade() -> None:
+    # ── Assets ──────────────────────────────────────────────────
+    op.create_index('ix_assets_user_id_status', 'assets', ['user_id', 'status'])
+    # Partial indexes are honoured by Postgres and SQLite; other backends
+    # ignore the *_where kwargs and get a plain (user_id) index.
+    op.create_index(
+        'ix_assets_user_id_active', 'assets', ['user_id'],
+        postgresql_where=ACTIVE_ONLY, sqlite_where=ACTIVE_ONLY,
+    )
+
+    # ── Loans ───────────────────────────────────────────────────
+    op.create_index('ix_loans_user_id_status', 'loans', ['user_id', 'status'])
+    op.create_index(
+        'ix_loans_user_id_active', 'loans', ['user_id'],
+        postgresql_where=ACTIVE_ONLY, sqlite_where=ACTIVE_ONLY,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_loans_user_id_active', table_name='loans')
+    op.drop_index('ix_loans_user_id_status', table_name='loans')
+    op.drop_index('ix_assets_user_id_active', table_name='assets')
+    op.drop_index('ix_assets_user_id_status', table_name='assets')
@@ -0,0 +1,37 @@
+"""user_positions — materialized per-user position snapshot
+
+Revision ID: d5a1f3c2b9e4
+Revises: c4d9e8a7f210
+Create Date: 2026-10-16 00:00:00.000000
+
+Rows are backfilled lazily by the service layer the first time a user's
+position is read or written, so no data migration is needed here.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'd5a1f3c2b9e4'
+down_revision: Union[str, Sequence[str], None] = 'c4d9e8a7f210'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user_positions',
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('total_deposited', sa.Float(), nullable=False, server_default='0'),
+    sa.Column('total_eligible_collateral', sa.Float(), nullable=False, server_default='0'),
+    sa.Column('total_principal', sa.Float(), nullable=False, server_default='0'),
+    sa.Column('rate_weighted_principal', sa.Float(), nullable=False, server_default='0'),
+    sa.Column('accrued_interest', sa.Float(), nullable=False, server_default='0'),
+    sa.Column('interest_as_of', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_positions')
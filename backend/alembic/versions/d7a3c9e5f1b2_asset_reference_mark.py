@@ -0,0 +1,27 @@
+"""assets.reference_mark and ix_assets_type_status — price-feed re-appraisal
+
+Revision ID: d7a3c9e5f1b2
+Revises: c2f8d6b4e7a9
+Create Date: 2026-10-16 00:00:00.000000
+
+Existing assets were appraised statically, which is a mark of 1.0.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'd7a3c9e5f1b2'
+down_revision: Union[str, Sequence[str], None] = 'c2f8d6b4e7a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('assets', sa.Column('reference_mark', sa.Float(), nullable=False, server_default='1.0'))
+    op.create_index('ix_assets_type_status', 'assets', ['type', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_assets_type_status', table_name='assets')
+    op.drop_column('assets', 'reference_mark')
@@ -0,0 +1,46 @@
+"""user_exposures — asset type → exposed users index for event-driven revaluation
+
+Revision ID: e4b8d2f6a1c3
+Revises: d7a3c9e5f1b2
+Create Date: 2026-10-16 00:00:00.000000
+
+Backfilled from the ACTIVE/LOCKED assets of every user.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'e4b8d2f6a1c3'
+down_revision: Union[str, Sequence[str], None] = 'd7a3c9e5f1b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_exposures',
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('asset_type', sa.String(), nullable=False),
+        sa.Column('units', sa.Float(), nullable=False),
+        sa.Column('eligible_collateral', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id', 'asset_type'),
+    )
+    op.create_index('ix_user_exposures_asset_type', 'user_exposures', ['asset_type'], unique=False)
+    op.execute(
+        """
+        INSERT INTO user_exposures (user_id, asset_type, units, eligible_collateral)
+        SELECT user_id, type,
+               SUM(value * ltv_ratio / reference_mark),
+               SUM(appraised_value)
+        FROM assets
+        WHERE status IN ('active', 'locked')
+        GROUP BY user_id, type
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_exposures_asset_type', table_name='user_exposures')
+    op.drop_table('user_exposures')
@@ -0,0 +1,24 @@
+"""(user_id, created_at, id) indexes for keyset-paginated /assets and /loans
+
+Revision ID: e8b2c6d4a0f1
+Revises: d5a1f3c2b9e4
+Create Date: 2026-10-16 00:00:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+
+
+revision: str = 'e8b2c6d4a0f1'
+down_revision: Union[str, Sequence[str], None] = 'd5a1f3c2b9e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_assets_user_id_created_at_id', 'assets', ['user_id', 'created_at', 'id'])
+    op.create_index('ix_loans_user_id_created_at_id', 'loans', ['user_id', 'created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_loans_user_id_created_at_id', table_name='loans')
+    op.drop_index('ix_assets_user_id_created_at_id', table_name='assets')
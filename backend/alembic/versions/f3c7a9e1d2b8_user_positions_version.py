@@ -0,0 +1,23 @@
+"""user_positions.version — optimistic concurrency counter
+
+Revision ID: f3c7a9e1d2b8
+Revises: e8b2c6d4a0f1
+Create Date: 2026-10-16 00:00:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'f3c7a9e1d2b8'
+down_revision: Union[str, Sequence[str], None] = 'e8b2c6d4a0f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('user_positions', sa.Column('version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('user_positions', 'version')
@@ -0,0 +1,79 @@
+"""money as integer cents — NUMERIC(18, 0) amount columns
+
+Revision ID: f6c1a8e3d5b7
+Revises: e4b8d2f6a1c3
+Create Date: 2026-10-16 00:00:00.000000
+
+Every Float money column is replaced by a <name>_cents column holding whole
+cents, converted with NUMERIC rounding (half away from zero) so the result
+is the same on PostgreSQL and SQLite. rate_weighted_principal and
+user_exposures.units stay floating point but are rescaled to cents.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'f6c1a8e3d5b7'
+down_revision: Union[str, Sequence[str], None] = 'e4b8d2f6a1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# table → [(float column, cents column, nullable)]
+MONEY_COLUMNS = {
+    'assets': [
+        ('value', 'stated_value_cents', False),
+        ('appraised_value', 'appraised_value_cents', False),
+    ],
+    'loans': [
+        ('amount', 'amount_cents', False),
+        ('amount_repaid', 'amount_repaid_cents', False),
+        ('accrued_interest', 'accrued_interest_cents', False),
+        ('collateral_value_locked', 'collateral_value_locked_cents', True),
+    ],
+    'user_positions': [
+        ('total_deposited', 'total_deposited_cents', False),
+        ('total_eligible_collateral', 'total_eligible_collateral_cents', False),
+        ('total_principal', 'total_principal_cents', False),
+        ('accrued_interest', 'accrued_interest_cents', False),
+    ],
+    'user_exposures': [
+        ('eligible_collateral', 'eligible_collateral_cents', False),
+    ],
+    'liquidation_events': [
+        ('liquidation_collateral', 'liquidation_collateral_cents', False),
+        ('debt', 'debt_cents', False),
+    ],
+}
+
+# Float columns that stay Float but change unit from dollars to cents
+RESCALED_COLUMNS = [('user_positions', 'rate_weighted_principal'), ('user_exposures', 'units')]
+
+
+def _default(nullable: bool) -> str | None:
+    return None if nullable else '0'
+
+
+def upgrade() -> None:
+    for table, columns in MONEY_COLUMNS.items():
+        for old, new, nullable in columns:
+            op.add_column(table, sa.Column(new, sa.Numeric(18, 0), nullable=nullable, server_default=_default(nullable)))
+        assignments = ", ".join(f"{new} = ROUND(CAST({old} AS NUMERIC) * 100)" for old, new, _ in columns)
+        op.execute(f"UPDATE {table} SET {assignments}")
+        for old, _, _ in columns:
+            op.drop_column(table, old)
+    for table, column in RESCALED_COLUMNS:
+        op.execute(f"UPDATE {table} SET {column} = {column} * 100")
+
+
+def downgrade() -> None:
+    for table, column in RESCALED_COLUMNS:
+        op.execute(f"UPDATE {table} SET {column} = {column} / 100.0")
+    for table, columns in MONEY_COLUMNS.items():
+        for old, new, nullable in columns:
+            op.add_column(table, sa.Column(old, sa.Float(), nullable=nullable, server_default=_default(nullable)))
+        assignments = ", ".join(f"{old} = {new} / 100.0" for old, new, _ in columns)
+        op.execute(f"UPDATE {table} SET {assignments}")
+        for _, new, _ in columns:
+            op.drop_column(table, new)
@@ -0,0 +1,88 @@
+"""
+Accrual Service — nightly roll-forward of loan interest into loans.accrued_interest_cents.
+
+Active loans are walked in primary-key order, one chunk per transaction. Each
+chunk is a single set-based UPDATE (no rows are loaded into Python), committed
+together with the run's keyset checkpoint in accrual_runs. Every run accrues
+to one fixed `as_of`, and a loan's interest_days_accrued records how far it has
+been rolled, so resuming or re-running a chunk never double-counts interest.
+
+Position snapshots are unaffected: user_positions accrues the same simple
+interest from rate_weighted_principal on its own.
+"""
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from .models import AccrualRun
+from .repository import (
+    accrue_loan_interest, add_accrual_run, get_active_loan_chunk_end, get_unfinished_accrual_run,
+)
+from .service import _as_utc
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+@dataclass
+class AccrualRunResult:
+    run_id: str
+    as_of: datetime
+    resumed: bool           # picked up an unfinished run instead of starting a new one
+    chunks: int             # chunks committed by this invocation
+    loans_accrued: int      # loans updated across the whole run
+    elapsed_seconds: float
+
+
+def run_accrual(
+    db: Session,
+    as_of: Optional[datetime] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_chunk: Optional[Callable[[AccrualRun], None]] = None,
+) -> AccrualRunResult:
+    """
+    Accrue interest on every active loan up to `as_of` (default: now).
+
+    If a previous run did not finish, it is resumed from its checkpoint with
+    its original as_of; asking for a different as_of while one is pending
+    raises ValueError. `on_chunk` is called after each committed chunk.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+
+    started = time.perf_counter()
+    run     = get_unfinished_accrual_run(db)
+    resumed = run is not None
+    if run is None:
+        run = add_accrual_run(db, AccrualRun(as_of=as_of or datetime.now(timezone.utc)))
+    elif as_of is not None and _as_utc(run.as_of) != _as_utc(as_of):
+        raise ValueError(
+            f"Accrual run {run.id} as of {run.as_of.isoformat()} is unfinished; resume it before starting another"
+        )
+
+    chunks = 0
+    while True:
+        through_id = get_active_loan_chunk_end(db, run.last_loan_id, chunk_size)
+        if through_id is None:
+            break
+        run.loans_accrued += accrue_loan_interest(db, run.as_of, run.last_loan_id, through_id)
+        run.last_loan_id   = through_id
+        run.chunks_done   += 1
+        db.commit()   # chunk UPDATE and checkpoint land together
+        chunks += 1
+        if on_chunk:
+            on_chunk(run)
+
+    run.finished_at = datetime.now(timezone.utc)
+    db.commit()
+    return AccrualRunResult(
+        run_id=run.id,
+        as_of=run.as_of,
+        resumed=resumed,
+        chunks=chunks,
+        loans_accrued=run.loans_accrued,
+        elapsed_seconds=time.perf_counter() - started,
+    )
+
@@ -0,0 +1,70 @@
+"""
+Async Service — awaitable versions of the repository and service functions.
+
+Each function takes either an AsyncSession (DATABASE_ASYNC=true) or a sync
+Session and runs the underlying sync implementation through
+database.run_in_session, so business rules live in exactly one place
+(service.py / repository.py) and the route handlers never block the event loop.
+"""
+import functools
+from typing import Awaitable, Callable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from . import etag_service, idempotency_service, repository, service
+from .database import run_in_session
+from .metrics import stage
+
+T = TypeVar("T")
+
+
+def _awaitable(fn: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+    @functools.wraps(fn)
+    async def wrapper(db: Session | AsyncSession, *args, **kwargs) -> T:
+        with stage("service"):
+            return await run_in_session(db, fn, *args, **kwargs)
+    return wrapper
+
+
+# ────────────────────────────────────────
+# Repository
+# ────────────────────────────────────────
+get_user              = _awaitable(repository.get_user)
+get_user_by_email     = _awaitable(repository.get_user_by_email)
+add_user              = _awaitable(repository.add_user)
+list_assets           = _awaitable(repository.list_assets)
+list_loans            = _awaitable(repository.list_loans)
+get_loan              = _awaitable(repository.get_loan)
+get_collateral_totals = _awaitable(repository.get_collateral_totals)
+get_loan_totals       = _awaitable(repository.get_loan_totals)
+
+
+# ────────────────────────────────────────
+# Services
+# ────────────────────────────────────────
+create_asset         = _awaitable(service.create_asset)
+create_assets_bulk   = _awaitable(service.create_assets_bulk)
+get_user_assets      = _awaitable(service.get_user_assets)
+get_user_assets_page = _awaitable(service.get_user_assets_page)
+evaluate_loan        = _awaitable(service.evaluate_loan)
+evaluate_loan_curve  = _awaitable(service.evaluate_loan_curve)
+create_loan          = _awaitable(service.create_loan)
+repay_loan           = _awaitable(service.repay_loan)
+get_user_loans       = _awaitable(service.get_user_loans)
+get_user_loans_page  = _awaitable(service.get_user_loans_page)
+calculate_position   = _awaitable(service.calculate_position)
+
+
+# ────────────────────────────────────────
+# Conditional GETs
+# ────────────────────────────────────────
+resource_etag = _awaitable(etag_service.resource_etag)
+
+
+# ────────────────────────────────────────
+# Idempotency keys
+# ────────────────────────────────────────
+begin_idempotent_request    = _awaitable(idempotency_service.begin_request)
+complete_idempotent_request = _awaitable(idempotency_service.complete_request)
+release_idempotent_request  = _awaitable(idempotency_service.release_request)
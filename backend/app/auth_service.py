@@ -1,14 +1,28 @@
 """
 Auth Service — JWT issuance/validation and credential hashing.
+
+bcrypt is deliberately slow, so the async entry points run it on a small
+dedicated thread pool (bcrypt releases the GIL) with a cap on queued work.
+A login storm then saturates that pool instead of the request threadpool
+and event loop that serve assets, loans and positions.
 """
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Callable, Optional, TypeVar
 
 from jose import jwt, JWTError
 from passlib.context import CryptContext
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from . import async_service
+from .cache import TTLCache
 from .config import settings
+from .metrics import stage
 from .models import User
 from .repository import get_user_by_email, add_user
 
@@ -26,6 +40,46 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+# ────────────────────────────────────────
+# Password worker pool
+# ────────────────────────────────────────
+class PasswordHasherBusy(Exception):
+    """Too many hash/verify jobs queued — shed load rather than queue unboundedly."""
+
+
+T = TypeVar("T")
+
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers,
+    thread_name_prefix="bcrypt",
+)
+_pending_lock = threading.Lock()
+_pending_jobs = 0
+
+
+async def _run_password_job(fn: Callable[..., T], *args) -> T:
+    global _pending_jobs
+    with _pending_lock:
+        if _pending_jobs >= settings.password_hash_max_pending:
+            raise PasswordHasherBusy("Authentication is busy, retry shortly")
+        _pending_jobs += 1
+    try:
+        loop = asyncio.get_running_loop()
+        with stage("auth"):
+            return await loop.run_in_executor(_password_executor, fn, *args)
+    finally:
+        with _pending_lock:
+            _pending_jobs -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_password_job(hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await _run_password_job(verify_password, plain, hashed)
+
+
 def create_access_token(user_id: str) -> str:
     expire = datetime.now(timezone.utc) + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
     payload = {"sub": user_id, "exp": expire}
@@ -41,6 +95,47 @@ def decode_access_token(token: str) -> Optional[str]:
         return None
 
 
+# ────────────────────────────────────────
+# Principal cache
+# ────────────────────────────────────────
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as seen by routes — a plain value, safe to share across sessions."""
+    id: str
+    name: str
+    email: str
+
+
+principal_cache: TTLCache[str, Principal] = TTLCache(
+    maxsize=settings.principal_cache_size,
+    ttl=settings.principal_cache_ttl,
+)
+
+
+def invalidate_principal(user_id: str) -> None:
+    principal_cache.pop(user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target: User) -> None:
+    # Any in-process change to a user (name, email, password) evicts its principal
+    invalidate_principal(target.id)
+
+
+async def load_principal(db: Session | AsyncSession, user_id: str) -> Optional[Principal]:
+    """Cached principal for `user_id`, loading from the DB on a miss. None if the user is gone."""
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+    user = await async_service.get_user(db, user_id)
+    if not user:
+        return None
+    principal = Principal(id=user.id, name=user.name, email=user.email)
+    principal_cache.set(user_id, principal)
+    return principal
+
+
 def register_user(db: Session, name: str, email: str, password: str) -> User:
     user = User(
         name=name,
@@ -57,3 +152,23 @@ def authenticate_user(db: Session, email: str, password: str) -> User:
     if not verify_password(password, user.password_hash):
         raise ValueError("Invalid email or password")
     return user
+
+
+async def register_user_async(
+    db: Session | AsyncSession, name: str, email: str, password: str,
+) -> User:
+    user = User(
+        name=name,
+        email=email,
+        password_hash=await hash_password_async(password),
+    )
+    return await async_service.add_user(db, user)
+
+
+async def authenticate_user_async(db: Session | AsyncSession, email: str, password: str) -> User:
+    user = await async_service.get_user_by_email(db, email)
+    if not user or not user.password_hash:
+        raise ValueError("Invalid email or password")
+    if not await verify_password_async(password, user.password_hash):
+        raise ValueError("Invalid email or password")
+    return user
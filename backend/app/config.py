@@ -7,6 +7,40 @@ class Settings(BaseSettings):
     frontend_url: str = "http://localhost:3000"
     environment: str = "development"
 
+    # Connection pool (ignored for SQLite, which manages its own pool)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0     # seconds to wait for a connection before erroring
+    db_pool_recycle: int = 1800       # seconds; stay under RDS / proxy idle timeouts
+    db_pool_pre_ping: bool = True     # validate connections on checkout
+
+    # bcrypt runs on a bounded worker pool, off the request threads / event loop
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64   # queued hash/verify jobs before /auth returns 503
+
+    # Authenticated principal cache (per worker; 0 disables)
+    principal_cache_ttl: float = 60.0
+    principal_cache_size: int = 10_000
+
+    # Idempotency-Key records on POST /loans and /loans/{id}/repay
+    idempotency_key_ttl: int = 86_400   # seconds a stored response is replayed for
+    idempotency_claim_lease: int = 60   # seconds an unfinished claim refuses retries before one may take it over
+
+    # Price feed: "static" (all marks 1.0) or "replay:<path>" (recorded ticks)
+    price_feed: str = "static"
+    price_mark_ttl: float = 30.0          # seconds before a cached mark is refetched
+    price_refresh_interval: float = 5.0   # seconds between background refreshes
+
+    # GET /position/stream: pub/sub between writers and open streams ("memory" per worker process, or "loopback")
+    position_broker: str = "memory"
+    position_stream_keepalive: float = 15.0   # seconds between SSE comments on an idle stream
+
+    # Request metrics: /metrics is always served; Server-Timing exposes stage timings to clients
+    server_timing: bool = True
+
+    # Async DB stack: AsyncEngine (asyncpg / aiosqlite) behind async route handlers
+    database_async: bool = False
+
     class Config:
         env_file = ".env"
         extra = "ignore"
@@ -1,11 +1,108 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import threading
+import time
+from typing import Any, Callable, TypeVar
+
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+from starlette.concurrency import run_in_threadpool
 
 from app.config import settings
 
 DATABASE_URL = settings.database_url
 
-engine = create_engine(DATABASE_URL)
+
+# ─────────────────────────────────────
+# Connection pool
+# ─────────────────────────────────────
+class PoolStats:
+    """Checkout wait-time counters for one pool (reported by /health/db-pool)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+
+class _TimedCheckoutMixin:
+    """Times how long callers wait for a pooled connection (QueuePool._do_get)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record_wait(time.perf_counter() - start)
+        return conn
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(url: str, is_async: bool = False) -> dict[str, Any]:
+    """create_engine kwargs for the configured pool. SQLite keeps its default pool."""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass":     InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size":     settings.db_pool_size,
+        "max_overflow":  settings.db_max_overflow,
+        "pool_timeout":  settings.db_pool_timeout,
+        "pool_recycle":  settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def pool_status(pool: Pool) -> dict[str, Any]:
+    """Point-in-time pool occupancy plus cumulative wait counters."""
+    status: dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=settings.db_max_overflow,
+            timeout_seconds=pool.timeout(),
+        )
+    stats: PoolStats | None = getattr(pool, "stats", None)
+    if stats is not None:
+        waits = stats.checkouts + stats.timeouts
+        status.update(
+            checkouts=stats.checkouts,
+            checkout_timeouts=stats.timeouts,
+            wait_seconds_total=round(stats.wait_seconds_total, 6),
+            wait_seconds_max=round(stats.wait_seconds_max, 6),
+            wait_seconds_avg=round(stats.wait_seconds_total / waits, 6) if waits else 0.0,
+        )
+    return status
+
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
 
 SessionLocal = sessionmaker(
     bind=engine,
@@ -22,3 +119,58 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ─────────────────────────────────────
+# Async mode (DATABASE_ASYNC=true)
+# ─────────────────────────────────────
+ASYNC_DRIVERS = {
+    "postgresql":          "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite":              "sqlite+aiosqlite",
+    "sqlite+pysqlite":     "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Swap a sync driver for its asyncio counterpart (asyncpg / aiosqlite)."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+# Only built in async mode, so sync deployments don't need asyncpg installed.
+async_engine = (
+    create_async_engine(to_async_url(DATABASE_URL), **engine_options(DATABASE_URL, is_async=True))
+    if settings.database_async else None
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,   # ORM objects are serialized after the session's greenlet context
+)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Session dependency used by the async route handlers — selected by config
+get_session = get_async_db if settings.database_async else get_db
+
+
+T = TypeVar("T")
+
+
+async def run_in_session(db: Session | AsyncSession, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a sync repository/service function `fn(session, *args, **kwargs)` without
+    blocking the event loop:
+      - AsyncSession → AsyncSession.run_sync (I/O awaits on the async driver)
+      - Session      → Starlette's threadpool, as FastAPI does for `def` routes
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
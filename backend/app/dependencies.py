@@ -1,30 +1,42 @@
 """
 FastAPI dependencies — inject authenticated user into routes.
+
+get_current_user_id trusts the signed JWT alone (no DB round trip) and is
+what data routes use, since they only need the id to scope queries.
+get_current_user additionally resolves the full principal, served from the
+per-worker principal cache when possible.
 """
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from .database import get_db
-from .auth_service import decode_access_token
-from .repository import get_user
-from .models import User
+from .database import get_session
+from .auth_service import decode_access_token, load_principal, Principal
+from .metrics import stage
 
 security = HTTPBearer()
 
 
-def get_current_user(
+async def get_current_user_id(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
-    token = credentials.credentials
-    user_id = decode_access_token(token)
+) -> str:
+    with stage("auth"):
+        user_id = decode_access_token(credentials.credentials)
     if not user_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
         )
-    user = get_user(db, user_id)
+    return user_id
+
+
+async def get_current_user(
+    user_id: str = Depends(get_current_user_id),
+    db: Session | AsyncSession = Depends(get_session),
+) -> Principal:
+    with stage("auth"):
+        user = await load_principal(db, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
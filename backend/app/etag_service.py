@@ -0,0 +1,54 @@
+"""
+ETag Service — strong validators for the per-user read endpoints (/position,
+/assets, /loans), derived from a primary-key read instead of the service layer.
+
+user_positions.version is the per-user change counter: every write to a
+user's assets or loans bumps it in the same transaction (create_asset(s),
+create_loan — approved or rejected — repay_loan, liquidation close-out and
+revaluation). A validator hashes that version together with whatever else
+the payload depends on:
+
+  - /position  whole days since interest_as_of: displayed interest accrues daily
+  - /loans     the latest accrual run's progress: the nightly job rewrites
+               loans.accrued_interest_cents without touching positions
+  - all        the request's query string (page size, cursor, filters)
+
+The version is read before the payload is built, so a write racing the
+request can only make the validator older than the body — a client may miss
+one 304, never receive a stale one.
+"""
+import hashlib
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from .repository import get_latest_accrual_progress, get_position_version
+from .service import _whole_days
+
+RESOURCES = ("position", "assets", "loans")
+
+
+def resource_etag(db: Session, user_id: str, resource: str, query: str = "", now: Optional[datetime] = None) -> str:
+    """Quoted strong ETag for `resource` as `user_id` would see it at `now`."""
+    if resource not in RESOURCES:
+        raise ValueError(f"No ETag for resource '{resource}'")
+    now   = now or datetime.now(timezone.utc)
+    state = get_position_version(db, user_id)
+    parts = [resource, user_id, str(state.version) if state else "-", query]
+    if resource == "position" and state is not None:
+        parts.append(str(max(_whole_days(state.interest_as_of, now), 0)))
+    if resource == "loans":
+        accrual = get_latest_accrual_progress(db)
+        parts.append(f"{accrual.id}:{accrual.chunks_done}" if accrual else "-")
+    digest = hashlib.sha256("\x1f".join(parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match semantics (RFC 9110 §13.1.2): '*' or any listed tag, compared weakly."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
@@ -0,0 +1,121 @@
+"""
+Idempotency Service — replay-safe POST /loans and POST /loans/{id}/repay.
+
+A client-supplied Idempotency-Key is claimed (row inserted, no response yet)
+before the handler runs and filled with the handler's response once it has
+committed. A retry with the same key gets the stored response back without
+re-running the risk engine or the repayment waterfall; a retry that arrives
+while the original is still in flight is refused rather than executed twice.
+
+The claim and the stored response are separate commits from the handler's
+own, so a worker that dies in between leaves the claim unfinished. Claims
+therefore hold a lease (IDEMPOTENCY_CLAIM_LEASE, well above any handler's
+running time): once it has run out, the next retry takes the claim over and
+runs the handler. A crash after the handler committed but before its
+response was stored is the one case that can then execute twice.
+"""
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .models import IdempotencyKey
+from .repository import (
+    add_idempotency_key, delete_idempotency_key, get_idempotency_key, reclaim_idempotency_key,
+)
+from .service import _as_utc
+
+
+# ────────────────────────────────────────
+# Custom Exceptions
+# ────────────────────────────────────────
+class IdempotencyKeyReused(Exception):
+    """The key was already used for a different request."""
+    pass
+
+
+class IdempotencyKeyInFlight(Exception):
+    """The original request for this key has not finished yet."""
+    pass
+
+
+@dataclass
+class StoredResponse:
+    status_code: int
+    body: Any
+
+
+def request_fingerprint(operation: str, payload: dict) -> str:
+    """Stable hash of what a request asks for, to detect a key reused for something else."""
+    canonical = json.dumps([operation, payload], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+# ────────────────────────────────────────
+# Request lifecycle
+# ────────────────────────────────────────
+def begin_request(db: Session, user_id: str, key: str, fingerprint: str) -> Optional[StoredResponse]:
+    """
+    Claim `key` for this request. Returns None when the caller should run the
+    handler, or the stored response when this is a replay. An unfinished
+    claim older than the lease is taken over rather than refused.
+    """
+    now    = datetime.now(timezone.utc)
+    record = get_idempotency_key(db, user_id, key)
+    if record is not None and _as_utc(record.expires_at) <= now:
+        delete_idempotency_key(db, record)
+        record = None
+
+    if record is None:
+        try:
+            add_idempotency_key(db, IdempotencyKey(
+                user_id=user_id,
+                key=key,
+                fingerprint=fingerprint,
+                created_at=now,
+                expires_at=now + timedelta(seconds=settings.idempotency_key_ttl),
+            ))
+            return None
+        except IntegrityError:
+            # A concurrent request with the same key claimed it first
+            db.rollback()
+            record = get_idempotency_key(db, user_id, key)
+            if record is None:
+                raise IdempotencyKeyInFlight("A request with this Idempotency-Key is in progress")
+
+    if record.fingerprint != fingerprint:
+        raise IdempotencyKeyReused("Idempotency-Key was already used with a different request")
+    if record.status_code is None:
+        lease_ended = _as_utc(record.created_at) + timedelta(seconds=settings.idempotency_claim_lease) <= now
+        if lease_ended and reclaim_idempotency_key(
+            db, record, claimed_at=now, expires_at=now + timedelta(seconds=settings.idempotency_key_ttl),
+        ):
+            return None   # the original holder died without completing; run it again
+        raise IdempotencyKeyInFlight("A request with this Idempotency-Key is in progress")
+    return StoredResponse(status_code=record.status_code, body=record.response_body)
+
+
+def complete_request(db: Session, user_id: str, key: str, status_code: int, body: Any) -> None:
+    """Store the handler's response so later retries replay it."""
+    # Successful handlers have already committed; a failed one may have left
+    # pending changes in the session that must not ride along with this commit.
+    db.rollback()
+    record = get_idempotency_key(db, user_id, key)
+    if record is None:
+        return
+    record.status_code   = status_code
+    record.response_body = body
+    db.commit()
+
+
+def release_request(db: Session, user_id: str, key: str) -> None:
+    """Forget an unfinished claim (the handler failed transiently) so the key can be retried."""
+    db.rollback()
+    record = get_idempotency_key(db, user_id, key)
+    if record is not None and record.status_code is None:
+        delete_idempotency_key(db, record)
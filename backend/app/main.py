@@ -1,28 +1,66 @@
 # Controller Layer
-from fastapi import FastAPI, Depends, HTTPException, Path, status
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+import orjson
+
+from fastapi import FastAPI, Depends, Header, HTTPException, Path, Query, Request, status
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse, Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
-from app.database import get_db
+from app.database import get_session, engine, async_engine, pool_status
 from app.schemas import (
     RegisterRequest, LoginRequest, LoginResponse, UserRead,
     AssetCreate, AssetRead, AssetPreviewResponse,
+    BulkAssetRequest, BulkAssetResponse, BulkRowError,
     LoanRequest, LoanRead, LoanEvaluationResponse,
+    LoanEvaluationBatchRequest, LoanEvaluationBatchResponse,
     RepayRequest, PositionResponse,
 )
-from app.auth_service import register_user, authenticate_user, create_access_token
+from app.auth_service import (
+    register_user_async, authenticate_user_async, create_access_token,
+    PasswordHasherBusy, Principal,
+)
 from app.service import (
-    preview_asset, create_asset, get_user_assets,
-    evaluate_loan, create_loan, repay_loan, get_user_loans,
-    calculate_position,
-    ForbiddenError,
+    preview_asset, NotFoundError, ForbiddenError, ConflictError,
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE,
 )
-from app.dependencies import get_current_user
-from app.models import User
+from app.async_service import (
+    create_asset, create_assets_bulk, get_user_assets_page,
+    evaluate_loan, evaluate_loan_curve, create_loan, repay_loan, get_user_loans_page,
+    calculate_position, resource_etag,
+    begin_idempotent_request, complete_idempotent_request, release_idempotent_request,
+)
+from app.etag_service import etag_matches
+from app.idempotency_service import IdempotencyKeyReused, IdempotencyKeyInFlight, request_fingerprint
+from app.risk_engine import EvaluationResult
+from app.rules import AssetStatus, LoanStatus
+from app.dependencies import get_current_user, get_current_user_id
 from app.config import settings
+from app.price_feed import provider_from_settings, run_mark_refresher
+from app.metrics import MetricsMiddleware, instrument_sql, registry as metrics_registry
+from app.position_events import Subscription, position_broker
+
+logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Lenda API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the per-worker mark cache off the request path
+    refresher = asyncio.create_task(
+        run_mark_refresher(provider_from_settings(), settings.price_refresh_interval)
+    )
+    yield
+    refresher.cancel()
+
+
+app = FastAPI(title="Lenda API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -30,27 +68,69 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Idempotent-Replayed", "Server-Timing", "ETag"],
 )
+# Outermost, so its timings cover CORS and everything inside it
+app.add_middleware(MetricsMiddleware, server_timing=settings.server_timing)
+instrument_sql()
+
+
+# Hot read paths return ORJSONResponse directly: FastAPI then skips re-validating
+# the payload against response_model (still used for the OpenAPI schema), and
+# orjson encodes the plain dicts/rows the service built.
+def _page_response(records: list[dict], next_cursor: Optional[str], etag: str) -> ORJSONResponse:
+    headers = _validator_headers(etag)
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return ORJSONResponse(records, headers=headers)
+
+
+# Per-user reads carry a strong ETag (etag_service); If-None-Match is checked
+# against it before the service layer runs, so a revalidation costs one
+# primary-key read. no-cache: clients may store the body but must revalidate.
+def _validator_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_validator_headers(etag))
+
+
+# Called by asset/loan writes after they commit. Best effort: the write has
+# already succeeded, so a failure here is logged, never surfaced (it would
+# also release the request's Idempotency-Key and let a retry write twice).
+async def _push_position(db: Session | AsyncSession, user_id: str) -> None:
+    if not position_broker.has_subscribers(user_id):
+        return
+    try:
+        position = await calculate_position(db, user_id)
+        position_broker.publish(user_id, position.model_dump())
+    except Exception:
+        logger.exception("Could not push position update for user %s", user_id)
 
 
 # ─────────────────────────────────────
 # Auth
 # ─────────────────────────────────────
 @app.post("/auth/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def register(body: RegisterRequest, db: Session = Depends(get_db)):
+async def register(body: RegisterRequest, db: Session | AsyncSession = Depends(get_session)):
     try:
-        user = register_user(db, name=body.name, email=body.email, password=body.password)
+        user = await register_user_async(db, name=body.name, email=body.email, password=body.password)
         return user
     except IntegrityError:
         raise HTTPException(status_code=400, detail="Email already registered")
+    except PasswordHasherBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
 
 
 @app.post("/auth/login", response_model=LoginResponse)
-def login(body: LoginRequest, db: Session = Depends(get_db)):
+async def login(body: LoginRequest, db: Session | AsyncSession = Depends(get_session)):
     try:
-        user = authenticate_user(db, body.email, body.password)
+        user = await authenticate_user_async(db, body.email, body.password)
     except ValueError:
         raise HTTPException(status_code=401, detail="Invalid email or password")
+    except PasswordHasherBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     token = create_access_token(user.id)
     return LoginResponse(
         id=user.id, name=user.name, email=user.email,
@@ -59,7 +139,7 @@ def login(body: LoginRequest, db: Session = Depends(get_db)):
 
 
 @app.get("/auth/me", response_model=UserRead)
-def me(current_user: User = Depends(get_current_user)):
+async def me(current_user: Principal = Depends(get_current_user)):
     return current_user
 
 
@@ -67,11 +147,11 @@ def me(current_user: User = Depends(get_current_user)):
 # Assets  (all scoped to current user)
 # ─────────────────────────────────────
 @app.post("/assets/preview", response_model=AssetPreviewResponse)
-def preview_asset_endpoint(
+async def preview_asset_endpoint(
     body: AssetCreate,
-    _: User = Depends(get_current_user),
+    _: str = Depends(get_current_user_id),
 ):
-    """Valuation dry-run — returns appraised_value without saving."""
+    """Valuation dry-run — returns appraised_value without saving. Reads cached marks only."""
     try:
         result = preview_asset(body.type, body.stated_value)
         return AssetPreviewResponse(
@@ -80,50 +160,99 @@ def preview_asset_endpoint(
             ltv_ratio=result.ltv_ratio,
             appraised_value=result.appraised_value,
             risk_tier=result.risk_tier,
+            mark=result.mark,
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.get("/assets", response_model=list[AssetRead])
-def list_assets_endpoint(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    return get_user_assets(db, current_user.id)
+async def list_assets_endpoint(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    asset_status: Optional[AssetStatus] = Query(None, alias="status"),
+    asset_type: Optional[str] = Query(None, alias="type"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    user_id: str = Depends(get_current_user_id),
+    db: Session | AsyncSession = Depends(get_session),
+):
+    """Newest first. When more rows exist, the X-Next-Cursor response header is set."""
+    etag = await resource_etag(db, user_id, "assets", request.url.query)
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    try:
+        records, next_cursor = await get_user_assets_page(
+            db, user_id,
+            limit=limit,
+            cursor=cursor,
+            status=asset_status.value if asset_status else None,
+            asset_type=asset_type,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _page_response(records, next_cursor, etag)
 
 
 @app.post("/assets", response_model=AssetRead, status_code=status.HTTP_201_CREATED)
-def create_asset_endpoint(
+async def create_asset_endpoint(
     body: AssetCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+    db: Session | AsyncSession = Depends(get_session),
 ):
     try:
-        return create_asset(
+        asset = await create_asset(
             db,
-            user_id=current_user.id,
+            user_id=user_id,
             asset_type=body.type,
             stated_value=body.stated_value,
             description=body.description,
         )
+    except ConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await _push_position(db, user_id)
+    return asset
+
+
+@app.post("/assets/bulk", response_model=BulkAssetResponse)
+async def create_assets_bulk_endpoint(
+    body: BulkAssetRequest,
+    user_id: str = Depends(get_current_user_id),
+    db: Session | AsyncSession = Depends(get_session),
+):
+    """Bulk onboarding — valid rows are inserted in one transaction, invalid rows reported by index."""
+    try:
+        result = await create_assets_bulk(db, user_id, body.assets)
+    except ConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    if result.created:
+        await _push_position(db, user_id)
+    return BulkAssetResponse(
+        created=result.created,
+        errors=[BulkRowError(index=i, detail=detail) for i, detail in result.errors.items()],
+    )
 
 
 # ─────────────────────────────────────
 # Loans  (all scoped to current user)
 # ─────────────────────────────────────
 @app.post("/loans/evaluate", response_model=LoanEvaluationResponse)
-def evaluate_loan_endpoint(
+async def evaluate_loan_endpoint(
     body: LoanRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+    db: Session | AsyncSession = Depends(get_session),
 ):
     """Risk engine dry-run — returns approval decision without saving."""
-    result = evaluate_loan(db, current_user.id, body.amount)
+    result = await evaluate_loan(db, user_id, body.amount)
     return LoanEvaluationResponse(
         approved=result.approved,
         requested_amount=result.requested_amount,
-        projected_ltv=result.projected_ltv if result.projected_ltv != float("inf") else 999.0,
-        health_factor=result.health_factor if result.health_factor != float("inf") else 999.0,
+        projected_ltv=_finite_ratio(result.projected_ltv),
+        health_factor=_finite_ratio(result.health_factor),
         total_eligible_collateral=result.total_eligible_collateral,
         outstanding_debt=result.outstanding_debt,
         max_additional_borrow=result.max_additional_borrow,
@@ -131,43 +260,247 @@ def evaluate_loan_endpoint(
     )
 
 
-@app.get("/loans", response_model=list[LoanRead])
-def list_loans_endpoint(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    return get_user_loans(db, current_user.id)
+@app.post("/loans/evaluate/batch", response_model=LoanEvaluationBatchResponse)
+async def evaluate_loan_batch_endpoint(
+    body: LoanEvaluationBatchRequest,
+    user_id: str = Depends(get_current_user_id),
+    db: Session | AsyncSession = Depends(get_session),
+):
+    """
+    Dry-run a vector of amounts (or, with `cumulative`, a borrowing schedule)
+    against one read of the user's totals; also returns the max-borrow point.
+    """
+    curve  = await evaluate_loan_curve(db, user_id, body.amounts, cumulative=body.cumulative)
+    points = curve.points
+    return ORJSONResponse({
+        "total_eligible_collateral": curve.max_borrow.total_eligible_collateral,
+        "outstanding_debt":          curve.max_borrow.outstanding_debt,
+        "max_additional_borrow":     curve.max_borrow.max_additional_borrow,
+        "max_borrow":                _evaluation_point(curve.max_borrow),
+        "points": [
+            {
+                "requested_amount": amount,
+                "approved":         approved,
+                "projected_ltv":    _finite_ratio(ltv),
+                "health_factor":    _finite_ratio(health_factor),
+                "rejection_reason": None if approved else points.row(i).rejection_reason,
+            }
+            for i, (amount, approved, ltv, health_factor) in enumerate(zip(
+                points.requested_amount.tolist(),
+                points.approved.tolist(),
+                points.projected_ltv.tolist(),
+                points.health_factor.tolist(),
+            ))
+        ],
+    })
 
 
-@app.post("/loans", response_model=LoanRead, status_code=status.HTTP_201_CREATED)
-def create_loan_endpoint(
-    body: LoanRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+# JSON has no infinity: an unbounded ratio (no collateral / no debt) is reported as 999
+def _finite_ratio(value: float) -> float:
+    return value if value != float("inf") else 999.0
+
+
+def _evaluation_point(result: EvaluationResult) -> dict:
+    return {
+        "requested_amount": result.requested_amount,
+        "approved":         result.approved,
+        "projected_ltv":    _finite_ratio(result.projected_ltv),
+        "health_factor":    _finite_ratio(result.health_factor),
+        "rejection_reason": result.rejection_reason,
+    }
+
+
+@app.get("/loans", response_model=list[LoanRead])
+async def list_loans_endpoint(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    loan_status: Optional[LoanStatus] = Query(None, alias="status"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    user_id: str = Depends(get_current_user_id),
+    db: Session | AsyncSession = Depends(get_session),
 ):
+    """Newest first. When more rows exist, the X-Next-Cursor response header is set."""
+    etag = await resource_etag(db, user_id, "loans", request.url.query)
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
     try:
-        return create_loan(db, current_user.id, body.amount)
+        records, next_cursor = await get_user_loans_page(
+            db, user_id,
+            limit=limit,
+            cursor=cursor,
+            status=loan_status.value if loan_status else None,
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    return _page_response(records, next_cursor, etag)
+
+
+# Rejections that a retry would reproduce are stored and replayed like successes;
+# anything else (409 write conflicts, 5xx) releases the key so the retry runs again.
+REPLAYABLE_ERRORS = {400, 403, 404}
+
+
+async def _idempotent(
+    db: Session | AsyncSession,
+    user_id: str,
+    key: Optional[str],
+    fingerprint: str,
+    handler: Callable[[], Awaitable[object]],
+    status_code: int,
+) -> object:
+    """Run a money-moving handler at most once per (user, Idempotency-Key)."""
+    if key is None:
+        return await handler()
+
+    try:
+        stored = await begin_idempotent_request(db, user_id, key, fingerprint)
+    except IdempotencyKeyReused as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except IdempotencyKeyInFlight as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if stored is not None:
+        return JSONResponse(
+            stored.body, status_code=stored.status_code, headers={"Idempotent-Replayed": "true"}
+        )
+
+    try:
+        result = await handler()
+    except HTTPException as e:
+        if e.status_code in REPLAYABLE_ERRORS:
+            await complete_idempotent_request(db, user_id, key, e.status_code, {"detail": e.detail})
+        else:
+            await release_idempotent_request(db, user_id, key)
+        raise
+    except Exception:
+        await release_idempotent_request(db, user_id, key)
+        raise
+
+    body = jsonable_encoder(LoanRead.model_validate(result))
+    await complete_idempotent_request(db, user_id, key, status_code, body)
+    return JSONResponse(body, status_code=status_code)
+
+
+@app.post("/loans", response_model=LoanRead, status_code=status.HTTP_201_CREATED)
+async def create_loan_endpoint(
+    body: LoanRequest,
+    user_id: str = Depends(get_current_user_id),
+    db: Session | AsyncSession = Depends(get_session),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", min_length=1, max_length=255),
+):
+    """Send an Idempotency-Key to make retries safe: a replay returns the original response."""
+    async def handler():
+        try:
+            loan = await create_loan(db, user_id, body.amount)
+        except ConflictError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        await _push_position(db, user_id)
+        return loan
+
+    fingerprint = request_fingerprint("create_loan", body.model_dump())
+    return await _idempotent(
+        db, user_id, idempotency_key, fingerprint, handler, status.HTTP_201_CREATED
+    )
 
 
 @app.post("/loans/{loan_id}/repay", response_model=LoanRead)
-def repay_loan_endpoint(
+async def repay_loan_endpoint(
     body: RepayRequest,
     loan_id: str = Path(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+    db: Session | AsyncSession = Depends(get_session),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", min_length=1, max_length=255),
 ):
-    try:
-        return repay_loan(db, loan_id, current_user.id, body.amount)
-    except NotFoundError:
-        raise HTTPException(status_code=404, detail="Loan not found")
-    except ForbiddenError:
-        raise HTTPException(status_code=403, detail="Not your loan")
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    """Send an Idempotency-Key to make retries safe: a replay returns the original response."""
+    async def handler():
+        try:
+            loan = await repay_loan(db, loan_id, user_id, body.amount)
+        except NotFoundError:
+            raise HTTPException(status_code=404, detail="Loan not found")
+        except ForbiddenError:
+            raise HTTPException(status_code=403, detail="Not your loan")
+        except ConflictError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        await _push_position(db, user_id)
+        return loan
+
+    fingerprint = request_fingerprint("repay_loan", {"loan_id": loan_id, **body.model_dump()})
+    return await _idempotent(
+        db, user_id, idempotency_key, fingerprint, handler, status.HTTP_200_OK
+    )
 
 
 # ─────────────────────────────────────
 # Position
 # ─────────────────────────────────────
 @app.get("/position", response_model=PositionResponse)
-def get_position(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    return calculate_position(db, current_user.id)
+async def get_position(
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    user_id: str = Depends(get_current_user_id),
+    db: Session | AsyncSession = Depends(get_session),
+):
+    etag = await resource_etag(db, user_id, "position")
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    position = await calculate_position(db, user_id)
+    return ORJSONResponse(position.model_dump(), headers=_validator_headers(etag))
+
+
+@app.get("/position/stream", response_class=StreamingResponse)
+async def stream_position(
+    user_id: str = Depends(get_current_user_id),
+    # Closed before streaming starts: an open stream must not hold a pooled connection
+    db: Session | AsyncSession = Depends(get_session, scope="function"),
+):
+    """
+    Server-sent events: a `position` event with the current PositionResponse,
+    then one after every asset or loan write that changes it. Idle streams get
+    a comment line every POSITION_STREAM_KEEPALIVE seconds.
+    """
+    # Subscribe first, so a write landing while the snapshot is built is not missed
+    subscription = position_broker.subscribe(user_id)
+    try:
+        position = await calculate_position(db, user_id)
+    except BaseException:
+        subscription.close()
+        raise
+    return StreamingResponse(
+        _position_events(subscription, position.model_dump()),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _position_events(subscription: Subscription, initial: dict) -> AsyncIterator[bytes]:
+    try:
+        yield b"event: position\ndata: " + orjson.dumps(initial) + b"\n\n"
+        while True:
+            payload = await subscription.get(timeout=settings.position_stream_keepalive)
+            if payload is None:
+                yield b": keepalive\n\n"
+            else:
+                yield b"event: position\ndata: " + orjson.dumps(payload) + b"\n\n"
+    finally:
+        subscription.close()
+
+
+# ─────────────────────────────────────
+# Operations
+# ─────────────────────────────────────
+@app.get("/health/db-pool")
+def db_pool_health():
+    """Connection pool occupancy and checkout wait times, per engine."""
+    pools = {"sync": pool_status(engine.pool)}
+    if async_engine is not None:
+        pools["async"] = pool_status(async_engine.pool)
+    return pools
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus scrape endpoint: per-route latency, per-stage time and query-count histograms (this worker)."""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
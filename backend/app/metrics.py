@@ -0,0 +1,227 @@
+"""
+Metrics — per-route latency histograms and a per-request breakdown of where
+the time went, exported for Prometheus on /metrics and to clients as a
+Server-Timing header.
+
+Each request's time is split into exclusive stages:
+
+  - auth       JWT decode and principal lookup (dependencies.py), and bcrypt
+               work and queueing on /auth (auth_service)
+  - db         SQL execution, from SQLAlchemy cursor events on every engine,
+               with a query count
+  - service    service/repository Python around the queries (async_service
+               wrappers), excluding their db time
+  - other      not measured directly: whatever remains up to the response
+               start (middleware, routing, dependency resolution, request
+               validation, response validation and serialization)
+
+Timings live in a ContextVar set by the middleware. Starlette's threadpool
+and AsyncSession.run_sync both carry the context over, so sync service calls
+and their queries land on the request that made them. Metrics are kept per
+worker process.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)   # seconds
+QUERY_BUCKETS   = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+STAGES          = ("auth", "db", "service", "other")
+
+
+@dataclass
+class RequestTimings:
+    started: float = field(default_factory=time.perf_counter)
+    stages: dict[str, float] = field(default_factory=lambda: dict.fromkeys(STAGES, 0.0))
+    queries: int = 0
+    accounted: float = 0.0   # seconds already attributed to some stage
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] += seconds
+        self.accounted     += seconds
+
+    def finish(self) -> float:
+        """Fill in the unaccounted remainder as "other"; returns the total."""
+        total = time.perf_counter() - self.started
+        self.stages["other"] = max(total - self.accounted, 0.0)
+        return total
+
+    def server_timing(self, total: float) -> str:
+        parts = []
+        for name, seconds in self.stages.items():
+            desc = f';desc="{self.queries} queries"' if name == "db" else ""
+            parts.append(f"{name};dur={seconds * 1000:.2f}{desc}")
+        parts.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(parts)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block as `name`, excluding db time and nested stages inside it. No-op outside a request."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    accounted = timings.accounted
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start - (timings.accounted - accounted)
+        timings.add(name, max(elapsed, 0.0))
+
+
+# ────────────────────────────────────────
+# SQL timing
+# ────────────────────────────────────────
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start"].pop()
+    timings = _current.get()
+    if timings is not None:
+        timings.add("db", time.perf_counter() - started)
+        timings.queries += 1
+
+
+def instrument_sql() -> None:
+    """Time every cursor execution on every engine (sync, and async via its sync_engine)."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ────────────────────────────────────────
+# Registry
+# ────────────────────────────────────────
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts  = [0] * (len(buckets) + 1)   # last slot: +Inf
+        self.sum     = 0.0
+        self.count   = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum   += value
+        self.count += 1
+
+
+class Registry:
+    """Thread-safe per-(method, route) histograms of request time, stage time and query count."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests: dict[tuple[str, str, str], Histogram] = {}        # (method, route, status class)
+        self._stages:   dict[tuple[str, str, str], Histogram] = {}        # (method, route, stage)
+        self._queries:  dict[tuple[str, str], Histogram] = {}             # (method, route)
+
+    def observe(self, method: str, route: str, status: int, total: float, timings: RequestTimings) -> None:
+        with self._lock:
+            self._histogram(self._requests, (method, route, f"{status // 100}xx"), LATENCY_BUCKETS).observe(total)
+            for name, seconds in timings.stages.items():
+                self._histogram(self._stages, (method, route, name), LATENCY_BUCKETS).observe(seconds)
+            self._histogram(self._queries, (method, route), QUERY_BUCKETS).observe(timings.queries)
+
+    @staticmethod
+    def _histogram(store: dict, key: tuple, buckets: tuple) -> Histogram:
+        histogram = store.get(key)
+        if histogram is None:
+            histogram = store[key] = Histogram(buckets)
+        return histogram
+
+    def clear(self) -> None:
+        with self._lock:
+            self._requests.clear()
+            self._stages.clear()
+            self._queries.clear()
+
+    def render(self) -> str:
+        """Prometheus text exposition format 0.0.4."""
+        lines: list[str] = []
+        with self._lock:
+            _render_family(lines, "lenda_http_request_duration_seconds", "Request latency by route.",
+                           ("method", "route", "status"), self._requests)
+            _render_family(lines, "lenda_http_request_stage_seconds", "Per-request time spent in each stage.",
+                           ("method", "route", "stage"), self._stages)
+            _render_family(lines, "lenda_http_request_db_queries", "SQL statements executed per request.",
+                           ("method", "route"), self._queries)
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _render_family(lines: list[str], name: str, help_text: str, label_names: tuple, store: dict) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for key in sorted(store):
+        histogram = store[key]
+        labels = ",".join(f'{label}="{_escape(value)}"' for label, value in zip(label_names, key))
+        cumulative = 0
+        for bound, count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+registry = Registry()
+
+
+# ────────────────────────────────────────
+# Middleware
+# ────────────────────────────────────────
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware: times each HTTP request, adds Server-Timing to the
+    response head and records the request under its route template (so
+    /loans/{loan_id}/repay is one series, not one per loan).
+    """
+
+    def __init__(self, app, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token   = _current.set(timings)
+        status  = 500
+        total   = 0.0
+
+        async def send_with_timing(message):
+            nonlocal status, total
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                total  = timings.finish()
+                if self.server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", timings.server_timing(total).encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if not total:
+                total = timings.finish()
+            route = scope.get("route")
+            registry.observe(scope["method"], getattr(route, "path", "<unmatched>"), status, total, timings)
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, String, Float, Integer, DateTime, ForeignKey, Index, JSON, text
 from datetime import datetime, timezone
 import uuid
 from .database import Base
-from .rules import LoanStatus, AssetStatus
+from .money import Money, from_cents
+from .rules import LOAN_INTEREST_RATE, LoanStatus, AssetStatus
 
 
 def generate_uuid():
@@ -18,33 +19,179 @@ class User(Base):
 
 
 class Asset(Base):
+    """Amounts are stored in cents; stated_value / appraised_value are dollars for the API."""
     __tablename__ = "assets"
-    id              = Column(String, primary_key=True, default=generate_uuid)
-    user_id         = Column(String, ForeignKey("users.id"), nullable=False)
-    type            = Column(String, nullable=False)
-    description     = Column(String, nullable=True)
-    # "value" is the legacy DB column name — kept for migration compatibility
-    stated_value    = Column("value", Float, nullable=False)
-    appraised_value = Column(Float, nullable=False, default=0.0)
-    ltv_ratio       = Column(Float, nullable=False, default=0.5)
-    status          = Column(String, nullable=False, default=AssetStatus.active.value)
-    created_at      = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    appraised_at    = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    id                    = Column(String, primary_key=True, default=generate_uuid)
+    user_id               = Column(String, ForeignKey("users.id"), nullable=False)
+    type                  = Column(String, nullable=False)
+    description           = Column(String, nullable=True)
+    stated_value_cents    = Column(Money, nullable=False)
+    appraised_value_cents = Column(Money, nullable=False, default=0)
+    ltv_ratio             = Column(Float, nullable=False, default=0.5)
+    reference_mark        = Column(Float, nullable=False, default=1.0)  # type's price mark when stated_value was taken
+    status                = Column(String, nullable=False, default=AssetStatus.active.value)
+    created_at            = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    appraised_at          = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        Index("ix_assets_user_id_status", "user_id", "status"),
+        Index("ix_assets_user_id_created_at_id", "user_id", "created_at", "id"),  # keyset pagination
+        Index("ix_assets_type_status", "type", "status"),   # re-appraisal when a type's mark moves
+        # Partial index: collateral lookups only ever care about active assets
+        Index(
+            "ix_assets_user_id_active", "user_id",
+            postgresql_where=text("status = 'active'"),
+            sqlite_where=text("status = 'active'"),
+        ),
+    )
+
+    @property
+    def stated_value(self) -> float:
+        return from_cents(self.stated_value_cents)
+
+    @property
+    def appraised_value(self) -> float:
+        return from_cents(self.appraised_value_cents)
 
 
 class Loan(Base):
+    """Amounts are stored in cents; the un-suffixed properties are dollars for the API."""
     __tablename__ = "loans"
-    id                      = Column(String, primary_key=True, default=generate_uuid)
-    user_id                 = Column(String, ForeignKey("users.id"), nullable=False)
-    amount                  = Column(Float, nullable=False)
-    amount_repaid           = Column(Float, nullable=False, default=0.0)
-    accrued_interest        = Column(Float, nullable=False, default=0.0)
-    interest_rate           = Column(Float, nullable=False, default=0.05)
-    status                  = Column(String, default=LoanStatus.pending.value)
-    ltv_at_origination      = Column(Float, nullable=True)
-    health_factor_snapshot  = Column(Float, nullable=True)
-    rejection_reason        = Column(String, nullable=True)
-    collateral_value_locked = Column(Float, nullable=True)
-    created_at              = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    activated_at            = Column(DateTime, nullable=True)
-    repaid_at               = Column(DateTime, nullable=True)
+    id                            = Column(String, primary_key=True, default=generate_uuid)
+    user_id                       = Column(String, ForeignKey("users.id"), nullable=False)
+    amount_cents                  = Column(Money, nullable=False)
+    amount_repaid_cents           = Column(Money, nullable=False, default=0)
+    accrued_interest_cents        = Column(Money, nullable=False, default=0)
+    interest_days_accrued         = Column(Integer, nullable=False, default=0)   # whole days since activation rolled into accrued_interest_cents
+    interest_rate                 = Column(Float, nullable=False, default=LOAN_INTEREST_RATE)
+    status                        = Column(String, default=LoanStatus.pending.value)
+    ltv_at_origination            = Column(Float, nullable=True)
+    health_factor_snapshot        = Column(Float, nullable=True)
+    rejection_reason              = Column(String, nullable=True)
+    collateral_value_locked_cents = Column(Money, nullable=True)
+    created_at                    = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    activated_at                  = Column(DateTime, nullable=True)
+    repaid_at                     = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_loans_user_id_status", "user_id", "status"),
+        Index("ix_loans_user_id_created_at_id", "user_id", "created_at", "id"),  # keyset pagination
+        # Partial index: debt totals and the risk engine only read active loans
+        Index(
+            "ix_loans_user_id_active", "user_id",
+            postgresql_where=text("status = 'active'"),
+            sqlite_where=text("status = 'active'"),
+        ),
+    )
+
+    @property
+    def amount(self) -> float:
+        return from_cents(self.amount_cents)
+
+    @property
+    def amount_repaid(self) -> float:
+        return from_cents(self.amount_repaid_cents)
+
+    @property
+    def accrued_interest(self) -> float:
+        return from_cents(self.accrued_interest_cents)
+
+
+class UserPosition(Base):
+    """
+    Materialized per-user totals behind /position, kept in step with assets and
+    loans by the service layer in the same transaction as each write.
+
+    Amounts are in cents. Interest is not stored per read: it accrues daily as
+    accrued_interest_cents + rate_weighted_principal × whole days since interest_as_of / 365,
+    rounded to the cent.
+
+    `version` is an optimistic-concurrency counter: every UPDATE is issued as
+    ... WHERE version = <version read>, and bumps it.
+    """
+    __tablename__ = "user_positions"
+    user_id                   = Column(String, ForeignKey("users.id"), primary_key=True)
+    total_deposited_cents           = Column(Money, nullable=False, default=0)
+    total_eligible_collateral_cents = Column(Money, nullable=False, default=0)
+    total_principal_cents           = Column(Money, nullable=False, default=0)
+    rate_weighted_principal         = Column(Float, nullable=False, default=0.0)  # Σ principal_remaining (cents) × rate
+    accrued_interest_cents          = Column(Money, nullable=False, default=0)    # outstanding as of interest_as_of
+    interest_as_of                  = Column(DateTime, nullable=False)
+    version                         = Column(Integer, nullable=False, default=0)
+    updated_at                      = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __mapper_args__ = {"version_id_col": version}
+
+
+class UserExposure(Base):
+    """
+    Per-user, per-asset-type collateral exposure: the index a price tick uses
+    to find the positions holding an asset type without scanning assets.
+
+    `units` is eligible collateral in cents per unit of market mark
+    (Σ stated_value_cents × ltv_ratio / reference_mark), so at mark m the
+    type's eligible collateral is units × m, rounded to the cent;
+    `eligible_collateral_cents` is that value at the last applied mark.
+    """
+    __tablename__ = "user_exposures"
+    user_id                   = Column(String, ForeignKey("users.id"), primary_key=True)
+    asset_type                = Column(String, primary_key=True)
+    units                     = Column(Float, nullable=False, default=0.0)
+    eligible_collateral_cents = Column(Money, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_user_exposures_asset_type", "asset_type"),
+    )
+
+
+class IdempotencyKey(Base):
+    """
+    A client-supplied Idempotency-Key for a money-moving POST, scoped per user.
+
+    The row is inserted (status_code NULL) before the handler runs and filled
+    with the handler's response afterwards; retries with the same key replay
+    `response_body` instead of executing again until `expires_at`.
+    """
+    __tablename__ = "idempotency_keys"
+    user_id       = Column(String, ForeignKey("users.id"), primary_key=True)
+    key           = Column(String(255), primary_key=True)
+    fingerprint   = Column(String(64), nullable=False)   # sha256 of operation + request body
+    status_code   = Column(Integer, nullable=True)       # NULL while the original request is in flight
+    response_body = Column(JSON, nullable=True)
+    created_at    = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    expires_at    = Column(DateTime, nullable=False)
+
+
+class AccrualRun(Base):
+    """
+    Checkpoint for the interest accrual batch job (accrue_interest.py).
+
+    `as_of` is fixed when a run starts, and `last_loan_id` advances in the same
+    transaction as each chunk's UPDATE, so a crashed run resumes exactly after
+    the last committed chunk with the same accrual date.
+    """
+    __tablename__ = "accrual_runs"
+    id            = Column(String, primary_key=True, default=generate_uuid)
+    as_of         = Column(DateTime, nullable=False)
+    last_loan_id  = Column(String, nullable=True)    # keyset checkpoint; NULL = not started
+    loans_accrued = Column(Integer, nullable=False, default=0)
+    chunks_done   = Column(Integer, nullable=False, default=0)
+    started_at    = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    finished_at   = Column(DateTime, nullable=True)
+
+
+class LiquidationEvent(Base):
+    """
+    One under-collateralised position found by a liquidation scan
+    (scan_liquidations.py): `flagged` for review, or `liquidated` when the
+    scan seized the user's collateral and closed their active loans.
+    """
+    __tablename__ = "liquidation_events"
+    id                     = Column(String, primary_key=True, default=generate_uuid)
+    scan_id                = Column(String, nullable=False, index=True)
+    user_id                = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    action                 = Column(String, nullable=False)   # "flagged" | "liquidated"
+    health_factor                = Column(Float, nullable=False)   # liquidation_collateral / debt
+    liquidation_collateral_cents = Column(Money, nullable=False)   # Σ value at the mark × liquidation_threshold
+    debt_cents                   = Column(Money, nullable=False)   # principal + interest outstanding
+    created_at                   = Column(DateTime, default=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,66 @@
+"""
+Money — fixed-point amounts as integer minor units (cents).
+
+Money columns are stored as NUMERIC(18, 0) holding cents and surface in
+Python as plain ints, so sums, the repayment waterfall and comparisons are
+exact and never go through Decimal. Dollars (floats) exist only at the API
+boundary: request bodies are converted with to_cents() and responses with
+from_cents().
+
+Products with a rate or ratio (appraisal, interest) are rounded back to whole
+cents half-up — the same rule as SQL ROUND() on NUMERIC, so set-based updates
+in the repository and per-row arithmetic in the service agree.
+"""
+import math
+from decimal import ROUND_HALF_UP, Decimal
+
+from sqlalchemy import BigInteger, Numeric
+from sqlalchemy.types import TypeDecorator
+
+CENTS_PER_UNIT = 100
+
+
+def to_cents(amount: float | int | str | Decimal) -> int:
+    """Major units (dollars) to cents, rounded half-up on the decimal representation."""
+    cents = Decimal(str(amount)) * CENTS_PER_UNIT
+    return int(cents.to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents: int) -> float:
+    """Cents to major units, for API responses and the risk engine."""
+    return cents / CENTS_PER_UNIT
+
+
+def round_cents(value: float) -> int:
+    """A fractional amount in cents (cents × rate) to whole cents, half away from zero."""
+    return int(math.copysign(math.floor(abs(value) + 0.5), value))
+
+
+def format_cents(cents: int) -> str:
+    return f"${from_cents(cents):,.2f}"
+
+
+class Money(TypeDecorator):
+    """
+    An amount in cents: NUMERIC(18, 0) in the database, int in Python.
+
+    SQLite stores whole NUMERIC values as INTEGER, so there it is read as a
+    BIGINT and never goes through Decimal.
+    """
+    impl      = Numeric(18, 0)
+    cache_ok  = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(BigInteger())
+        return dialect.type_descriptor(self.impl)
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, float) and not value.is_integer():
+            raise ValueError(f"Money columns hold whole cents, got {value!r}")
+        return int(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else int(value)
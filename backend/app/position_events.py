@@ -0,0 +1,161 @@
+"""
+Position Events — push a user's fresh PositionResponse to their open
+GET /position/stream connections instead of having clients poll /position.
+
+Writers publish after their transaction commits (the asset, loan and
+repayment routes in main.py); each stream subscribes for its user and
+forwards what arrives as server-sent events. A subscription holds only the
+latest payload: a position supersedes the previous one, so a slow client
+skips intermediate states rather than buffering them.
+
+The broker is pluggable (POSITION_BROKER):
+
+  - memory    InProcessBroker fans out within one worker process
+  - loopback  LoopbackBroker behaves like an external broker on one machine:
+              payloads are encoded, cross an asynchronous channel and are
+              decoded by a dispatcher task, and publishers cannot see who is
+              subscribed. It stands in for a shared broker in tests and demos.
+
+A deployment running several workers, or the batch jobs (accrual,
+liquidation, revaluation) that write outside the API, needs a shared broker
+behind the same interface for their changes to reach every stream.
+"""
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+Payload = dict[str, Any]
+
+
+class Subscription:
+    """One stream's mailbox: get() waits for the next payload; only the latest is kept."""
+
+    def __init__(self, broker: "PositionBroker", user_id: str):
+        self.user_id = user_id
+        self._broker = broker
+        self._queue: asyncio.Queue[Payload] = asyncio.Queue(maxsize=1)
+
+    def offer(self, payload: Payload) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()   # superseded
+        self._queue.put_nowait(payload)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Payload]:
+        """Next payload, or None after `timeout` seconds without one."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self._broker.unsubscribe(self)
+
+
+# ────────────────────────────────────────
+# Brokers
+# ────────────────────────────────────────
+class PositionBroker(ABC):
+    """Pub/sub of position payloads keyed by user. Called from the event loop."""
+
+    @abstractmethod
+    def subscribe(self, user_id: str) -> Subscription:
+        """Register a mailbox for `user_id`; close() it when the stream ends."""
+
+    @abstractmethod
+    def unsubscribe(self, subscription: Subscription) -> None: ...
+
+    @abstractmethod
+    def publish(self, user_id: str, payload: Payload) -> None:
+        """Deliver `payload` to every subscription for `user_id`. Never blocks."""
+
+    @abstractmethod
+    def has_subscribers(self, user_id: str) -> bool:
+        """Whether building a payload for `user_id` is worth it. Shared brokers may always say True."""
+
+
+class InProcessBroker(PositionBroker):
+    """Subscriptions of this worker process, in a dict of sets."""
+
+    def __init__(self):
+        self._subscriptions: dict[str, set[Subscription]] = {}
+
+    def subscribe(self, user_id: str) -> Subscription:
+        return self.add(Subscription(self, user_id))
+
+    def add(self, subscription: Subscription) -> Subscription:
+        self._subscriptions.setdefault(subscription.user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.user_id]
+
+    def publish(self, user_id: str, payload: Payload) -> None:
+        for subscription in list(self._subscriptions.get(user_id, ())):
+            subscription.offer(payload)
+
+    def has_subscribers(self, user_id: str) -> bool:
+        return user_id in self._subscriptions
+
+    def subscriber_count(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+
+class LoopbackBroker(PositionBroker):
+    """
+    External-broker stand-in: publish() encodes the message onto a channel and
+    returns; a dispatcher task, started on the first publish, decodes it and
+    fans it out to this process's subscriptions.
+    """
+
+    def __init__(self):
+        self._local   = InProcessBroker()
+        self._channel: Optional[asyncio.Queue[bytes]] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def subscribe(self, user_id: str) -> Subscription:
+        return self._local.add(Subscription(self, user_id))
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._local.unsubscribe(subscription)
+
+    def publish(self, user_id: str, payload: Payload) -> None:
+        loop = asyncio.get_running_loop()
+        if self._dispatcher is None or self._dispatcher.done() or self._dispatcher.get_loop() is not loop:
+            self._channel    = asyncio.Queue()
+            self._dispatcher = loop.create_task(self._dispatch(self._channel))
+        self._channel.put_nowait(json.dumps({"user_id": user_id, "payload": payload}).encode())
+
+    def has_subscribers(self, user_id: str) -> bool:
+        return True   # subscribers may live in any process
+
+    async def _dispatch(self, channel: asyncio.Queue[bytes]) -> None:
+        while True:
+            message = json.loads(await channel.get())
+            try:
+                self._local.publish(message["user_id"], message["payload"])
+            except Exception:
+                logger.exception("Dropping position event for user %s", message["user_id"])
+
+
+BROKERS = {"memory": InProcessBroker, "loopback": LoopbackBroker}
+
+
+def broker_from_settings() -> PositionBroker:
+    """POSITION_BROKER=memory (default) or loopback."""
+    broker = settings.position_broker
+    if broker not in BROKERS:
+        raise ValueError(f"Unknown POSITION_BROKER '{broker}'. Use one of {sorted(BROKERS)}")
+    return BROKERS[broker]()
+
+
+position_broker = broker_from_settings()
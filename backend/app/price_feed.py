@@ -0,0 +1,184 @@
+"""
+Price Feed — market marks per asset type, behind a pluggable provider.
+
+A mark is a price index for an asset type. Each asset records the mark of its
+type when its stated_value was taken (Asset.reference_mark), so its current
+value is stated_value × mark / reference_mark.
+
+Providers are only ever called off the request path: a background task in
+each worker refreshes `mark_cache`, and request handlers (/assets/preview,
+asset creation) read the cached marks only. The cache keeps serving the
+last mark it has when the feed is slow or down; `ttl` only marks entries as
+stale so the refresher knows what to fetch.
+"""
+import asyncio
+import csv
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from .config import settings
+from .rules import ALLOWED_ASSET_TYPES
+
+logger = logging.getLogger(__name__)
+
+BASE_MARK = 1.0   # mark assumed before any feed has reported (static appraisal)
+
+
+@dataclass(frozen=True)
+class Mark:
+    key: str          # asset type
+    price: float
+    as_of: datetime
+
+
+# ────────────────────────────────────────
+# Providers
+# ────────────────────────────────────────
+class PriceProvider(ABC):
+    """Source of the latest marks. Implementations may block (network, disk)."""
+
+    @abstractmethod
+    def fetch(self, keys: Iterable[str]) -> dict[str, Mark]:
+        """Latest mark for each of `keys` the provider knows; unknown keys are omitted."""
+
+
+class StaticPriceProvider(PriceProvider):
+    """Every asset type at BASE_MARK — the deterministic stated_value × ltv_ratio appraisal."""
+
+    def fetch(self, keys: Iterable[str]) -> dict[str, Mark]:
+        now = datetime.now(timezone.utc)
+        return {key: Mark(key, BASE_MARK, now) for key in keys}
+
+
+class ReplayPriceProvider(PriceProvider):
+    """
+    Replays recorded ticks from a file against a clock, for tests, demos and
+    backtests. CSV with a header `as_of,key,price`, or JSON lines with the same
+    fields; `as_of` is ISO-8601. fetch() returns, per key, the last tick at or
+    before clock().
+    """
+
+    def __init__(self, path: str, clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)):
+        self._clock = clock
+        self._ticks: dict[str, tuple[list[datetime], list[float]]] = {}
+        for as_of, key, price in sorted(self._read(path)):
+            times, prices = self._ticks.setdefault(key, ([], []))
+            times.append(as_of)
+            prices.append(price)
+
+    @staticmethod
+    def _read(path: str) -> list[tuple[datetime, str, float]]:
+        with open(path, newline="") as f:
+            if path.endswith((".jsonl", ".json")):
+                records = [json.loads(line) for line in f if line.strip()]
+            else:
+                records = list(csv.DictReader(f))
+        ticks = []
+        for record in records:
+            as_of = datetime.fromisoformat(str(record["as_of"]))
+            if as_of.tzinfo is None:
+                as_of = as_of.replace(tzinfo=timezone.utc)
+            ticks.append((as_of, str(record["key"]).strip().lower(), float(record["price"])))
+        return ticks
+
+    def fetch(self, keys: Iterable[str]) -> dict[str, Mark]:
+        now = self._clock()
+        marks = {}
+        for key in keys:
+            times, prices = self._ticks.get(key, ([], []))
+            i = bisect_right(times, now)
+            if i:
+                marks[key] = Mark(key, prices[i - 1], times[i - 1])
+        return marks
+
+
+def provider_from_settings() -> PriceProvider:
+    """PRICE_FEED=static (default) or replay:<path>."""
+    feed = settings.price_feed
+    if feed == "static":
+        return StaticPriceProvider()
+    if feed.startswith("replay:"):
+        return ReplayPriceProvider(feed.removeprefix("replay:"))
+    raise ValueError(f"Unknown PRICE_FEED '{feed}'. Use 'static' or 'replay:<path>'")
+
+
+# ────────────────────────────────────────
+# Mark cache
+# ────────────────────────────────────────
+class MarkCache:
+    """
+    Thread-safe latest mark per key. Entries older than `ttl` seconds are
+    reported by stale_keys() but still served by get().
+    """
+
+    def __init__(self, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._marks: dict[str, tuple[float, Mark]] = {}
+
+    def get(self, key: str) -> Optional[Mark]:
+        entry = self._marks.get(key)
+        return entry[1] if entry else None
+
+    def price(self, key: str) -> float:
+        mark = self.get(key)
+        return mark.price if mark else BASE_MARK
+
+    def update(self, marks: Iterable[Mark]) -> dict[str, Mark]:
+        """Store fresh marks; returns those whose price changed (or were new)."""
+        changed = {}
+        now = self._clock()
+        with self._lock:
+            for mark in marks:
+                if not mark.price > 0:
+                    logger.warning("Ignoring non-positive mark %s=%s", mark.key, mark.price)
+                    continue
+                previous = self._marks.get(mark.key)
+                if previous is None or previous[1].price != mark.price:
+                    changed[mark.key] = mark
+                self._marks[mark.key] = (now, mark)
+        return changed
+
+    def stale_keys(self, keys: Iterable[str]) -> list[str]:
+        now = self._clock()
+        return [key for key in keys if key not in self._marks or self._marks[key][0] + self.ttl <= now]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._marks.clear()
+
+
+mark_cache = MarkCache(ttl=settings.price_mark_ttl)
+
+
+def refresh_marks(
+    provider: PriceProvider,
+    cache: MarkCache = mark_cache,
+    keys: Iterable[str] = ALLOWED_ASSET_TYPES,
+    force: bool = False,
+) -> dict[str, Mark]:
+    """Fetch stale (or, with force, all) keys from the provider; returns the marks that moved."""
+    wanted = sorted(keys) if force else cache.stale_keys(sorted(keys))
+    if not wanted:
+        return {}
+    return cache.update(provider.fetch(wanted).values())
+
+
+async def run_mark_refresher(provider: PriceProvider, interval: float, cache: MarkCache = mark_cache) -> None:
+    """Background task: keep `cache` warm. Provider calls run in the threadpool."""
+    while True:
+        try:
+            await run_in_threadpool(refresh_marks, provider, cache)
+        except Exception:
+            logger.exception("Price feed refresh failed; serving last known marks")
+        await asyncio.sleep(interval)
@@ -3,8 +3,95 @@
 # Handles all database CRUD operations.
 # No business logic or validations here — that’s for service.py
 
+import csv
+import io
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, Integer, Numeric, case, cast, func, insert, literal, or_, select, tuple_, type_coerce, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Session
-from .models import User, Asset, Loan
+from sqlalchemy.sql.functions import FunctionElement
+
+from .models import (
+    User, Asset, Loan, UserPosition, UserExposure, IdempotencyKey, AccrualRun, LiquidationEvent,
+)
+from .money import Money
+from .rules import ASSET_TYPE_CONFIG, LOAN_INTEREST_RATE, AssetStatus, LoanStatus
+
+
+# ----------------
+# SQL helpers
+# ----------------
+class days_between(FunctionElement):
+    """
+    Whole days charged from `start` to `end`: the UTC midnights passed
+    (DateTime columns are stored naive UTC), matching service._whole_days().
+    """
+    type = Integer()
+    name = "days_between"
+    inherit_cache = True
+
+
+@compiles(days_between)
+def _days_between_default(element, compiler, **kw):
+    start, end = list(element.clauses)
+    return "(CAST(%s AS DATE) - CAST(%s AS DATE))" % (
+        compiler.process(end, **kw), compiler.process(start, **kw),
+    )
+
+
+@compiles(days_between, "sqlite")
+def _days_between_sqlite(element, compiler, **kw):
+    start, end = list(element.clauses)
+    return "CAST(julianday(date(%s)) - julianday(date(%s)) AS INTEGER)" % (
+        compiler.process(end, **kw), compiler.process(start, **kw),
+    )
+
+
+# Assets that count toward a user's collateral
+COLLATERAL_STATUSES = (AssetStatus.active.value, AssetStatus.locked.value)
+
+
+def _naive_utc(ts: datetime) -> datetime:
+    """DateTime columns are stored naive (UTC); compare like with like."""
+    return ts.replace(tzinfo=None) if ts.tzinfo else ts
+
+
+def _round_cents(expr):
+    """
+    A fractional amount in cents (cents × rate) to whole cents, half away from
+    zero like money.round_cents(). NUMERIC rounding, so PostgreSQL does not
+    round half to even as it would on double precision.
+    """
+    return type_coerce(func.round(cast(expr, Numeric)), Money)
+
+
+def _principal_remaining():
+    """max(amount - amount_repaid, 0) per loan, in cents."""
+    return case(
+        (Loan.amount_cents > Loan.amount_repaid_cents, Loan.amount_cents - Loan.amount_repaid_cents),
+        else_=0,
+    )
+
+
+def _interest_for_days(days):
+    """Simple interest on the remaining principal for `days`, per loan, in whole cents."""
+    return _round_cents(
+        type_coerce(_principal_remaining(), Float) * func.coalesce(Loan.interest_rate, LOAN_INTEREST_RATE) * days / 365.0
+    )
+
+
+def _days_to_accrue(as_of: datetime):
+    """Whole days since activation at `as_of` that are not yet in accrued_interest."""
+    days_active = days_between(Loan.activated_at, literal(_naive_utc(as_of), DateTime()))
+    return days_active - Loan.interest_days_accrued
+
+
+def _interest_outstanding(as_of: datetime):
+    """Stored accrued interest plus simple interest for the days not yet accrued, per loan, in cents."""
+    return Loan.accrued_interest_cents + _interest_for_days(_days_to_accrue(as_of))
+
 
 # ----------------
 # Users
@@ -45,6 +132,15 @@ def add_asset(db: Session, asset: Asset) -> Asset:
     db.refresh(asset)
     return asset
 
+def add_assets_bulk(db: Session, rows: list[dict]) -> None:
+    """
+    Insert many assets in one executemany and commit.
+    Rows are keyed by Asset attribute name and must carry their own `id`.
+    """
+    if rows:
+        db.execute(insert(Asset), rows)
+    db.commit()
+
 def list_assets(db: Session, user_id: str | None = None) -> list[Asset]:
     """
     Return all assets, or if user_id is provided, return assets for that user.
@@ -54,6 +150,71 @@ def list_assets(db: Session, user_id: str | None = None) -> list[Asset]:
         query = query.filter(Asset.user_id == user_id)
     return query.all()
 
+# Columns behind AssetRead, selected as plain rows (no ORM identity map or instances)
+ASSET_READ_COLUMNS = (
+    Asset.id, Asset.user_id, Asset.type, Asset.description, Asset.stated_value_cents,
+    Asset.appraised_value_cents, Asset.ltv_ratio, Asset.status, Asset.created_at,
+)
+
+def list_assets_page(
+    db: Session,
+    user_id: str,
+    *,
+    limit: int,
+    after: tuple[datetime, str] | None = None,
+    status: str | None = None,
+    asset_type: str | None = None,
+) -> list[Row]:
+    """
+    One page of a user's assets as ASSET_READ_COLUMNS rows, newest first,
+    keyset-paginated on (created_at, id).
+    `after` is the (created_at, id) of the last row of the previous page.
+    """
+    query = select(*ASSET_READ_COLUMNS).where(Asset.user_id == user_id)
+    if status:
+        query = query.where(Asset.status == status)
+    if asset_type:
+        query = query.where(Asset.type == asset_type)
+    if after:
+        query = query.where(tuple_(Asset.created_at, Asset.id) < tuple_(*after))
+    return db.execute(query.order_by(Asset.created_at.desc(), Asset.id.desc()).limit(limit)).all()
+
+def get_collateral_totals(db: Session, user_id: str) -> Row:
+    """
+    Single row of collateral totals for a user in cents, aggregated in the database:
+      - total_deposited: sum of stated values across all assets
+      - total_eligible:  sum of appraised values for ACTIVE and LOCKED assets
+    """
+    counted = Asset.status.in_((AssetStatus.active.value, AssetStatus.locked.value))
+    return db.query(
+        func.coalesce(func.sum(Asset.stated_value_cents), 0).label("total_deposited"),
+        func.coalesce(
+            func.sum(Asset.appraised_value_cents).filter(counted), 0
+        ).label("total_eligible"),
+    ).filter(Asset.user_id == user_id).one()
+
+def reappraise_assets(db: Session, marks: dict[str, float], now: datetime) -> int:
+    """
+    Re-appraise every ACTIVE/LOCKED asset of the given types at the new marks,
+    in one set-based UPDATE:
+        appraised_value = stated_value × mark / reference_mark × ltv_ratio, to the cent
+    Not committed; returns the number of assets updated.
+    """
+    if not marks:
+        return 0
+    mark = case(marks, value=Asset.type)
+    return db.execute(
+        update(Asset)
+        .where(Asset.type.in_(list(marks)), Asset.status.in_(COLLATERAL_STATUSES))
+        .values(
+            appraised_value_cents=_round_cents(
+                type_coerce(Asset.stated_value_cents, Float) * mark / Asset.reference_mark * Asset.ltv_ratio
+            ),
+            appraised_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
 
 # ----------------
 # Loans
@@ -77,8 +238,598 @@ def list_loans(db: Session, user_id: str | None = None) -> list[Loan]:
         query = query.filter(Loan.user_id == user_id)
     return query.all()
 
-def get_loan(db: Session, loan_id: str) -> Loan | None:
+# Columns behind LoanRead, selected as plain rows (no ORM identity map or instances)
+LOAN_READ_COLUMNS = (
+    Loan.id, Loan.user_id, Loan.amount_cents, Loan.amount_repaid_cents, Loan.accrued_interest_cents,
+    Loan.interest_rate, Loan.status, Loan.ltv_at_origination, Loan.health_factor_snapshot,
+    Loan.rejection_reason, Loan.created_at, Loan.activated_at, Loan.repaid_at,
+)
+
+def list_loans_page(
+    db: Session,
+    user_id: str,
+    *,
+    limit: int,
+    after: tuple[datetime, str] | None = None,
+    status: str | None = None,
+) -> list[Row]:
+    """
+    One page of a user's loans as LOAN_READ_COLUMNS rows, newest first,
+    keyset-paginated on (created_at, id).
+    `after` is the (created_at, id) of the last row of the previous page.
+    """
+    query = select(*LOAN_READ_COLUMNS).where(Loan.user_id == user_id)
+    if status:
+        query = query.where(Loan.status == status)
+    if after:
+        query = query.where(tuple_(Loan.created_at, Loan.id) < tuple_(*after))
+    return db.execute(query.order_by(Loan.created_at.desc(), Loan.id.desc()).limit(limit)).all()
+
+def get_rate_weighted_principal(db: Session, user_id: str) -> float:
+    """Sum of principal_remaining (cents) × interest_rate over a user's ACTIVE loans."""
+    weighted = type_coerce(_principal_remaining(), Float) * func.coalesce(Loan.interest_rate, LOAN_INTEREST_RATE)
+    return db.query(
+        func.coalesce(func.sum(weighted), 0.0)
+    ).filter(
+        Loan.user_id == user_id,
+        Loan.status == LoanStatus.active.value,
+    ).scalar()
+
+def get_loan_totals(db: Session, user_id: str, as_of: datetime) -> Row:
+    """
+    Single row of debt totals over a user's ACTIVE loans in cents, aggregated in the database:
+      - principal_outstanding: sum of max(amount - amount_repaid, 0)
+      - accrued_interest:      sum of the stored accrued interest column
+      - interest_as_of:        outstanding interest at `as_of` — stored accrued interest
+                               plus principal_remaining × rate × days not yet accrued / 365,
+                               rounded to the cent per loan
+    """
+    return db.query(
+        func.coalesce(func.sum(_principal_remaining()), 0).label("principal_outstanding"),
+        func.coalesce(func.sum(Loan.accrued_interest_cents), 0).label("accrued_interest"),
+        func.coalesce(func.sum(_interest_outstanding(as_of)), 0).label("interest_as_of"),
+    ).filter(
+        Loan.user_id == user_id,
+        Loan.status == LoanStatus.active.value,
+    ).one()
+
+def get_loan(db: Session, loan_id: str, for_update: bool = False) -> Loan | None:
     """
     Return a single loan by ID, or None if not found.
+    With for_update=True the row is locked until the transaction ends and
+    re-read from the database even if the session already holds it.
+    """
+    query = db.query(Loan).filter(Loan.id == loan_id)
+    if for_update:
+        query = query.with_for_update().populate_existing()
+    return query.first()
+
+
+# ----------------
+# Positions
+# ----------------
+def get_user_position(db: Session, user_id: str, for_update: bool = False) -> UserPosition | None:
+    """
+    Return the materialized position snapshot for a user (primary-key read).
+    With for_update=True the row is locked (SELECT ... FOR UPDATE) until the
+    transaction ends; SQLite has no row locks and ignores it.
+    """
+    if not for_update:
+        return db.get(UserPosition, user_id)
+    return (
+        db.query(UserPosition)
+        .filter(UserPosition.user_id == user_id)
+        .with_for_update()
+        .populate_existing()
+        .one_or_none()
+    )
+
+def get_position_version(db: Session, user_id: str) -> Row | None:
+    """
+    (version, interest_as_of) of a user's snapshot, read fresh from the
+    database rather than the session's identity map; None if there is none.
+    """
+    return db.execute(
+        select(UserPosition.version, UserPosition.interest_as_of).where(UserPosition.user_id == user_id)
+    ).one_or_none()
+
+
+# ----------------
+# Exposures
+# ----------------
+def get_exposure(db: Session, user_id: str, asset_type: str) -> UserExposure | None:
+    """
+    Return a user's exposure row for one asset type, or None.
+    """
+    return db.get(UserExposure, (user_id, asset_type))
+
+
+def list_exposures(db: Session, user_id: str) -> list[UserExposure]:
+    """
+    Return all of a user's exposure rows.
+    """
+    return db.query(UserExposure).filter(UserExposure.user_id == user_id).all()
+
+
+def get_exposure_totals(db: Session, user_id: str) -> list[Row]:
+    """
+    Per asset type over a user's ACTIVE/LOCKED assets, aggregated in the database:
+    (asset_type, units, eligible_collateral_cents).
+    """
+    return db.query(
+        Asset.type.label("asset_type"),
+        func.sum(
+            type_coerce(Asset.stated_value_cents, Float) * Asset.ltv_ratio / Asset.reference_mark
+        ).label("units"),
+        func.sum(Asset.appraised_value_cents).label("eligible_collateral_cents"),
+    ).filter(
+        Asset.user_id == user_id,
+        Asset.status.in_(COLLATERAL_STATUSES),
+    ).group_by(Asset.type).all()
+
+
+def shift_position_collateral(db: Session, asset_type: str, mark: float, now: datetime) -> int:
+    """
+    Move total_eligible_collateral_cents on every snapshot exposed to `asset_type`
+    by that exposure's change at `mark` (units × mark to the cent − eligible_collateral_cents),
+    bumping the version so in-flight writers retry. Reads only the exposure
+    index for that type. Not committed; returns the number of snapshots updated.
+    """
+    return db.execute(
+        update(UserPosition)
+        .where(
+            UserPosition.user_id == UserExposure.user_id,
+            UserExposure.asset_type == asset_type,
+            UserExposure.units > 0,
+        )
+        .values(
+            total_eligible_collateral_cents=UserPosition.total_eligible_collateral_cents
+            + _round_cents(UserExposure.units * mark) - UserExposure.eligible_collateral_cents,
+            version=UserPosition.version + 1,
+            updated_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def mark_exposures(db: Session, asset_type: str, mark: float) -> None:
+    """
+    Revalue every exposure to `asset_type` at `mark`. Not committed.
+    """
+    db.execute(
+        update(UserExposure)
+        .where(UserExposure.asset_type == asset_type, UserExposure.units > 0)
+        .values(eligible_collateral_cents=_round_cents(UserExposure.units * mark))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def clear_exposures(db: Session, user_ids: list[str]) -> None:
+    """
+    Zero the exposures of users whose collateral was seized. Not committed.
+    """
+    if user_ids:
+        db.execute(
+            update(UserExposure)
+            .where(UserExposure.user_id.in_(user_ids))
+            .values(units=0.0, eligible_collateral_cents=0)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def get_exposed_positions(db: Session, asset_types: list[str]) -> list[Row]:
+    """
+    Snapshot rows (user_id, total_eligible_collateral_cents, total_principal_cents,
+    accrued_interest_cents, rate_weighted_principal, interest_as_of) of every user
+    exposed to any of `asset_types`, found through the exposure index.
+    """
+    holders = (
+        select(UserExposure.user_id)
+        .where(UserExposure.asset_type.in_(asset_types), UserExposure.units > 0)
+        .distinct()
+    )
+    return db.execute(
+        select(
+            UserPosition.user_id,
+            UserPosition.total_eligible_collateral_cents,
+            UserPosition.total_principal_cents,
+            UserPosition.accrued_interest_cents,
+            UserPosition.rate_weighted_principal,
+            UserPosition.interest_as_of,
+        ).where(UserPosition.user_id.in_(holders))
+    ).all()
+
+
+# ----------------
+# Stress testing
+# ----------------
+def get_debtor_positions(db: Session, after_user_id: str | None, size: int) -> list[Row]:
+    """
+    The next `size` snapshots carrying debt after `after_user_id`, in user_id
+    order: (user_id, total_principal_cents, accrued_interest_cents,
+    rate_weighted_principal, interest_as_of).
+    """
+    query = select(
+        UserPosition.user_id,
+        UserPosition.total_principal_cents,
+        UserPosition.accrued_interest_cents,
+        UserPosition.rate_weighted_principal,
+        UserPosition.interest_as_of,
+    ).where(or_(UserPosition.total_principal_cents > 0, UserPosition.accrued_interest_cents > 0))
+    if after_user_id is not None:
+        query = query.where(UserPosition.user_id > after_user_id)
+    return db.execute(query.order_by(UserPosition.user_id).limit(size)).all()
+
+
+def get_exposures_in_range(db: Session, first_user_id: str, last_user_id: str) -> list[Row]:
+    """
+    (user_id, asset_type, eligible_collateral_cents) of every non-zero exposure
+    with first_user_id <= user_id <= last_user_id; a primary-key range scan.
+    """
+    return db.execute(
+        select(UserExposure.user_id, UserExposure.asset_type, UserExposure.eligible_collateral_cents)
+        .where(
+            UserExposure.user_id >= first_user_id,
+            UserExposure.user_id <= last_user_id,
+            UserExposure.units > 0,
+        )
+    ).all()
+
+
+def get_unsnapshotted_debtors(db: Session, after_user_id: str | None, size: int, as_of: datetime) -> list[Row]:
+    """
+    The next `size` users with ACTIVE loans but no user_positions snapshot
+    after `after_user_id`, in user_id order, with their debt aggregated from
+    the loans table: (user_id, debt), principal + interest outstanding at
+    `as_of` in cents.
+    """
+    debt = func.sum(_principal_remaining() + _interest_outstanding(as_of))
+    query = (
+        select(Loan.user_id, debt.label("debt"))
+        .where(
+            Loan.status == LoanStatus.active.value,
+            ~select(UserPosition.user_id).where(UserPosition.user_id == Loan.user_id).exists(),
+        )
+        .group_by(Loan.user_id)
+        .having(debt > 0)
+    )
+    if after_user_id is not None:
+        query = query.where(Loan.user_id > after_user_id)
+    return db.execute(query.order_by(Loan.user_id).limit(size)).all()
+
+
+def get_unsnapshotted_collateral_in_range(db: Session, first_user_id: str, last_user_id: str) -> list[Row]:
+    """
+    (user_id, asset_type, eligible_collateral_cents) for users with
+    first_user_id <= user_id <= last_user_id and no user_positions snapshot,
+    summed from the appraised values of ACTIVE and LOCKED assets: the
+    exposures a snapshot would hold.
+    """
+    return db.execute(
+        select(Asset.user_id, Asset.type, func.sum(Asset.appraised_value_cents))
+        .where(
+            Asset.user_id >= first_user_id,
+            Asset.user_id <= last_user_id,
+            Asset.status.in_(COLLATERAL_STATUSES),
+            ~select(UserPosition.user_id).where(UserPosition.user_id == Asset.user_id).exists(),
+        )
+        .group_by(Asset.user_id, Asset.type)
+    ).all()
+
+
+# ----------------
+# Idempotency keys
+# ----------------
+def get_idempotency_key(db: Session, user_id: str, key: str) -> IdempotencyKey | None:
+    """
+    Return the stored record for a user's Idempotency-Key, or None.
+    """
+    return db.get(IdempotencyKey, (user_id, key), populate_existing=True)
+
+
+def add_idempotency_key(db: Session, record: IdempotencyKey) -> IdempotencyKey:
+    """
+    Claim a key. Raises IntegrityError if a concurrent request claimed it first.
+    """
+    db.add(record)
+    db.commit()
+    return record
+
+
+def reclaim_idempotency_key(
+    db: Session, record: IdempotencyKey, claimed_at: datetime, expires_at: datetime
+) -> bool:
+    """
+    Take over an unfinished claim whose holder never completed it. Succeeds
+    only if the row is still the claim `record` was read as (no response,
+    same claim time), so of several concurrent retries exactly one wins.
+    """
+    result = db.execute(
+        update(IdempotencyKey)
+        .where(
+            IdempotencyKey.user_id == record.user_id,
+            IdempotencyKey.key == record.key,
+            IdempotencyKey.status_code.is_(None),
+            IdempotencyKey.created_at == record.created_at,
+        )
+        .values(created_at=claimed_at, expires_at=expires_at)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def delete_idempotency_key(db: Session, record: IdempotencyKey) -> None:
+    """
+    Release a key so the next request with it runs normally.
+    """
+    db.delete(record)
+    db.commit()
+
+
+# ----------------
+# Interest accrual
+# ----------------
+def get_active_loan_chunk_end(db: Session, after_id: str | None, size: int) -> str | None:
+    """
+    Highest id among the next `size` ACTIVE loans after `after_id` (primary-key
+    order), or None when no active loans remain.
+    """
+    query = select(Loan.id).where(Loan.status == LoanStatus.active.value)
+    if after_id is not None:
+        query = query.where(Loan.id > after_id)
+    chunk = query.order_by(Loan.id).limit(size).subquery()
+    return db.execute(select(func.max(chunk.c.id))).scalar()
+
+
+def accrue_loan_interest(db: Session, as_of: datetime, after_id: str | None, through_id: str) -> int:
+    """
+    Roll interest up to `as_of` into accrued_interest_cents for ACTIVE loans with
+    after_id < id <= through_id, in one set-based UPDATE. Loans already accrued
+    through `as_of` are skipped, so re-running a chunk is a no-op.
+    Not committed; returns the number of loans updated.
+    """
+    days = _days_to_accrue(as_of)
+    stmt = (
+        update(Loan)
+        .where(
+            Loan.status == LoanStatus.active.value,
+            Loan.id <= through_id,
+            days > 0,
+        )
+        .values(
+            accrued_interest_cents=Loan.accrued_interest_cents + _interest_for_days(days),
+            interest_days_accrued=Loan.interest_days_accrued + days,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if after_id is not None:
+        stmt = stmt.where(Loan.id > after_id)
+    return db.execute(stmt).rowcount
+
+
+def get_unfinished_accrual_run(db: Session) -> AccrualRun | None:
+    """
+    Return the most recently started accrual run that never finished, or None.
+    """
+    return (
+        db.query(AccrualRun)
+        .filter(AccrualRun.finished_at.is_(None))
+        .order_by(AccrualRun.started_at.desc())
+        .first()
+    )
+
+
+def get_latest_accrual_progress(db: Session) -> Row | None:
+    """
+    (id, chunks_done) of the most recently started accrual run, or None.
+    Changes whenever the job commits a chunk of loan interest.
+    """
+    return db.execute(
+        select(AccrualRun.id, AccrualRun.chunks_done).order_by(AccrualRun.started_at.desc()).limit(1)
+    ).one_or_none()
+
+
+def add_accrual_run(db: Session, run: AccrualRun) -> AccrualRun:
+    """
+    Persist a new accrual run checkpoint.
+    """
+    db.add(run)
+    db.commit()
+    db.refresh(run)
+    return run
+
+
+# ----------------
+# Liquidation
+# ----------------
+def get_debtor_chunk_end(db: Session, after_user_id: str | None, size: int) -> str | None:
+    """
+    Highest user_id among the next `size` users with ACTIVE loans after
+    `after_user_id`, or None when none remain. Walks the partial active-loan index.
+    """
+    query = select(Loan.user_id).where(Loan.status == LoanStatus.active.value).distinct()
+    if after_user_id is not None:
+        query = query.where(Loan.user_id > after_user_id)
+    chunk = query.order_by(Loan.user_id).limit(size).subquery()
+    return db.execute(select(func.max(chunk.c.user_id))).scalar()
+
+
+def get_liquidation_batch(db: Session, after_user_id: str | None, through_user_id: str, as_of: datetime) -> list[Row]:
+    """
+    One row per user with ACTIVE loans and after_user_id < user_id <= through_user_id,
+    aggregated in the database, in cents:
+      - debt:                   principal + interest outstanding at `as_of`
+      - liquidation_collateral: Σ value at the current mark × the asset type's
+                                liquidation_threshold over ACTIVE and LOCKED assets
+                                (fractional). The value at the mark is appraised_value
+                                / ltv_ratio, i.e. stated_value × mark / reference_mark
+                                as of the last revaluation.
+      - version:                user_positions.version (None if no snapshot yet)
+    """
+    def in_range(column):
+        bounds = [column <= through_user_id]
+        if after_user_id is not None:
+            bounds.append(column > after_user_id)
+        return bounds
+
+    debt = (
+        select(
+            Loan.user_id,
+            func.sum(_principal_remaining() + _interest_outstanding(as_of)).label("debt"),
+        )
+        .where(Loan.status == LoanStatus.active.value, *in_range(Loan.user_id))
+        .group_by(Loan.user_id)
+        .subquery()
+    )
+    threshold = case(
+        {asset_type: cfg.liquidation_threshold for asset_type, cfg in ASSET_TYPE_CONFIG.items()},
+        value=Asset.type,
+        else_=0.0,
+    )
+    collateral = (
+        select(
+            Asset.user_id,
+            func.sum(
+                type_coerce(Asset.appraised_value_cents, Float) / Asset.ltv_ratio * threshold
+            ).label("liquidation_collateral"),
+        )
+        .where(Asset.status.in_(COLLATERAL_STATUSES), *in_range(Asset.user_id))
+        .group_by(Asset.user_id)
+        .subquery()
+    )
+    query = (
+        select(
+            debt.c.user_id,
+            debt.c.debt,
+            func.coalesce(collateral.c.liquidation_collateral, 0.0).label("liquidation_collateral"),
+            UserPosition.version,
+        )
+        .select_from(debt)
+        .outerjoin(collateral, collateral.c.user_id == debt.c.user_id)
+        .outerjoin(UserPosition, UserPosition.user_id == debt.c.user_id)
+        .order_by(debt.c.user_id)
+    )
+    return db.execute(query).all()
+
+
+def close_out_positions(db: Session, versions: dict[str, int], now: datetime) -> list[str]:
+    """
+    Zero the debt and eligible collateral of each user's snapshot, but only
+    where user_positions.version still equals the version the scan read; the
+    version is bumped like any other write. Returns the user_ids updated.
+    Not committed.
+    """
+    if not versions:
+        return []
+    stmt = (
+        update(UserPosition)
+        .where(tuple_(UserPosition.user_id, UserPosition.version).in_(list(versions.items())))
+        .values(
+            total_eligible_collateral_cents=0,
+            total_principal_cents=0,
+            rate_weighted_principal=0.0,
+            accrued_interest_cents=0,
+            interest_as_of=now,
+            updated_at=now,
+            version=UserPosition.version + 1,
+        )
+        .returning(UserPosition.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    return list(db.execute(stmt).scalars())
+
+
+def add_closed_out_positions(db: Session, user_ids: list[str], now: datetime) -> None:
+    """
+    Insert already-closed-out snapshots (no debt, no eligible collateral) for
+    users who have none yet. Raises IntegrityError if one was created
+    concurrently. Not committed.
+    """
+    deposited = dict(db.execute(
+        select(Asset.user_id, func.sum(Asset.stated_value_cents))
+        .where(Asset.user_id.in_(user_ids))
+        .group_by(Asset.user_id)
+    ).all())
+    db.execute(insert(UserPosition), [
+        {
+            "user_id": user_id,
+            "total_deposited_cents": deposited.get(user_id) or 0,
+            "total_eligible_collateral_cents": 0,
+            "total_principal_cents": 0,
+            "rate_weighted_principal": 0.0,
+            "accrued_interest_cents": 0,
+            "interest_as_of": now,
+            "version": 1,
+            "updated_at": now,
+        }
+        for user_id in user_ids
+    ])
+
+
+def liquidate_user_holdings(db: Session, user_ids: list[str]) -> None:
+    """
+    Mark the users' ACTIVE loans and ACTIVE/LOCKED assets as liquidated, in two
+    set-based UPDATEs. Not committed.
+    """
+    if not user_ids:
+        return
+    db.execute(
+        update(Loan)
+        .where(Loan.user_id.in_(user_ids), Loan.status == LoanStatus.active.value)
+        .values(status=LoanStatus.liquidated.value)
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        update(Asset)
+        .where(Asset.user_id.in_(user_ids), Asset.status.in_(COLLATERAL_STATUSES))
+        .values(status=AssetStatus.liquidated.value)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def add_liquidation_events(db: Session, rows: list[dict]) -> None:
+    """
+    Insert liquidation_events rows in one executemany. Not committed.
+    """
+    if rows:
+        db.execute(insert(LiquidationEvent), rows)
+
+
+# ----------------
+# Bulk load
+# ----------------
+def _copy_value(value):
+    if value is None:
+        return None   # empty unquoted field: NULL in COPY ... CSV
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return value
+
+
+def bulk_load(db: Session, model, columns: dict[str, list]) -> int:
+    """
+    Insert column-oriented rows (column name → values, all the same length)
+    into `model`'s table: COPY FROM STDIN on PostgreSQL with psycopg2, one
+    executemany elsewhere. Values must be plain Python types in storage
+    units (cents for Money columns). Not committed. Returns the row count.
     """
-    return db.query(Loan).filter(Loan.id == loan_id).first()
\ No newline at end of file
+    names = list(columns)
+    rows  = list(zip(*(columns[name] for name in names)))
+    if not rows:
+        return 0
+    connection = db.connection()
+    if connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg2":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([_copy_value(value) for value in row])
+        buffer.seek(0)
+        with connection.connection.dbapi_connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {model.__tablename__} ({', '.join(names)}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+    else:
+        # Core insert on the table: the ORM bulk path splits the batch wherever a row has a None
+        db.execute(insert(model.__table__), [dict(zip(names, row)) for row in rows])
+    return len(rows)
@@ -0,0 +1,98 @@
+"""
+Revaluation Service — re-appraise collateral when market marks move.
+
+A batch of new marks (asset type → price) is applied in one transaction and
+touches only what the moved types affect:
+
+  - one set-based UPDATE re-appraises the held assets of those types
+    (ix_assets_type_status)
+  - user_exposures (user, asset type → units of eligible collateral per unit
+    of mark) is the index from a type to the users holding it: each exposed
+    snapshot's total_eligible_collateral_cents is shifted by its exposure's change,
+    units × new mark − previous value, without re-summing any user's assets
+  - the health factors of the exposed positions are recomputed with the
+    vectorized risk engine, and those below HEALTH_FACTOR_SAFE are returned
+    as the at-risk list
+
+Positions with no exposure to a moved type are never read, so a crypto tick
+costs in proportion to the crypto holders, not the size of the book.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from .money import from_cents
+from .repository import get_exposed_positions, mark_exposures, reappraise_assets, shift_position_collateral
+from .risk_engine import calculate_health_factor_batch
+from .rules import HEALTH_FACTOR_MIN, HEALTH_FACTOR_SAFE
+from .service import _whole_days
+
+
+@dataclass
+class AtRiskPosition:
+    user_id: str
+    health_factor: float
+    eligible_collateral: float   # dollars
+    debt: float                  # dollars
+    below_minimum: bool          # under HEALTH_FACTOR_MIN: liquidation territory
+
+
+@dataclass
+class RevaluationResult:
+    marks: dict[str, float]
+    assets_reappraised: int
+    positions_updated: int
+    at_risk: list[AtRiskPosition] = field(default_factory=list)   # lowest health factor first
+
+
+def apply_marks(db: Session, marks: dict[str, float], now: Optional[datetime] = None) -> RevaluationResult:
+    """Re-appraise the assets of the types in `marks` and revalue only their holders' positions."""
+    for asset_type, price in marks.items():
+        if not price > 0:
+            raise ValueError(f"Mark for '{asset_type}' must be positive")
+    now = now or datetime.now(timezone.utc)
+
+    assets    = reappraise_assets(db, marks, now)
+    positions = 0
+    for asset_type, price in marks.items():
+        positions += shift_position_collateral(db, asset_type, price, now)
+        mark_exposures(db, asset_type, price)
+    at_risk = _at_risk_positions(db, list(marks), now) if marks else []
+    db.commit()
+    return RevaluationResult(
+        marks=dict(marks), assets_reappraised=assets, positions_updated=positions, at_risk=at_risk,
+    )
+
+
+def _at_risk_positions(db: Session, asset_types: list[str], now: datetime) -> list[AtRiskPosition]:
+    """Health factors of the positions exposed to `asset_types`; those with debt below HEALTH_FACTOR_SAFE."""
+    rows = get_exposed_positions(db, asset_types)
+    if not rows:
+        return []
+    days = np.fromiter(
+        (max(_whole_days(r.interest_as_of, now), 0) for r in rows), dtype=np.float64, count=len(rows)
+    )
+    eligible = np.fromiter((r.total_eligible_collateral_cents for r in rows), dtype=np.int64, count=len(rows))
+    interest = np.fromiter((r.rate_weighted_principal for r in rows), dtype=np.float64, count=len(rows)) * days / 365.0
+    debt = (
+        np.fromiter((r.total_principal_cents for r in rows), dtype=np.int64, count=len(rows))
+        + np.fromiter((r.accrued_interest_cents for r in rows), dtype=np.int64, count=len(rows))
+        + np.floor(interest + 0.5).astype(np.int64)   # money.round_cents, vectorized
+    )
+    health_factor = calculate_health_factor_batch(eligible, debt)
+
+    at_risk = np.flatnonzero((debt > 0) & (health_factor < HEALTH_FACTOR_SAFE))
+    at_risk = at_risk[np.argsort(health_factor[at_risk], kind="stable")]
+    return [
+        AtRiskPosition(
+            user_id=rows[i].user_id,
+            health_factor=float(health_factor[i]),
+            eligible_collateral=from_cents(int(eligible[i])),
+            debt=from_cents(int(debt[i])),
+            below_minimum=bool(health_factor[i] < HEALTH_FACTOR_MIN),
+        )
+        for i in at_risk
+    ]
@@ -6,6 +6,10 @@ This keeps the engine fully testable without a database.
 """
 from dataclasses import dataclass
 from typing import Optional
+
+import numpy as np
+from numpy.typing import ArrayLike
+
 from .rules import HEALTH_FACTOR_MIN, MAX_LTV
 
 
@@ -112,3 +116,145 @@ def evaluate_loan_eligibility(
         outstanding_debt=total_outstanding_debt,
         max_additional_borrow=max_additional,
     )
+
+
+# ────────────────────────────────────────
+# Batch (vectorized) evaluation
+# ────────────────────────────────────────
+# Same rules as the scalar functions above, applied element-wise over NumPy
+# arrays so a whole book can be evaluated in one pass (risk sweeps,
+# liquidation scans). Results match the scalar path value for value.
+
+REJECT_NO_COLLATERAL = 1
+REJECT_MAX_LTV       = 2
+REJECT_HEALTH_FACTOR = 3
+
+
+@dataclass
+class BatchEvaluationResult:
+    approved: np.ndarray                  # bool mask
+    requested_amount: np.ndarray
+    projected_ltv: np.ndarray
+    health_factor: np.ndarray
+    total_eligible_collateral: np.ndarray
+    outstanding_debt: np.ndarray
+    max_additional_borrow: np.ndarray
+    rejection_code: np.ndarray            # 0 = approved, else REJECT_* constant
+
+    def __len__(self) -> int:
+        return len(self.approved)
+
+    def row(self, i: int) -> EvaluationResult:
+        """Materialise row `i` as a scalar EvaluationResult."""
+        code = int(self.rejection_code[i])
+        max_additional = float(self.max_additional_borrow[i])
+        if code == REJECT_NO_COLLATERAL:
+            reason = "No eligible collateral. Deposit assets first."
+        elif code == REJECT_MAX_LTV:
+            reason = (
+                f"Loan exceeds eligible collateral. "
+                f"Maximum additional borrow: ${max_additional:,.2f}"
+            )
+        elif code == REJECT_HEALTH_FACTOR:
+            reason = "Health factor would fall below minimum. Reduce amount or add collateral."
+        else:
+            reason = None
+        return EvaluationResult(
+            approved=bool(self.approved[i]),
+            requested_amount=float(self.requested_amount[i]),
+            projected_ltv=float(self.projected_ltv[i]),
+            health_factor=float(self.health_factor[i]),
+            total_eligible_collateral=float(self.total_eligible_collateral[i]),
+            outstanding_debt=float(self.outstanding_debt[i]),
+            max_additional_borrow=max_additional,
+            rejection_reason=reason,
+        )
+
+
+def calculate_health_factor_batch(
+    total_eligible_collateral: ArrayLike,
+    total_outstanding_debt: ArrayLike,
+) -> np.ndarray:
+    """Vectorized calculate_health_factor — inf where there is no debt."""
+    collateral = np.asarray(total_eligible_collateral, dtype=np.float64)
+    debt       = np.asarray(total_outstanding_debt, dtype=np.float64)
+    collateral, debt = np.broadcast_arrays(collateral, debt)
+    out = np.full(debt.shape, np.inf)
+    np.divide(collateral, debt, out=out, where=debt > 0)
+    return out
+
+
+def calculate_ltv_batch(
+    outstanding_debt: ArrayLike,
+    eligible_collateral: ArrayLike,
+) -> np.ndarray:
+    """Vectorized calculate_ltv — inf where there is no collateral."""
+    debt       = np.asarray(outstanding_debt, dtype=np.float64)
+    collateral = np.asarray(eligible_collateral, dtype=np.float64)
+    debt, collateral = np.broadcast_arrays(debt, collateral)
+    out = np.full(collateral.shape, np.inf)
+    np.divide(debt, collateral, out=out, where=collateral > 0)
+    return out
+
+
+def evaluate_loan_eligibility_batch(
+    requested_amount: ArrayLike,
+    total_eligible_collateral: ArrayLike,
+    total_outstanding_debt: ArrayLike,
+) -> BatchEvaluationResult:
+    """
+    Vectorized evaluate_loan_eligibility.
+
+    Inputs broadcast against each other, so a single user's totals can be
+    paired with a vector of candidate amounts, or one amount with a vector
+    of users.
+    """
+    requested, collateral, debt = np.broadcast_arrays(
+        np.asarray(requested_amount, dtype=np.float64),
+        np.asarray(total_eligible_collateral, dtype=np.float64),
+        np.asarray(total_outstanding_debt, dtype=np.float64),
+    )
+
+    no_collateral  = collateral <= 0
+    max_additional = np.where(no_collateral, 0.0, np.maximum(collateral - debt, 0.0))
+
+    projected_debt = debt + requested
+    projected_ltv  = calculate_ltv_batch(projected_debt, collateral)
+    health_factor  = calculate_health_factor_batch(collateral, projected_debt)
+
+    over_ltv  = ~no_collateral & (projected_ltv > MAX_LTV)
+    low_hf    = ~no_collateral & ~over_ltv & (health_factor < HEALTH_FACTOR_MIN)
+
+    rejection_code = np.zeros(requested.shape, dtype=np.int8)
+    rejection_code[no_collateral] = REJECT_NO_COLLATERAL
+    rejection_code[over_ltv]      = REJECT_MAX_LTV
+    rejection_code[low_hf]        = REJECT_HEALTH_FACTOR
+
+    return BatchEvaluationResult(
+        approved=rejection_code == 0,
+        requested_amount=requested.copy(),
+        projected_ltv=np.where(no_collateral, np.inf, projected_ltv),
+        health_factor=np.where(no_collateral, 0.0, health_factor),
+        total_eligible_collateral=np.where(no_collateral, 0.0, collateral),
+        outstanding_debt=debt.copy(),
+        max_additional_borrow=max_additional,
+        rejection_code=rejection_code,
+    )
+
+
+def max_borrow_batch(
+    total_eligible_collateral: ArrayLike,
+    total_outstanding_debt: ArrayLike,
+) -> np.ndarray:
+    """
+    Largest additional borrow that evaluate_loan_eligibility still approves,
+    in the unit of the inputs — solved from the rules rather than searched:
+    projected LTV ≤ MAX_LTV caps debt at collateral × MAX_LTV, and health
+    factor ≥ HEALTH_FACTOR_MIN caps it at collateral / HEALTH_FACTOR_MIN.
+    0 where there is no collateral or no headroom left.
+    """
+    collateral = np.asarray(total_eligible_collateral, dtype=np.float64)
+    debt       = np.asarray(total_outstanding_debt, dtype=np.float64)
+    collateral, debt = np.broadcast_arrays(collateral, debt)
+    ceiling = np.minimum(collateral * MAX_LTV, collateral / HEALTH_FACTOR_MIN)
+    return np.where(collateral > 0, np.maximum(ceiling - debt, 0.0), 0.0)
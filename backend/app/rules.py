@@ -28,6 +28,7 @@ class AssetStatus(str, Enum):
     active = "active"
     locked = "locked"
     rejected = "rejected"
+    liquidated = "liquidated"
 
 
 # ----------------
@@ -41,6 +42,14 @@ class LoanStatus(str, Enum):
     liquidated = "liquidated"
 
 
+# ----------------
+# Loan Pricing
+# ----------------
+# Rate charged on new loans. The loan row stores its own rate; snapshots and
+# aggregates weight principal by that stored rate, falling back to this one.
+LOAN_INTEREST_RATE = 0.05
+
+
 # ----------------
 # Risk Thresholds
 # ----------------
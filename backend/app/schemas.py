@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, EmailStr, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, Field, EmailStr, ConfigDict, PositiveFloat
+from typing import Any, Optional, TypedDict
 from datetime import datetime
 
 
@@ -50,6 +50,7 @@ class AssetPreviewResponse(BaseModel):
     ltv_ratio: float
     appraised_value: float
     risk_tier: str
+    mark: float = 1.0        # cached market mark for the asset type
 
 
 class AssetRead(BaseModel):
@@ -65,6 +66,37 @@ class AssetRead(BaseModel):
     created_at: datetime
 
 
+class AssetRecord(TypedDict):
+    """AssetRead as a plain dict — the list endpoint's fast path, encoded without model validation."""
+    id: str
+    user_id: str
+    type: str
+    description: Optional[str]
+    stated_value: float
+    appraised_value: float
+    ltv_ratio: float
+    status: str
+    created_at: datetime
+
+
+MAX_BULK_ASSETS = 5_000
+
+
+class BulkAssetRequest(BaseModel):
+    # Rows are validated one by one in the service so a bad row is reported, not fatal
+    assets: list[dict[str, Any]] = Field(..., min_length=1, max_length=MAX_BULK_ASSETS)
+
+
+class BulkRowError(BaseModel):
+    index: int
+    detail: str
+
+
+class BulkAssetResponse(BaseModel):
+    created: list[AssetRead]
+    errors: list[BulkRowError]
+
+
 # ─────────────────────────────────────
 # Loans
 # ─────────────────────────────────────
@@ -83,6 +115,31 @@ class LoanEvaluationResponse(BaseModel):
     rejection_reason: Optional[str] = None
 
 
+MAX_EVALUATION_POINTS = 1_000
+
+
+class LoanEvaluationBatchRequest(BaseModel):
+    amounts: list[PositiveFloat] = Field(..., min_length=1, max_length=MAX_EVALUATION_POINTS)
+    # False: independent candidates (a slider). True: successive draws, each evaluated at the running total
+    cumulative: bool = False
+
+
+class LoanEvaluationPoint(BaseModel):
+    requested_amount: float          # running total when cumulative
+    approved: bool
+    projected_ltv: float
+    health_factor: float
+    rejection_reason: Optional[str] = None
+
+
+class LoanEvaluationBatchResponse(BaseModel):
+    total_eligible_collateral: float
+    outstanding_debt: float
+    max_additional_borrow: float
+    max_borrow: LoanEvaluationPoint  # largest approvable amount, to the cent
+    points: list[LoanEvaluationPoint]
+
+
 class RepayRequest(BaseModel):
     amount: float = Field(..., gt=0)
 
@@ -104,6 +161,23 @@ class LoanRead(BaseModel):
     repaid_at: Optional[datetime]
 
 
+class LoanRecord(TypedDict):
+    """LoanRead as a plain dict — the list endpoint's fast path, encoded without model validation."""
+    id: str
+    user_id: str
+    amount: float
+    amount_repaid: float
+    accrued_interest: float
+    interest_rate: float
+    status: str
+    ltv_at_origination: Optional[float]
+    health_factor_snapshot: Optional[float]
+    rejection_reason: Optional[str]
+    created_at: datetime
+    activated_at: Optional[datetime]
+    repaid_at: Optional[datetime]
+
+
 # ─────────────────────────────────────
 # Position
 # ─────────────────────────────────────
@@ -2,22 +2,37 @@
 Service Layer — orchestrates business logic for assets, loans, and positions.
 Auth logic lives in auth_service.py.
 """
+import base64
+import functools
+import json
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Optional
+
+import numpy as np
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
-from .models import Asset, Loan
-from .schemas import PositionResponse
+from .models import Asset, Loan, UserPosition, UserExposure, generate_uuid
+from .money import format_cents, from_cents, round_cents, to_cents
+from .schemas import AssetCreate, AssetRecord, LoanRecord, PositionResponse
 from .repository import (
-    add_asset, add_loan, get_loan,
-    list_assets, list_loans,
+    add_asset, add_assets_bulk, add_loan, get_loan,
+    list_assets, list_loans, list_assets_page, list_loans_page,
+    get_collateral_totals, get_loan_totals, get_rate_weighted_principal,
+    get_user_position, get_exposure, list_exposures, get_exposure_totals,
 )
-from .rules import LoanStatus, AssetStatus
-from .valuation_service import appraise
+from .rules import LoanStatus, AssetStatus, ALLOWED_ASSET_TYPES, LOAN_INTEREST_RATE
+from .valuation_service import appraise, appraise_batch
 from .risk_engine import (
     evaluate_loan_eligibility,
+    evaluate_loan_eligibility_batch,
     calculate_health_factor,
     calculate_ltv,
+    max_borrow_batch,
+    BatchEvaluationResult,
     EvaluationResult,
 )
 
@@ -33,6 +48,103 @@ class ForbiddenError(Exception):
     pass
 
 
+class ConflictError(Exception):
+    """Concurrent writes to the same user's position kept winning; safe for the client to retry."""
+    pass
+
+
+class IntegrityViolation(ValueError):
+    """A write broke a database constraint other than a retryable insert race, e.g. its user no longer exists."""
+    pass
+
+
+# ────────────────────────────────────────
+# Per-user write serialization
+# ────────────────────────────────────────
+POSITION_WRITE_ATTEMPTS = 10
+
+
+def _serialized_per_user(fn):
+    """
+    Run a position-changing write serialized per user. Writers lock the
+    user_positions row (SELECT ... FOR UPDATE) before reading collateral and
+    debt, and the row's version column turns the final UPDATE into a
+    compare-and-swap. Where row locks are unavailable (SQLite) a racing write
+    fails with StaleDataError, rolls back, and is retried from scratch on
+    fresh totals, so two borrows can never both spend the same headroom.
+    Two first writes racing to insert the user's user_positions or
+    user_exposures row surface as IntegrityError on that primary key and are
+    retried the same way; any other IntegrityError is not a race and is
+    raised as IntegrityViolation.
+    """
+    @functools.wraps(fn)
+    def wrapper(db: Session, *args, **kwargs):
+        for _ in range(POSITION_WRITE_ATTEMPTS):
+            try:
+                return fn(db, *args, **kwargs)
+            except StaleDataError:
+                db.rollback()
+            except IntegrityError as e:
+                db.rollback()
+                if not _is_insert_race(e):
+                    raise _integrity_violation(e) from e
+        raise ConflictError("Too many concurrent updates to this account, please retry")
+    return wrapper
+
+
+# Primary keys a concurrent first write can beat us to. PostgreSQL reports the
+# constraint name; SQLite only "UNIQUE constraint failed: <table>.<column>, ...".
+_INSERT_RACE_CONSTRAINTS = ("user_positions_pkey", "user_exposures_pkey")
+_INSERT_RACE_TABLES      = ("user_positions", "user_exposures")
+
+
+def _is_insert_race(error: IntegrityError) -> bool:
+    constraint = getattr(getattr(error.orig, "diag", None), "constraint_name", None)
+    if constraint:
+        return constraint in _INSERT_RACE_CONSTRAINTS
+    message = str(error.orig)
+    return (
+        any(f'"{name}"' in message for name in _INSERT_RACE_CONSTRAINTS)
+        or any(message.startswith(f"UNIQUE constraint failed: {table}.") for table in _INSERT_RACE_TABLES)
+    )
+
+
+def _integrity_violation(error: IntegrityError) -> IntegrityViolation:
+    if "foreign key" in str(error.orig).lower():
+        return IntegrityViolation("Account not found")
+    return IntegrityViolation("Request conflicts with existing data")
+
+
+# ────────────────────────────────────────
+# Pagination
+# ────────────────────────────────────────
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE     = 500
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """Opaque keyset cursor for the row a page ended on."""
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(row_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid pagination cursor")
+
+
+def _page(rows: list, limit: int) -> tuple[list, Optional[str]]:
+    """Trim the look-ahead row and derive the next cursor from the last row kept."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
 # ────────────────────────────────────────
 # Asset Services
 # ────────────────────────────────────────
@@ -41,6 +153,7 @@ def preview_asset(asset_type: str, stated_value: float):
     return appraise(asset_type, stated_value)
 
 
+@_serialized_per_user
 def create_asset(
     db: Session,
     user_id: str,
@@ -48,61 +161,293 @@ def create_asset(
     stated_value: float,
     description: Optional[str] = None,
 ) -> Asset:
-    # user_id is already validated by get_current_user dependency
+    # user_id comes from the signed JWT (get_current_user_id dependency)
     valuation = appraise(asset_type, stated_value)
+    now = datetime.now(timezone.utc)
+
+    position = _load_position(db, user_id, now)
+    position.total_deposited_cents           += valuation.stated_value_cents
+    position.total_eligible_collateral_cents += valuation.appraised_value_cents
+    position.updated_at                       = now
+    _add_exposure(
+        db, user_id, valuation.asset_type, valuation.appraised_value_cents,
+        valuation.appraised_value_cents / valuation.mark,
+    )
 
     asset = Asset(
         user_id=user_id,
         type=valuation.asset_type,
         description=description,
-        stated_value=stated_value,
-        appraised_value=valuation.appraised_value,
+        stated_value_cents=valuation.stated_value_cents,
+        appraised_value_cents=valuation.appraised_value_cents,
         ltv_ratio=valuation.ltv_ratio,
+        reference_mark=valuation.mark,
         status=AssetStatus.active.value,
-        appraised_at=datetime.now(timezone.utc),
+        appraised_at=now,
+    )
+    return add_asset(db, asset)   # commits the asset and the position together
+
+
+@dataclass
+class BulkAssetResult:
+    created: list[dict[str, Any]]                       # inserted rows, keyed like AssetRead (dollars)
+    errors: dict[int, str] = field(default_factory=dict)  # input index → reason
+
+
+def _describe_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors()
     )
-    return add_asset(db, asset)
+
+
+@_serialized_per_user
+def create_assets_bulk(db: Session, user_id: str, items: list[dict[str, Any]]) -> BulkAssetResult:
+    """
+    Validate, appraise and insert a batch of assets in a single transaction.
+
+    Invalid rows are skipped and reported by input index; the valid rows are
+    still inserted (one executemany) together with one position update.
+    """
+    errors: dict[int, str] = {}
+    parsed: list[tuple[int, AssetCreate]] = []
+    for i, raw in enumerate(items):
+        try:
+            parsed.append((i, AssetCreate.model_validate(raw)))
+        except ValidationError as e:
+            errors[i] = _describe_validation_error(e)
+
+    valuation = appraise_batch([(body.type, body.stated_value) for _, body in parsed])
+
+    now = datetime.now(timezone.utc)
+    rows: list[dict[str, Any]] = []
+    for (i, body), result in zip(parsed, valuation.results):
+        if result is None:
+            continue
+        rows.append(dict(
+            id=generate_uuid(),
+            user_id=user_id,
+            type=result.asset_type,
+            description=body.description,
+            stated_value_cents=result.stated_value_cents,
+            appraised_value_cents=result.appraised_value_cents,
+            ltv_ratio=result.ltv_ratio,
+            reference_mark=result.mark,
+            status=AssetStatus.active.value,
+            created_at=now,
+            appraised_at=now,
+        ))
+    for j, reason in valuation.errors.items():
+        errors[parsed[j][0]] = reason
+
+    if rows:
+        position = _load_position(db, user_id, now)
+        position.total_deposited_cents           += sum(r["stated_value_cents"] for r in rows)
+        position.total_eligible_collateral_cents += sum(r["appraised_value_cents"] for r in rows)
+        position.updated_at                       = now
+        # One exposure update per type: rows added earlier in the batch are
+        # pending, not yet visible to get_exposure()
+        added: dict[str, tuple[int, float]] = {}
+        for r in rows:
+            cents, units = added.get(r["type"], (0, 0.0))
+            added[r["type"]] = (cents + r["appraised_value_cents"], units + r["appraised_value_cents"] / r["reference_mark"])
+        for asset_type, (cents, units) in added.items():
+            _add_exposure(db, user_id, asset_type, cents, units)
+    add_assets_bulk(db, rows)   # commits the assets and the position together
+
+    created = [
+        {
+            **r,
+            "stated_value": from_cents(r["stated_value_cents"]),
+            "appraised_value": from_cents(r["appraised_value_cents"]),
+        }
+        for r in rows
+    ]
+    return BulkAssetResult(created=created, errors=dict(sorted(errors.items())))
 
 
 def get_user_assets(db: Session, user_id: str) -> list[Asset]:
     return list_assets(db, user_id)
 
 
+def get_user_assets_page(
+    db: Session,
+    user_id: str,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    asset_type: Optional[str] = None,
+) -> tuple[list[AssetRecord], Optional[str]]:
+    """Newest-first page of assets plus the cursor for the next page (None on the last page)."""
+    if asset_type is not None:
+        asset_type = asset_type.strip().lower()
+        if asset_type not in ALLOWED_ASSET_TYPES:
+            raise ValueError(
+                f"Unsupported asset type '{asset_type}'. "
+                f"Allowed: {sorted(ALLOWED_ASSET_TYPES)}"
+            )
+    limit = min(limit, MAX_PAGE_SIZE)
+    rows = list_assets_page(
+        db, user_id,
+        limit=limit + 1,
+        after=decode_cursor(cursor) if cursor else None,
+        status=status,
+        asset_type=asset_type,
+    )
+    rows, next_cursor = _page(rows, limit)
+    return [_asset_record(row) for row in rows], next_cursor
+
+
+def _asset_record(row) -> AssetRecord:
+    return AssetRecord(
+        id=row.id,
+        user_id=row.user_id,
+        type=row.type,
+        description=row.description,
+        stated_value=from_cents(row.stated_value_cents),
+        appraised_value=from_cents(row.appraised_value_cents),
+        ltv_ratio=row.ltv_ratio,
+        status=row.status,
+        created_at=row.created_at,
+    )
+
+
 # ────────────────────────────────────────
 # Helpers — collateral and debt totals
 # ────────────────────────────────────────
-def _total_eligible_collateral(db: Session, user_id: str) -> float:
-    """Sum of appraised_value for ACTIVE and LOCKED assets."""
-    assets = list_assets(db, user_id)
-    return sum(
-        a.appraised_value for a in assets
-        if a.status in (AssetStatus.active.value, AssetStatus.locked.value)
-    )
+def _total_eligible_collateral(db: Session, user_id: str) -> int:
+    """Sum of appraised value for ACTIVE and LOCKED assets, in cents."""
+    return get_collateral_totals(db, user_id).total_eligible
 
 
-def _total_outstanding_debt(db: Session, user_id: str) -> float:
-    """Principal + accrued interest still owed on active loans."""
-    loans = list_loans(db, user_id)
-    return sum(
-        max((l.amount or 0.0) - (l.amount_repaid or 0.0), 0.0) + (l.accrued_interest or 0.0)
-        for l in loans
-        if l.status == LoanStatus.active.value
-    )
+def _total_outstanding_debt(db: Session, user_id: str) -> int:
+    """Principal + interest still owed on active loans, accrued up to now, in cents."""
+    totals = get_loan_totals(db, user_id, datetime.now(timezone.utc))
+    return totals.principal_outstanding + totals.interest_as_of
+
+
+def _days_active(loan: Loan, now: datetime) -> int:
+    """Whole days since activation (0 if the loan was never activated)."""
+    if not loan.activated_at:
+        return 0
+    return _whole_days(loan.activated_at, now)
 
 
-def _compute_accrued_interest(loan: Loan) -> float:
+def _compute_accrued_interest(loan: Loan, now: Optional[datetime] = None) -> int:
     """
-    Simple interest since activation: principal × rate × (days / 365).
-    Returns 0 if loan has no activated_at timestamp.
+    Interest outstanding at `now`, in cents: the stored accrued interest (rolled
+    forward by repayments and the nightly accrual job) plus simple interest,
+    principal × rate × (days / 365) rounded to the cent, for the whole days not
+    yet accrued.
     """
-    if not loan.activated_at:
-        return 0.0
-    reference = loan.activated_at
-    if reference.tzinfo is None:
-        reference = reference.replace(tzinfo=timezone.utc)
-    days = (datetime.now(timezone.utc) - reference).days
-    principal_remaining = max((loan.amount or 0.0) - (loan.amount_repaid or 0.0), 0.0)
-    return principal_remaining * (loan.interest_rate or 0.05) * (days / 365.0)
+    now = now or datetime.now(timezone.utc)
+    days = _days_active(loan, now) - (loan.interest_days_accrued or 0)
+    principal_remaining = max((loan.amount_cents or 0) - (loan.amount_repaid_cents or 0), 0)
+    interest = round_cents(principal_remaining * (loan.interest_rate or LOAN_INTEREST_RATE) * max(days, 0) / 365.0)
+    return (loan.accrued_interest_cents or 0) + interest
+
+
+# ────────────────────────────────────────
+# Position snapshot (user_positions)
+# ────────────────────────────────────────
+# Writers adjust the snapshot in the same transaction as the asset/loan
+# change; readers never touch the assets or loans tables. Interest accrues
+# daily on rate_weighted_principal and is rolled into accrued_interest_cents
+# only when a write needs the snapshot current.
+def _add_exposure(db: Session, user_id: str, asset_type: str, appraised_value_cents: int, units: float) -> None:
+    """Count new collateral (appraised value and units of mark) in the user's exposure to its type. Not committed."""
+    exposure = get_exposure(db, user_id, asset_type)
+    if exposure is None:
+        exposure = UserExposure(user_id=user_id, asset_type=asset_type, units=0.0, eligible_collateral_cents=0)
+        db.add(exposure)
+    exposure.units                     += units
+    exposure.eligible_collateral_cents += appraised_value_cents
+
+
+def _rebuild_exposures(db: Session, user_id: str) -> None:
+    """Recompute a user's exposure rows from the assets table. Added to the session, not committed."""
+    exposures = {e.asset_type: e for e in list_exposures(db, user_id)}
+    for exposure in exposures.values():
+        exposure.units                     = 0.0
+        exposure.eligible_collateral_cents = 0
+    for row in get_exposure_totals(db, user_id):
+        exposure = exposures.get(row.asset_type)
+        if exposure is None:
+            exposure = UserExposure(user_id=user_id, asset_type=row.asset_type)
+            db.add(exposure)
+        exposure.units                     = row.units
+        exposure.eligible_collateral_cents = row.eligible_collateral_cents
+
+
+def _as_utc(ts: datetime) -> datetime:
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts
+
+
+# Interest is charged per UTC calendar day, for loans (days_between in SQL)
+# and snapshots alike, so a snapshot's interest agrees with its loans' at
+# any time of day.
+def _whole_days(start: datetime, end: datetime) -> int:
+    """UTC midnights passed from `start` to `end`."""
+    return (_as_utc(end).date() - _as_utc(start).date()).days
+
+
+def _utc_day_start(ts: datetime) -> datetime:
+    return _as_utc(ts).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _rebuild_position(db: Session, user_id: str, now: datetime) -> UserPosition:
+    """Recompute a user's snapshot from the assets/loans tables. Added to the session, not committed."""
+    collateral = get_collateral_totals(db, user_id)
+    debt       = get_loan_totals(db, user_id, now)
+
+    position = get_user_position(db, user_id) or UserPosition(user_id=user_id)
+    position.total_deposited_cents           = collateral.total_deposited
+    position.total_eligible_collateral_cents = collateral.total_eligible
+    position.total_principal_cents           = debt.principal_outstanding
+    position.rate_weighted_principal         = get_rate_weighted_principal(db, user_id)
+    position.accrued_interest_cents          = debt.interest_as_of   # through today's UTC date
+    position.interest_as_of                  = _utc_day_start(now)
+    position.updated_at                      = now
+    db.add(position)
+    _rebuild_exposures(db, user_id)
+    return position
+
+
+def _ensure_position(db: Session, user_id: str, now: datetime, for_update: bool = False) -> UserPosition:
+    """Snapshot for `user_id`, backfilled from the base tables (and committed) if missing."""
+    position = get_user_position(db, user_id, for_update=for_update)
+    if position is None:
+        _rebuild_position(db, user_id, now)
+        try:
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            if not _is_insert_race(e):   # else a concurrent request backfilled it first
+                raise
+        position = get_user_position(db, user_id, for_update=for_update)
+    return position
+
+
+def _load_position(db: Session, user_id: str, now: datetime) -> UserPosition:
+    """
+    Snapshot for a write, locked for the rest of the transaction. Call before
+    making any other change in the session: a missing snapshot is backfilled
+    with its own commit.
+    """
+    return _ensure_position(db, user_id, now, for_update=True)
+
+
+def _accrue_position_interest(position: UserPosition, now: datetime) -> None:
+    """Roll the whole days since interest_as_of into accrued_interest_cents, up to today's UTC date."""
+    days = _whole_days(position.interest_as_of, now)
+    if days > 0:
+        position.accrued_interest_cents += round_cents(position.rate_weighted_principal * days / 365.0)
+        position.interest_as_of = _utc_day_start(now)
+
+
+def _position_interest(position: UserPosition, now: datetime) -> int:
+    """Outstanding interest at `now`, in cents, without mutating the snapshot."""
+    days = max(_whole_days(position.interest_as_of, now), 0)
+    return position.accrued_interest_cents + round_cents(position.rate_weighted_principal * days / 365.0)
 
 
 # ────────────────────────────────────────
@@ -112,75 +457,132 @@ def evaluate_loan(db: Session, user_id: str, amount: float) -> EvaluationResult:
     """Risk assessment dry-run — no DB write."""
     eligible = _total_eligible_collateral(db, user_id)
     debt     = _total_outstanding_debt(db, user_id)
-    return evaluate_loan_eligibility(amount, eligible, debt)
+    return evaluate_loan_eligibility(from_cents(to_cents(amount)), from_cents(eligible), from_cents(debt))
 
 
-def create_loan(db: Session, user_id: str, amount: float) -> Loan:
-    # user_id is already validated by get_current_user dependency
+@dataclass
+class LoanCurve:
+    points: BatchEvaluationResult   # one row per requested amount (running total when cumulative)
+    max_borrow: EvaluationResult    # evaluated at the largest approvable amount, to the cent
+
+
+def evaluate_loan_curve(db: Session, user_id: str, amounts: list[float], cumulative: bool = False) -> LoanCurve:
+    """
+    Batch dry-run — no DB write. Totals are read once and every amount is
+    evaluated in one vectorized pass. With `cumulative`, amounts are
+    successive draws of a borrowing schedule, each evaluated at the running
+    total as if the earlier draws were taken.
+    """
     eligible = _total_eligible_collateral(db, user_id)
     debt     = _total_outstanding_debt(db, user_id)
-    result   = evaluate_loan_eligibility(amount, eligible, debt)
 
-    now = datetime.now(timezone.utc)
+    requested = np.fromiter((to_cents(a) for a in amounts), dtype=np.int64, count=len(amounts))
+    if cumulative:
+        requested = np.cumsum(requested)
+    # Solved in cents and floored. The engine compares in float dollars, where
+    # debt + amount can land one ulp above the collateral, so step down a cent
+    # if the exact boundary would be rejected.
+    max_cents  = int(max_borrow_batch(eligible, debt))
+    max_borrow = evaluate_loan_eligibility(from_cents(max_cents), from_cents(eligible), from_cents(debt))
+    if not max_borrow.approved and max_cents > 0:
+        max_borrow = evaluate_loan_eligibility(from_cents(max_cents - 1), from_cents(eligible), from_cents(debt))
+    return LoanCurve(
+        points=evaluate_loan_eligibility_batch(from_cents(requested), from_cents(eligible), from_cents(debt)),
+        max_borrow=max_borrow,
+    )
+
 
+@_serialized_per_user
+def create_loan(db: Session, user_id: str, amount: float) -> Loan:
+    # user_id comes from the signed JWT (get_current_user_id dependency)
+    now      = datetime.now(timezone.utc)
+    position = _load_position(db, user_id, now)
+
+    amount_cents = to_cents(amount)
+    eligible     = _total_eligible_collateral(db, user_id)
+    debt         = _total_outstanding_debt(db, user_id)
+    result       = evaluate_loan_eligibility(from_cents(amount_cents), from_cents(eligible), from_cents(debt))
+
+    # Touched even for a rejection: the new loan row must bump the version behind the /loans ETag
+    position.updated_at = now
     if result.approved:
         loan = Loan(
             user_id=user_id,
-            amount=amount,
-            interest_rate=0.05,
+            amount_cents=amount_cents,
+            interest_rate=LOAN_INTEREST_RATE,
             status=LoanStatus.active.value,
             ltv_at_origination=result.projected_ltv,
             health_factor_snapshot=result.health_factor,
-            collateral_value_locked=eligible,
+            collateral_value_locked_cents=eligible,
             activated_at=now,
         )
+        # Weighted by the rate stored on the loan, as repay_loan unwinds it
+        _accrue_position_interest(position, now)
+        position.total_principal_cents   += amount_cents
+        position.rate_weighted_principal += amount_cents * loan.interest_rate
     else:
         loan = Loan(
             user_id=user_id,
-            amount=amount,
-            interest_rate=0.05,
+            amount_cents=amount_cents,
+            interest_rate=LOAN_INTEREST_RATE,
             status=LoanStatus.rejected.value,
             rejection_reason=result.rejection_reason,
             ltv_at_origination=result.projected_ltv if result.projected_ltv != float("inf") else None,
             health_factor_snapshot=result.health_factor if result.health_factor != float("inf") else None,
-            collateral_value_locked=eligible,
+            collateral_value_locked_cents=eligible,
         )
 
-    return add_loan(db, loan)
+    return add_loan(db, loan)   # commits the loan and the position together
 
 
+@_serialized_per_user
 def repay_loan(db: Session, loan_id: str, user_id: str, amount: float) -> Loan:
-    loan = get_loan(db, loan_id)
+    # Position lock first: the loan has no version column, so it must be read
+    # under the lock or a concurrent repayment's update to it would be lost
+    now      = datetime.now(timezone.utc)
+    position = _load_position(db, user_id, now)
+
+    loan = get_loan(db, loan_id, for_update=True)
     if not loan:
         raise NotFoundError("Loan not found")
     if loan.user_id != user_id:
         raise ForbiddenError("Not your loan")
     if loan.status != LoanStatus.active.value:
         raise ValueError("Only active loans can be repaid")
-    if amount <= 0:
+    amount_cents = to_cents(amount)
+    if amount_cents <= 0:
         raise ValueError("Repayment amount must be positive")
 
-    # Refresh accrued interest before repayment
-    loan.accrued_interest = _compute_accrued_interest(loan)
+    # Roll interest forward to today before repayment
+    loan.accrued_interest_cents = _compute_accrued_interest(loan, now)
+    loan.interest_days_accrued  = max(_days_active(loan, now), loan.interest_days_accrued or 0)
 
-    # Waterfall: interest first, then principal
-    if amount <= loan.accrued_interest:
-        loan.accrued_interest -= amount
+    # Waterfall: interest first, then principal — all in whole cents
+    if amount_cents <= loan.accrued_interest_cents:
+        interest_paid, principal_paid = amount_cents, 0
+        loan.accrued_interest_cents -= amount_cents
     else:
-        remaining = amount - loan.accrued_interest
-        loan.accrued_interest = 0.0
-        principal_remaining = max(loan.amount - loan.amount_repaid, 0.0)
+        remaining = amount_cents - loan.accrued_interest_cents
+        interest_paid = loan.accrued_interest_cents
+        principal_remaining = max(loan.amount_cents - loan.amount_repaid_cents, 0)
         if remaining > principal_remaining:
-            raise ValueError(
-                f"Overpayment. Total outstanding: "
-                f"${principal_remaining + loan.accrued_interest:,.2f}"
-            )
-        loan.amount_repaid += remaining
+            raise ValueError(f"Overpayment. Total outstanding: {format_cents(principal_remaining + interest_paid)}")
+        loan.accrued_interest_cents = 0
+        principal_paid = remaining
+        loan.amount_repaid_cents += remaining
 
     # Check full repayment
-    if loan.amount_repaid >= loan.amount and loan.accrued_interest <= 0:
+    if loan.amount_repaid_cents >= loan.amount_cents and loan.accrued_interest_cents <= 0:
         loan.status = LoanStatus.repaid.value
-        loan.repaid_at = datetime.now(timezone.utc)
+        loan.repaid_at = now
+
+    _accrue_position_interest(position, now)
+    position.accrued_interest_cents  = max(position.accrued_interest_cents - interest_paid, 0)
+    position.total_principal_cents   = max(position.total_principal_cents - principal_paid, 0)
+    position.rate_weighted_principal = max(
+        position.rate_weighted_principal - principal_paid * (loan.interest_rate or LOAN_INTEREST_RATE), 0.0
+    )
+    position.updated_at = now
 
     db.add(loan)
     db.commit()
@@ -192,24 +594,57 @@ def get_user_loans(db: Session, user_id: str) -> list[Loan]:
     return list_loans(db, user_id)
 
 
+def get_user_loans_page(
+    db: Session,
+    user_id: str,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+) -> tuple[list[LoanRecord], Optional[str]]:
+    """Newest-first page of loans plus the cursor for the next page (None on the last page)."""
+    limit = min(limit, MAX_PAGE_SIZE)
+    rows = list_loans_page(
+        db, user_id,
+        limit=limit + 1,
+        after=decode_cursor(cursor) if cursor else None,
+        status=status,
+    )
+    rows, next_cursor = _page(rows, limit)
+    return [_loan_record(row) for row in rows], next_cursor
+
+
+def _loan_record(row) -> LoanRecord:
+    return LoanRecord(
+        id=row.id,
+        user_id=row.user_id,
+        amount=from_cents(row.amount_cents),
+        amount_repaid=from_cents(row.amount_repaid_cents),
+        accrued_interest=from_cents(row.accrued_interest_cents),
+        interest_rate=row.interest_rate,
+        status=row.status,
+        ltv_at_origination=row.ltv_at_origination,
+        health_factor_snapshot=row.health_factor_snapshot,
+        rejection_reason=row.rejection_reason,
+        created_at=row.created_at,
+        activated_at=row.activated_at,
+        repaid_at=row.repaid_at,
+    )
+
+
 # ────────────────────────────────────────
 # Position / Dashboard
 # ────────────────────────────────────────
 def calculate_position(db: Session, user_id: str) -> PositionResponse:
-    # user_id is already validated by get_current_user dependency
-    assets = list_assets(db, user_id)
-    loans  = list_loans(db, user_id)
-
-    total_deposited  = sum(a.stated_value for a in assets)
-    eligible         = sum(
-        a.appraised_value for a in assets
-        if a.status in (AssetStatus.active.value, AssetStatus.locked.value)
-    )
-
-    active_loans = [l for l in loans if l.status == LoanStatus.active.value]
-    total_principal  = sum(max(l.amount - l.amount_repaid, 0.0) for l in active_loans)
-    total_interest   = sum(_compute_accrued_interest(l) for l in active_loans)
-    total_debt       = total_principal + total_interest
+    # user_id comes from the signed JWT (get_current_user_id dependency)
+    now = datetime.now(timezone.utc)
+    position = _ensure_position(db, user_id, now)
+
+    interest_cents   = _position_interest(position, now)
+    total_deposited  = from_cents(position.total_deposited_cents)
+    eligible         = from_cents(position.total_eligible_collateral_cents)
+    total_principal  = from_cents(position.total_principal_cents)
+    total_interest   = from_cents(interest_cents)
+    total_debt       = from_cents(position.total_principal_cents + interest_cents)
     available_credit = max(eligible - total_debt, 0.0)
 
     yield_rate   = 0.05
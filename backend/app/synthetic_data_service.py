@@ -0,0 +1,316 @@
+"""
+Synthetic Data Service — production-sized users, assets and loans for load
+testing, generated in bulk instead of through the per-row service calls.
+
+Everything for a chunk of users is drawn with numpy in one pass and written
+with repository.bulk_load (COPY on PostgreSQL, executemany elsewhere), one
+transaction per chunk:
+
+  - users share one precomputed password hash (bcrypt runs once per run)
+  - asset counts per user are Poisson; types follow `asset_mix` over
+    ASSET_TYPE_CONFIG; stated values are log-normal around a per-type median
+    and appraised at the type's ltv_ratio and BASE_MARK, as valuation_service
+    would with a static feed
+  - loan counts are Poisson, sizes log-normal; each loan is active, repaid or
+    rejected per `loan_states`, and a share of the active ones is partially
+    repaid. A user's outstanding principal is scaled down to at most
+    `max_utilization` of their eligible collateral, so the book starts healthy
+  - user_positions and user_exposures are aggregated from the same arrays,
+    with interest outstanding as of `now`, so readers never need a rebuild
+
+Generation is deterministic for a given seed, email prefix, chunk size and
+starting point.
+"""
+import time
+import uuid
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .auth_service import hash_password
+from .models import Asset, Loan, User, UserExposure, UserPosition
+from .price_feed import BASE_MARK
+from .repository import bulk_load
+from .rules import ASSET_TYPE_CONFIG, LOAN_INTEREST_RATE, AssetStatus, LoanStatus
+
+DEFAULT_CHUNK_SIZE = 10_000
+EMAIL_DOMAIN       = "load.lenda.com"
+
+# Median stated value per asset type, in cents
+DEFAULT_VALUE_MEDIANS = {
+    "property": 35_000_000,
+    "crypto":    1_500_000,
+    "car":       2_500_000,
+}
+
+LOAN_STATES = (LoanStatus.active.value, LoanStatus.repaid.value, LoanStatus.rejected.value)
+
+NO_COLLATERAL_REASON = "No eligible collateral. Deposit assets first."
+UNHEALTHY_REASON     = "Health factor would fall below minimum. Reduce amount or add collateral."
+
+
+@dataclass
+class GeneratorConfig:
+    users: int
+    assets_per_user: float = 3.0          # Poisson mean
+    loans_per_user: float = 2.0           # Poisson mean
+    asset_mix: dict[str, float] = field(default_factory=lambda: {t: 1.0 for t in ASSET_TYPE_CONFIG})
+    value_medians: dict[str, int] = field(default_factory=lambda: dict(DEFAULT_VALUE_MEDIANS))
+    value_sigma: float = 0.8              # log-normal spread of stated values
+    loan_median_cents: int = 2_000_000
+    loan_sigma: float = 1.0
+    loan_states: dict[str, float] = field(default_factory=lambda: {
+        LoanStatus.active.value: 0.7, LoanStatus.repaid.value: 0.2, LoanStatus.rejected.value: 0.1,
+    })
+    partially_repaid: float = 0.3         # share of active loans with some principal repaid
+    max_utilization: float = 0.8          # outstanding principal / eligible collateral cap per user
+    max_age_days: int = 730               # assets and loans are created up to this long ago
+    password: str = "password123"
+    email_prefix: str = "load"
+    seed: int = 42
+
+    def __post_init__(self):
+        for name, weights, allowed in (
+            ("asset mix", self.asset_mix, ASSET_TYPE_CONFIG),
+            ("loan states", self.loan_states, LOAN_STATES),
+        ):
+            unknown = set(weights) - set(allowed)
+            if unknown:
+                raise ValueError(f"Unknown {name} key(s): {', '.join(sorted(unknown))}")
+            if any(w < 0 for w in weights.values()) or not sum(weights.values()) > 0:
+                raise ValueError(f"The {name} weights must be non-negative and not all zero")
+        missing = set(self.asset_mix) - set(self.value_medians)
+        if missing:
+            raise ValueError(f"No value median for asset type(s): {', '.join(sorted(missing))}")
+        if not 0 < self.max_utilization <= 1:
+            raise ValueError("max_utilization must be in (0, 1]")
+        if self.max_age_days < 1:
+            raise ValueError("max_age_days must be at least 1")
+
+
+@dataclass
+class GenerationResult:
+    users: int
+    assets: int
+    loans: int
+    chunks: int
+    elapsed_seconds: float
+
+
+def _next_sequence(db: Session, prefix: str) -> int:
+    """
+    One past the highest n in an existing `<prefix><n>@EMAIL_DOMAIN` email.
+    LIKE only narrows the candidates — with the prefix's wildcards escaped —
+    since `load%` also matches `loadtest7@…`; the numeric check is done here.
+    """
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    emails  = db.scalars(
+        select(User.email).where(User.email.like(f"{escaped}%@{EMAIL_DOMAIN}", escape="\\"))
+    )
+    used = [
+        int(sequence) for sequence in (email[len(prefix):-len(EMAIL_DOMAIN) - 1] for email in emails)
+        if sequence.isascii() and sequence.isdigit()
+    ]
+    return max(used) + 1 if used else 0
+
+
+def generate(
+    db: Session,
+    config: GeneratorConfig,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    now: Optional[datetime] = None,
+    on_chunk: Optional[Callable[[GenerationResult], None]] = None,
+) -> GenerationResult:
+    """
+    Insert `config.users` users with their assets, loans, positions and
+    exposures, committing once per chunk of `chunk_size` users. Emails
+    continue after the highest number a previous run used with the same prefix.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    now   = (now or datetime.now(timezone.utc)).astimezone(timezone.utc).replace(tzinfo=None)
+    start = _next_sequence(db, config.email_prefix)
+    rng   = np.random.default_rng([config.seed, zlib.crc32(config.email_prefix.encode()), start])   # other prefixes and continuing runs must not redraw the same ids
+    password_hash = hash_password(config.password)
+
+    result  = GenerationResult(users=0, assets=0, loans=0, chunks=0, elapsed_seconds=0.0)
+    started = time.perf_counter()
+    while result.users < config.users:
+        n = min(chunk_size, config.users - result.users)
+        tables = _build_chunk(rng, config, start + result.users, n, password_hash, now)
+        for model in (User, Asset, Loan, UserPosition, UserExposure):
+            bulk_load(db, model, tables[model])
+        db.commit()
+
+        result.users  += n
+        result.assets += len(tables[Asset]["id"])
+        result.loans  += len(tables[Loan]["id"])
+        result.chunks += 1
+        result.elapsed_seconds = time.perf_counter() - started
+        if on_chunk:
+            on_chunk(result)
+    return result
+
+
+# ────────────────────────────────────────
+# Chunk construction
+# ────────────────────────────────────────
+def _uuids(rng: np.random.Generator, n: int) -> list[str]:
+    """Version-4 UUIDs drawn from `rng`, so a seeded run is reproducible."""
+    raw = rng.integers(0, 2**63, size=(n, 2), dtype=np.int64).tolist()
+    return [str(uuid.UUID(int=(hi << 64) | lo, version=4)) for hi, lo in raw]
+
+
+def _choice(rng: np.random.Generator, weights: dict[str, float], n: int) -> tuple[list[str], np.ndarray]:
+    keys = list(weights)
+    p = np.array([weights[k] for k in keys], dtype=np.float64)
+    return keys, rng.choice(len(keys), size=n, p=p / p.sum())
+
+
+def _log_normal_cents(rng: np.random.Generator, median: np.ndarray | float, sigma: float, n: int) -> np.ndarray:
+    return np.maximum(np.rint(rng.lognormal(np.log(median), sigma, n)), 100).astype(np.int64)
+
+
+def _timestamps(now: datetime, seconds_ago: np.ndarray) -> list[datetime]:
+    return [now - timedelta(seconds=s) for s in seconds_ago.tolist()]
+
+
+def _build_chunk(
+    rng: np.random.Generator,
+    config: GeneratorConfig,
+    first: int,
+    n: int,
+    password_hash: str,
+    now: datetime,
+) -> dict[type, dict[str, list]]:
+    max_age = config.max_age_days * 86_400
+    users   = np.arange(n)
+    user_ids = _uuids(rng, n)
+
+    # Assets
+    asset_user = np.repeat(users, rng.poisson(config.assets_per_user, n))
+    n_assets   = len(asset_user)
+    types, type_idx = _choice(rng, config.asset_mix, n_assets)
+    medians  = np.array([config.value_medians[t] for t in types], dtype=np.float64)
+    ltv      = np.array([ASSET_TYPE_CONFIG[t].ltv_ratio for t in types], dtype=np.float64)
+    stated   = _log_normal_cents(rng, medians[type_idx], config.value_sigma, n_assets)
+    appraised = np.floor(stated * ltv[type_idx] + 0.5).astype(np.int64)   # money.round_cents
+    asset_created = _timestamps(now, rng.integers(0, max_age, n_assets))
+
+    deposited = np.bincount(asset_user, weights=stated, minlength=n).astype(np.int64)
+    eligible  = np.bincount(asset_user, weights=appraised, minlength=n).astype(np.int64)
+
+    # Loans
+    loan_user = np.repeat(users, rng.poisson(config.loans_per_user, n))
+    n_loans   = len(loan_user)
+    states, state_idx = _choice(rng, config.loan_states, n_loans)
+    state  = np.array(states, dtype=object)[state_idx]
+    amount = _log_normal_cents(rng, config.loan_median_cents, config.loan_sigma, n_loans)
+    state[eligible[loan_user] == 0] = LoanStatus.rejected.value   # nothing to borrow against
+    active   = state == LoanStatus.active.value
+    repaid   = state == LoanStatus.repaid.value
+    rejected = state == LoanStatus.rejected.value
+
+    repaid_cents = np.zeros(n_loans, dtype=np.int64)
+    partial = active & (rng.random(n_loans) < config.partially_repaid)
+    repaid_cents[partial] = np.floor(amount[partial] * rng.uniform(0.05, 0.95, partial.sum())).astype(np.int64)
+
+    # Cap each user's outstanding principal at max_utilization of their collateral
+    remaining = np.where(active, amount - repaid_cents, 0)
+    owed  = np.bincount(loan_user, weights=remaining, minlength=n)
+    cap   = eligible * config.max_utilization
+    scale = np.divide(cap, owed, out=np.ones(n), where=owed > cap)
+    loan_scale = np.where(active, scale[loan_user], 1.0)
+    amount       = np.maximum(np.floor(amount * loan_scale), 1).astype(np.int64)
+    repaid_cents = np.minimum(np.floor(repaid_cents * loan_scale).astype(np.int64), amount - 1).clip(0)
+    repaid_cents[repaid] = amount[repaid]
+    remaining = np.where(active, amount - repaid_cents, 0)
+
+    # Interest is charged per UTC midnight passed since activation, as days_between counts in SQL
+    age_seconds = rng.integers(60, (config.max_age_days + 1) * 86_400 - 60, n_loans)
+    seconds_today = (now - now.replace(hour=0, minute=0, second=0, microsecond=0)).total_seconds()
+    age_days    = -np.floor((seconds_today - age_seconds) / 86_400)
+    interest    = np.where(active, np.floor(remaining * LOAN_INTEREST_RATE * age_days / 365.0 + 0.5), 0).astype(np.int64)
+    loan_created = _timestamps(now, age_seconds)
+    repaid_at    = _timestamps(now, np.floor(age_seconds * rng.random(n_loans)).astype(np.int64))
+
+    principal = np.bincount(loan_user, weights=remaining, minlength=n).astype(np.int64)
+    # Origination snapshots against the user's current book; rejected loans record none
+    debt_at_origination = np.maximum(principal[loan_user], amount).astype(np.float64)
+    collateral_at_origination = eligible[loan_user].astype(np.float64)
+    no_collateral = collateral_at_origination == 0
+    safe = ~rejected
+    ltv_at_origination = np.divide(debt_at_origination, collateral_at_origination, out=np.zeros(n_loans), where=safe)
+    hf_at_origination  = np.divide(collateral_at_origination, debt_at_origination, out=np.zeros(n_loans), where=safe)
+
+    # Exposures: one row per (user, asset type) held
+    pair   = asset_user * len(types) + type_idx
+    pairs  = np.unique(pair)
+    exposure_cents = np.bincount(pair, weights=appraised, minlength=n * len(types))[pairs].astype(np.int64)
+
+    def per_loan(values: np.ndarray, mask: np.ndarray) -> list:
+        return [v if m else None for v, m in zip(values.tolist(), mask.tolist())]
+
+    return {
+        User: {
+            "id":            user_ids,
+            "name":          [f"Load User {first + i}" for i in range(n)],
+            "email":         [f"{config.email_prefix}{first + i}@{EMAIL_DOMAIN}" for i in range(n)],
+            "password_hash": [password_hash] * n,
+        },
+        Asset: {
+            "id":                    _uuids(rng, n_assets),
+            "user_id":               [user_ids[u] for u in asset_user.tolist()],
+            "type":                  [types[t] for t in type_idx.tolist()],
+            "description":           [None] * n_assets,
+            "stated_value_cents":    stated.tolist(),
+            "appraised_value_cents": appraised.tolist(),
+            "ltv_ratio":             ltv[type_idx].tolist(),
+            "reference_mark":        [BASE_MARK] * n_assets,
+            "status":                [AssetStatus.active.value] * n_assets,
+            "created_at":            asset_created,
+            "appraised_at":          asset_created,
+        },
+        Loan: {
+            "id":                            _uuids(rng, n_loans),
+            "user_id":                       [user_ids[u] for u in loan_user.tolist()],
+            "amount_cents":                  amount.tolist(),
+            "amount_repaid_cents":           repaid_cents.tolist(),
+            "accrued_interest_cents":        [0] * n_loans,
+            "interest_days_accrued":         [0] * n_loans,
+            "interest_rate":                 [LOAN_INTEREST_RATE] * n_loans,
+            "status":                        state.tolist(),
+            "ltv_at_origination":            per_loan(ltv_at_origination, safe),
+            "health_factor_snapshot":        per_loan(hf_at_origination, safe),
+            "rejection_reason":              [
+                (NO_COLLATERAL_REASON if nc else UNHEALTHY_REASON) if r else None
+                for r, nc in zip(rejected.tolist(), no_collateral.tolist())
+            ],
+            "collateral_value_locked_cents": eligible[loan_user].tolist(),
+            "created_at":                    loan_created,
+            "activated_at":                  [c if not r else None for c, r in zip(loan_created, rejected.tolist())],
+            "repaid_at":                     [t if r else None for t, r in zip(repaid_at, repaid.tolist())],
+        },
+        UserPosition: {
+            "user_id":                         user_ids,
+            "total_deposited_cents":           deposited.tolist(),
+            "total_eligible_collateral_cents": eligible.tolist(),
+            "total_principal_cents":           principal.tolist(),
+            "rate_weighted_principal":         (principal * LOAN_INTEREST_RATE).tolist(),
+            "accrued_interest_cents":          np.bincount(loan_user, weights=interest, minlength=n).astype(np.int64).tolist(),
+            "interest_as_of":                  [now.replace(hour=0, minute=0, second=0, microsecond=0)] * n,
+            "version":                         [0] * n,
+            "updated_at":                      [now] * n,
+        },
+        UserExposure: {
+            "user_id":                   [user_ids[p] for p in (pairs // len(types)).tolist()],
+            "asset_type":                [types[t] for t in (pairs % len(types)).tolist()],
+            "units":                     (exposure_cents / BASE_MARK).tolist(),
+            "eligible_collateral_cents": exposure_cents.tolist(),
+        },
+    }
@@ -1,29 +1,47 @@
 """
 Valuation Service — calculates eligible collateral for a given asset.
 
-For MVP, valuation is deterministic: eligible_collateral = stated_value × ltv_ratio.
-The LTV ratio is defined per asset type in rules.py.
+At deposit, eligible_collateral = stated_value × ltv_ratio, and the asset
+records its type's current market mark from the price feed cache. When the
+mark later moves, revaluation_service re-appraises held assets to
+stated_value × (mark / reference mark) × ltv_ratio.
+The LTV ratio is defined per asset type in rules.py. Amounts are computed in
+cents (see money.py); the dollar properties are for API responses.
 
-Future: replace with real-time price feed per asset type.
+Only the in-process mark cache is read here; the price provider itself is
+never called on a request path.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+
+from .money import from_cents, round_cents, to_cents
+from .price_feed import mark_cache
 from .rules import ASSET_TYPE_CONFIG, ALLOWED_ASSET_TYPES
 
 
 @dataclass
 class ValuationResult:
     asset_type: str
-    stated_value: float
+    stated_value_cents: int
     ltv_ratio: float
-    appraised_value: float   # eligible collateral amount
+    appraised_value_cents: int   # eligible collateral amount
     risk_tier: str
+    mark: float                  # asset type's cached market mark at appraisal
+
+    @property
+    def stated_value(self) -> float:
+        return from_cents(self.stated_value_cents)
+
+    @property
+    def appraised_value(self) -> float:
+        return from_cents(self.appraised_value_cents)
 
 
 def appraise(asset_type: str, stated_value: float) -> ValuationResult:
     """
     Calculate eligible collateral for an asset.
 
-    appraised_value = stated_value × ltv_ratio
+    appraised_value = stated_value × ltv_ratio, to the cent
     This is the amount that can be counted toward borrowing capacity.
     """
     asset_type = asset_type.strip().lower()
@@ -32,11 +50,41 @@ def appraise(asset_type: str, stated_value: float) -> ValuationResult:
             f"Unsupported asset type '{asset_type}'. "
             f"Allowed: {sorted(ALLOWED_ASSET_TYPES)}"
         )
-    config = ASSET_TYPE_CONFIG[asset_type]
+    config       = ASSET_TYPE_CONFIG[asset_type]
+    stated_cents = to_cents(stated_value)
     return ValuationResult(
         asset_type=asset_type,
-        stated_value=stated_value,
+        stated_value_cents=stated_cents,
         ltv_ratio=config.ltv_ratio,
-        appraised_value=stated_value * config.ltv_ratio,
+        appraised_value_cents=round_cents(stated_cents * config.ltv_ratio),
         risk_tier=config.risk_tier,
+        mark=mark_cache.price(asset_type),
     )
+
+
+@dataclass
+class BatchValuation:
+    results: list[Optional[ValuationResult]]          # None where the row was rejected
+    errors: dict[int, str] = field(default_factory=dict)  # row index → reason
+
+
+def appraise_batch(items: Sequence[tuple[str, float]]) -> BatchValuation:
+    """
+    Appraise many (asset_type, stated_value) rows in one pass.
+
+    Invalid rows are reported in `errors` by index instead of raising, so one
+    bad row never rejects the rest of the batch.
+    """
+    results: list[Optional[ValuationResult]] = []
+    errors: dict[int, str] = {}
+    for i, (asset_type, stated_value) in enumerate(items):
+        if stated_value is None or stated_value <= 0:
+            errors[i] = "Stated value must be positive"
+            results.append(None)
+            continue
+        try:
+            results.append(appraise(asset_type, stated_value))
+        except ValueError as e:
+            errors[i] = str(e)
+            results.append(None)
+    return BatchValuation(results=results, errors=errors)
@@ -0,0 +1,108 @@
+"""
+Accrual benchmark — wall time of the nightly interest job (accrue_interest.py)
+over a large loan book, and of a resumed run after a simulated crash.
+
+Run from backend/ directory:
+    python -m benchmarks.accrual                                  # 1M loans, scratch SQLite file
+    python -m benchmarks.accrual --url postgresql://localhost/lenda_bench --loans 5000000
+
+WARNING: the target database is dropped and re-created. Point --url at a
+scratch database only.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, func, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.accrual_service import run_accrual
+from app.database import Base
+from app.models import User, Loan
+from app.money import format_cents
+from app.rules import LoanStatus
+
+CHUNK = 50_000
+
+
+class _Crash(Exception):
+    pass
+
+
+def _seed(engine, loans: int, users: int) -> None:
+    user_ids = [str(uuid.uuid4()) for _ in range(users)]
+    now = datetime.now(timezone.utc)
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": uid, "name": f"user {i}", "email": f"{uid}@bench.lenda.com"}
+            for i, uid in enumerate(user_ids)
+        ])
+    for start in range(0, loans, CHUNK):
+        n = min(CHUNK, loans - start)
+        with engine.begin() as conn:
+            conn.execute(insert(Loan), [{
+                "id": str(uuid.uuid4()), "user_id": rng.choice(user_ids),
+                "amount_cents": rng.randint(50_000, 10_000_000), "amount_repaid_cents": 0, "accrued_interest_cents": 0,
+                "interest_days_accrued": 0, "interest_rate": 0.05,
+                "status": LoanStatus.active.value if rng.random() < 0.8 else LoanStatus.repaid.value,
+                "created_at": now, "activated_at": now - timedelta(days=rng.randint(0, 720)),
+            } for _ in range(n)])
+        print(f"  seeded {start + n:,}/{loans:,} loans", end="\r")
+    print()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="scratch database URL (default: temporary SQLite file)")
+    parser.add_argument("--loans", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_accrual.db')}"
+    engine = create_engine(url)
+    session_factory = sessionmaker(bind=engine)
+
+    print(f"=== Accrual benchmark: {args.loans:,} loans, chunks of {args.chunk_size:,} ===")
+    print(f"    {engine.url.render_as_string(hide_password=True)}\n")
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    _seed(engine, args.loans, args.users)
+
+    with session_factory() as db:
+        as_of = datetime.now(timezone.utc)
+        full = run_accrual(db, as_of=as_of, chunk_size=args.chunk_size)
+        print(f"full run      {full.elapsed_seconds:>8.1f}s  {full.loans_accrued:>10,} loans  "
+              f"{full.loans_accrued / full.elapsed_seconds:>10,.0f} loans/s  ({full.chunks:,} chunks)")
+
+        # Next night, killed halfway through, then resumed
+        next_night = as_of + timedelta(days=1)
+        half = max(full.chunks // 2, 1)
+
+        def crash_halfway(run):
+            if run.chunks_done >= half:
+                raise _Crash
+
+        start = time.perf_counter()
+        try:
+            run_accrual(db, as_of=next_night, chunk_size=args.chunk_size, on_chunk=crash_halfway)
+        except _Crash:
+            db.rollback()
+        crashed_after = time.perf_counter() - start
+        resumed = run_accrual(db, chunk_size=args.chunk_size)
+        print(f"crash+resume  {crashed_after + resumed.elapsed_seconds:>8.1f}s  {resumed.loans_accrued:>10,} loans  "
+              f"(crashed after {half:,} chunks, resumed {resumed.chunks:,})")
+
+        accrued = db.query(func.sum(Loan.accrued_interest_cents)).scalar()
+        print(f"\ntotal accrued interest: {format_cents(accrued)}")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
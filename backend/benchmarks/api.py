@@ -0,0 +1,275 @@
+"""
+API benchmark — latency and throughput of the hot endpoints (/auth/login,
+/position, /loans/evaluate, POST /loans, GET /assets) at several
+concurrency levels, checked against a stored baseline.
+
+Run from backend/ directory:
+    python -m benchmarks.api                                       # scratch SQLite file
+    python -m benchmarks.api --url postgresql://localhost/lenda_bench
+    python -m benchmarks.api --users 5000 --levels 1 16 64 --requests 500
+    python -m benchmarks.api --endpoints position evaluate
+    python -m benchmarks.api --save-baseline                       # record this machine's baseline
+
+Users, assets and loans are seeded at the requested scale through the same
+service calls seed_data.py uses (create_assets_bulk, create_loan); users are
+inserted in bulk with one precomputed password hash so seeding does not
+spend minutes in bcrypt. The ASGI app is driven in-process over httpx, each
+request as a random seeded user.
+
+Each endpoint × concurrency level reports p50/p95/p99 latency and requests
+per second. The run is compared with benchmarks/baselines/api-<dialect>.json:
+a p95 above baseline × (1 + tolerance) or a throughput below
+baseline × (1 − tolerance) fails the run with exit status 1. Absolute
+timings only compare on the hardware they were taken on, so baselines are
+not checked in: record one with --save-baseline on the machine the check
+runs on. The file stores that machine's environment (host, CPU, Python,
+database) and the run's scale, and the comparison is skipped when either
+differs from the current run.
+
+WARNING: with --url the target database is dropped and re-created. Point it
+at a scratch database only.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+PASSWORD     = "password123"
+ASSET_TYPES  = ["property", "crypto", "car"]
+SCALE_ARGS   = ["users", "assets_per_user", "loans_per_user", "requests"]
+
+
+@dataclass
+class BenchUser:
+    email: str
+    headers: dict[str, str]
+
+
+@dataclass
+class LevelResult:
+    endpoint: str
+    concurrency: int
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    rps: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.endpoint}@{self.concurrency}"
+
+
+ENDPOINTS = {
+    "login":       lambda client, user: client.post("/auth/login", json={"email": user.email, "password": PASSWORD}),
+    "position":    lambda client, user: client.get("/position", headers=user.headers),
+    "evaluate":    lambda client, user: client.post("/loans/evaluate", headers=user.headers, json={"amount": 1_000}),
+    "create_loan": lambda client, user: client.post("/loans", headers=user.headers, json={"amount": 10}),
+    "list_assets": lambda client, user: client.get("/assets", headers=user.headers, params={"limit": 50}),
+}
+
+
+def _environment(dialect: str) -> dict[str, object]:
+    """What the timings depend on besides the code: a baseline only applies where this matches."""
+    cpu = platform.processor()
+    try:
+        with open("/proc/cpuinfo") as f:
+            cpu = next((line.split(":", 1)[1].strip() for line in f if line.startswith("model name")), cpu)
+    except OSError:
+        pass
+    return {
+        "host": platform.node(),
+        "system": f"{platform.system()} {platform.machine()}",
+        "cpu": cpu,
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "database": dialect,
+    }
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct), len(ordered) - 1)]
+
+
+# ────────────────────────────────────────
+# Seeding
+# ────────────────────────────────────────
+def _seed(users: int, assets_per_user: int, loans_per_user: int) -> list[BenchUser]:
+    from sqlalchemy import insert
+
+    from app.auth_service import create_access_token, hash_password
+    from app.database import SessionLocal
+    from app.models import User
+    from app.service import create_assets_bulk, create_loan
+
+    rng = random.Random(42)
+    password_hash = hash_password(PASSWORD)
+    rows = [
+        {"id": str(uuid.uuid4()), "name": f"Bench {i}", "email": f"bench{i}@bench.lenda.com", "password_hash": password_hash}
+        for i in range(users)
+    ]
+    bench_users = []
+    with SessionLocal() as db:
+        db.execute(insert(User), rows)
+        db.commit()
+        for i, row in enumerate(rows):
+            assets = [
+                {"type": rng.choice(ASSET_TYPES), "stated_value": round(rng.uniform(10_000, 500_000), 2)}
+                for _ in range(assets_per_user)
+            ]
+            create_assets_bulk(db, row["id"], assets)
+            for _ in range(loans_per_user):
+                create_loan(db, row["id"], round(rng.uniform(100, 2_000), 2))
+            bench_users.append(BenchUser(row["email"], {"Authorization": f"Bearer {create_access_token(row['id'])}"}))
+            if (i + 1) % 100 == 0 or i + 1 == users:
+                print(f"  seeded {i + 1:,}/{users:,} users", end="\r")
+    print()
+    return bench_users
+
+
+# ────────────────────────────────────────
+# Load
+# ────────────────────────────────────────
+async def _run_level(client, endpoint: str, concurrency: int, requests: int, users: list[BenchUser]) -> LevelResult:
+    call = ENDPOINTS[endpoint]
+    rng = random.Random(concurrency)
+    remaining = requests
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            user = rng.choice(users)
+            start = time.perf_counter()
+            response = await call(client, user)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return LevelResult(
+        endpoint=endpoint,
+        concurrency=concurrency,
+        requests=len(latencies),
+        errors=errors,
+        p50_ms=_percentile(latencies, 0.50) * 1000,
+        p95_ms=_percentile(latencies, 0.95) * 1000,
+        p99_ms=_percentile(latencies, 0.99) * 1000,
+        rps=len(latencies) / elapsed,
+    )
+
+
+# ────────────────────────────────────────
+# Baselines
+# ────────────────────────────────────────
+def _regressions(results: list[LevelResult], baseline: dict, tolerance: float) -> list[str]:
+    failures = []
+    for result in results:
+        base = baseline.get(result.key)
+        if base is None:
+            continue
+        if result.p95_ms > base["p95_ms"] * (1 + tolerance):
+            failures.append(f"{result.key}: p95 {result.p95_ms:.1f}ms > baseline {base['p95_ms']:.1f}ms")
+        if result.rps < base["rps"] * (1 - tolerance):
+            failures.append(f"{result.key}: {result.rps:.0f} req/s < baseline {base['rps']:.0f} req/s")
+    return failures
+
+
+async def _main(args, dialect: str) -> int:
+    import httpx
+    from app.database import Base, engine
+    from app.main import app
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    print(f"=== API benchmark: {args.users:,} users × {args.assets_per_user} assets, "
+          f"{args.loans_per_user} loans; {args.requests} requests per level ===")
+    print(f"    {engine.url.render_as_string(hide_password=True)}\n")
+    users = _seed(args.users, args.assets_per_user, args.loans_per_user)
+
+    results: list[LevelResult] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"\n{'endpoint':<14}{'conc':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'req/s':>10}{'errors':>8}")
+        for endpoint in args.endpoints:
+            await _run_level(client, endpoint, 1, args.warmup, users)   # discarded: warm caches and pools
+            for level in args.levels:
+                r = await _run_level(client, endpoint, level, args.requests, users)
+                results.append(r)
+                print(f"{r.endpoint:<14}{r.concurrency:>6}{r.p50_ms:>8.1f}ms{r.p95_ms:>8.1f}ms"
+                      f"{r.p99_ms:>8.1f}ms{r.rps:>10.1f}{r.errors:>8}")
+    engine.dispose()
+
+    scale       = {name: getattr(args, name) for name in SCALE_ARGS}
+    environment = _environment(dialect)
+    baseline_path = Path(args.baseline or BASELINE_DIR / f"api-{dialect}.json")
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline = {"environment": environment, "scale": scale, "results": {r.key: asdict(r) for r in results}}
+        baseline_path.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"\nBaseline written to {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"\nNo baseline at {baseline_path}; run with --save-baseline to record one.")
+        return 0
+
+    baseline = json.loads(baseline_path.read_text())
+    if baseline.get("environment") != environment:
+        print(f"\nBaseline {baseline_path} was recorded in another environment "
+              f"({baseline.get('environment')}); comparison skipped. Re-record it with --save-baseline.")
+        return 0
+    if baseline["scale"] != scale:
+        print(f"\nBaseline {baseline_path} was recorded at {baseline['scale']}, this run is {scale}; comparison skipped.")
+        return 0
+    failures = _regressions(results, baseline["results"], args.tolerance)
+    if failures:
+        print(f"\nREGRESSION against {baseline_path} (tolerance {args.tolerance:.0%}):")
+        for failure in failures:
+            print(f"  ! {failure}")
+        return 1
+    print(f"\nWithin {args.tolerance:.0%} of {baseline_path}.")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="scratch database URL (default: temporary SQLite file)")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--assets-per-user", type=int, default=5)
+    parser.add_argument("--loans-per-user", type=int, default=3)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint per concurrency level")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per endpoint before its levels")
+    parser.add_argument("--endpoints", nargs="+", choices=list(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument("--baseline", help="baseline file (default: benchmarks/baselines/api-<dialect>.json)")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed fractional regression")
+    parser.add_argument("--save-baseline", action="store_true", help="record this run as this machine's baseline")
+    args = parser.parse_args()
+
+    # Must be set before app.* is imported: settings and engines are module-level
+    url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_api.db')}"
+    os.environ["DATABASE_URL"] = url
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+    from sqlalchemy.engine import make_url
+    sys.exit(asyncio.run(_main(args, make_url(url).get_backend_name())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Index benchmark — latency of the user-scoped asset/loan queries on large
+tables, before and after the (user_id, status) indexes from migration
+c4d9e8a7f210.
+
+Run from backend/ directory:
+    python -m benchmarks.indexes                                  # 1M rows, scratch SQLite file
+    python -m benchmarks.indexes --url postgresql://localhost/lenda_bench
+
+WARNING: the target database is dropped and re-created. Point --url at a
+scratch database only.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import User, Asset, Loan
+from app.money import round_cents
+from app.repository import list_assets, list_loans, get_collateral_totals, get_loan_totals
+from app.rules import ASSET_TYPE_CONFIG, AssetStatus, LoanStatus
+
+INDEXES = [idx for table in (Asset.__table__, Loan.__table__) for idx in table.indexes]
+CHUNK = 50_000
+
+
+def _seed(engine, rows: int, users: int) -> list[str]:
+    user_ids = [str(uuid.uuid4()) for _ in range(users)]
+    now = datetime.now(timezone.utc)
+    rng = random.Random(42)
+    asset_types = list(ASSET_TYPE_CONFIG)
+    loan_statuses = [LoanStatus.active.value] * 6 + [LoanStatus.repaid.value] * 3 + [LoanStatus.rejected.value]
+
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": uid, "name": f"user {i}", "email": f"{uid}@bench.lenda.com"}
+            for i, uid in enumerate(user_ids)
+        ])
+
+    for start in range(0, rows, CHUNK):
+        n = min(CHUNK, rows - start)
+        assets, loans = [], []
+        for _ in range(n):
+            asset_type = rng.choice(asset_types)
+            stated = rng.randint(100_000, 50_000_000)   # cents
+            ltv = ASSET_TYPE_CONFIG[asset_type].ltv_ratio
+            assets.append({
+                "id": str(uuid.uuid4()), "user_id": rng.choice(user_ids), "type": asset_type,
+                "stated_value_cents": stated, "appraised_value_cents": round_cents(stated * ltv), "ltv_ratio": ltv,
+                "status": AssetStatus.active.value if rng.random() < 0.9 else AssetStatus.locked.value,
+                "created_at": now, "appraised_at": now,
+            })
+            loans.append({
+                "id": str(uuid.uuid4()), "user_id": rng.choice(user_ids),
+                "amount_cents": rng.randint(50_000, 10_000_000), "amount_repaid_cents": 0, "accrued_interest_cents": 0,
+                "interest_rate": 0.05, "status": rng.choice(loan_statuses),
+                "created_at": now, "activated_at": now - timedelta(days=rng.randint(0, 720)),
+            })
+        with engine.begin() as conn:
+            conn.execute(insert(Asset), assets)
+            conn.execute(insert(Loan), loans)
+        print(f"  seeded {start + n:,}/{rows:,} assets and loans", end="\r")
+    print()
+    return user_ids
+
+
+def _analyze(engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+
+def _measure(session_factory, user_ids: list[str], samples: int) -> dict[str, list[float]]:
+    rng = random.Random(7)
+    sample = [rng.choice(user_ids) for _ in range(samples)]
+    now = datetime.now(timezone.utc)
+    queries = {
+        "list_assets":           lambda db, uid: list_assets(db, uid),
+        "list_loans":            lambda db, uid: list_loans(db, uid),
+        "get_collateral_totals": lambda db, uid: get_collateral_totals(db, uid),
+        "get_loan_totals":       lambda db, uid: get_loan_totals(db, uid, now),
+    }
+    timings: dict[str, list[float]] = {name: [] for name in queries}
+    with session_factory() as db:
+        for name, query in queries.items():
+            for uid in sample:
+                start = time.perf_counter()
+                query(db, uid)
+                timings[name].append((time.perf_counter() - start) * 1000)
+                db.expunge_all()
+    return timings
+
+
+def _summary(ms: list[float]) -> tuple[float, float]:
+    ordered = sorted(ms)
+    return statistics.median(ordered), ordered[int(len(ordered) * 0.95) - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="scratch database URL (default: temporary SQLite file)")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows per table (assets and loans)")
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--samples", type=int, default=200, help="queries per measurement")
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_indexes.db')}"
+    engine = create_engine(url)
+    session_factory = sessionmaker(bind=engine)
+
+    print(f"=== Index benchmark: {args.rows:,} assets + {args.rows:,} loans, {args.users:,} users ===")
+    print(f"    {engine.url.render_as_string(hide_password=True)}\n")
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    for idx in INDEXES:
+        idx.drop(bind=engine)
+
+    user_ids = _seed(engine, args.rows, args.users)
+    _analyze(engine)
+    before = _measure(session_factory, user_ids, args.samples)
+
+    print("Creating indexes...")
+    for idx in INDEXES:
+        idx.create(bind=engine)
+    _analyze(engine)
+    after = _measure(session_factory, user_ids, args.samples)
+
+    print(f"\n{'query':<24}{'p50 before':>12}{'p50 after':>12}{'p95 before':>12}{'p95 after':>12}{'speedup':>10}")
+    for name in before:
+        b50, b95 = _summary(before[name])
+        a50, a95 = _summary(after[name])
+        print(f"{name:<24}{b50:>10.2f}ms{a50:>10.2f}ms{b95:>10.2f}ms{a95:>10.2f}ms{b50 / a50:>9.1f}x")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Login throughput benchmark — /auth/login at several concurrency levels,
+with /position probes running alongside to show whether the login storm
+starves the data endpoints.
+
+Run from backend/ directory:
+    python -m benchmarks.login_throughput
+    python -m benchmarks.login_throughput --levels 1 8 32 128 --logins 256
+
+Drives the ASGI app in-process via httpx against a scratch SQLite database
+(or --url). Tune PASSWORD_HASH_WORKERS / PASSWORD_HASH_MAX_PENDING through
+the environment as usual.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct), len(ordered) - 1)]
+
+
+async def _run_level(client, concurrency: int, logins: int, headers: dict) -> dict:
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(logins):
+        queue.put_nowait(i)
+    latencies: list[float] = []
+    shed = 0
+    storm_done = asyncio.Event()
+    probe_latencies: list[float] = []
+
+    async def login_worker():
+        nonlocal shed
+        while not queue.empty():
+            queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.post(
+                "/auth/login", json={"email": "bench@lenda.com", "password": "password123"},
+            )
+            latencies.append(time.perf_counter() - start)
+            if response.status_code == 503:
+                shed += 1
+
+    async def position_probe():
+        while not storm_done.is_set():
+            start = time.perf_counter()
+            await client.get("/position", headers=headers)
+            probe_latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(0.005)
+
+    probe = asyncio.create_task(position_probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(login_worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    storm_done.set()
+    await probe
+
+    return {
+        "concurrency": concurrency,
+        "logins_per_s": logins / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": _percentile(latencies, 0.95) * 1000,
+        "shed": shed,
+        "position_p95_ms": _percentile(probe_latencies, 0.95) * 1000 if probe_latencies else float("nan"),
+    }
+
+
+async def _main(args) -> None:
+    import httpx
+    from app.config import settings
+    from app.database import Base, engine
+    from app.main import app
+
+    Base.metadata.create_all(engine)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post(
+            "/auth/register",
+            json={"name": "Bench", "email": "bench@lenda.com", "password": "password123"},
+        )
+        token = (await client.post(
+            "/auth/login", json={"email": "bench@lenda.com", "password": "password123"},
+        )).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        print(f"=== Login throughput: {args.logins} logins per level, "
+              f"{settings.password_hash_workers} bcrypt workers ===\n")
+        print(f"{'concurrency':>11}{'logins/s':>10}{'p50':>10}{'p95':>10}{'shed':>6}{'/position p95':>15}")
+        for level in args.levels:
+            r = await _run_level(client, level, args.logins, headers)
+            print(f"{r['concurrency']:>11}{r['logins_per_s']:>10.1f}{r['p50_ms']:>8.1f}ms"
+                  f"{r['p95_ms']:>8.1f}ms{r['shed']:>6}{r['position_p95_ms']:>13.1f}ms")
+    engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="scratch database URL (default: temporary SQLite file)")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--logins", type=int, default=128, help="logins per concurrency level")
+    args = parser.parse_args()
+
+    # Must be set before app.* is imported: settings and engines are module-level
+    os.environ["DATABASE_URL"] = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_login.db')}"
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
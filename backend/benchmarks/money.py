@@ -0,0 +1,128 @@
+"""
+Money benchmark — cost and exactness of aggregating amounts stored as
+floats (the old Float columns), NUMERIC(18, 2) dollars read as Decimal, and
+NUMERIC(18, 0) integer cents read as int (app.money.Money, the current
+representation).
+
+Run from backend/ directory:
+    python -m benchmarks.money                                   # 1M rows, scratch SQLite file
+    python -m benchmarks.money --url postgresql://localhost/lenda_bench
+
+Three measurements per representation:
+  - sql_sum:      one SUM over the column, grouped by user (what get_loan_totals does)
+  - fetch_sum:    fetch every amount through SQLAlchemy's type processing and sum in Python
+  - waterfall:    apply 100k small repayments in Python and check the remainder is exact
+
+WARNING: the benchmark table is dropped and re-created. Point --url at a
+scratch database only.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from decimal import Decimal
+
+from sqlalchemy import Column, Float, Integer, MetaData, Numeric, Table, create_engine, func, insert, select
+
+from app.money import Money, from_cents
+
+CHUNK = 50_000
+
+metadata = MetaData()
+amounts = Table(
+    "bench_money", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer, nullable=False, index=True),
+    Column("as_float", Float, nullable=False),
+    Column("as_decimal", Numeric(18, 2), nullable=False),
+    Column("as_cents", Money, nullable=False),
+)
+REPRESENTATIONS = {
+    "float":   amounts.c.as_float,
+    "decimal": amounts.c.as_decimal,
+    "cents":   amounts.c.as_cents,
+}
+
+
+def _seed(engine, rows: int, users: int) -> int:
+    """Returns the exact total in cents."""
+    rng = random.Random(42)
+    total = 0
+    for start in range(0, rows, CHUNK):
+        n = min(CHUNK, rows - start)
+        batch = []
+        for i in range(n):
+            cents = rng.randint(1, 10_000_000)
+            total += cents
+            batch.append({
+                "id": start + i, "user_id": rng.randrange(users),
+                "as_float": from_cents(cents), "as_decimal": Decimal(cents) / 100, "as_cents": cents,
+            })
+        with engine.begin() as conn:
+            conn.execute(insert(amounts), batch)
+        print(f"  seeded {start + n:,}/{rows:,} rows", end="\r")
+    print()
+    return total
+
+
+def _timed(fn) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def _to_cents(value) -> int:
+    return value if isinstance(value, int) else int(round(value * 100))
+
+
+def _waterfall(representation: str, payments: int) -> tuple[float, bool]:
+    """Repay a balance of payments × 0.10 in 0.10 steps; exact means it ends at zero."""
+    step = {"float": 0.1, "decimal": Decimal("0.10"), "cents": 10}[representation]
+    balance = step * payments
+
+    def run():
+        remaining = balance
+        for _ in range(payments):
+            remaining -= step
+        return remaining
+
+    ms, remaining = _timed(run)
+    return ms, remaining == 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="scratch database URL (default: temporary SQLite file)")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--payments", type=int, default=100_000)
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_money.db')}"
+    engine = create_engine(url)
+
+    print(f"=== Money benchmark: {args.rows:,} amounts, {args.users:,} users ===")
+    print(f"    {engine.url.render_as_string(hide_password=True)}\n")
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    exact = _seed(engine, args.rows, args.users)
+
+    print(f"{'representation':<16}{'sql_sum':>12}{'fetch_sum':>12}{'waterfall':>12}  {'total error':>12}  exact repay")
+    with engine.connect() as conn:
+        for name, column in REPRESENTATIONS.items():
+            sql_ms, _ = _timed(
+                lambda: conn.execute(select(amounts.c.user_id, func.sum(column)).group_by(amounts.c.user_id)).all()
+            )
+            fetch_ms, total = _timed(lambda: sum(conn.execute(select(column)).scalars()))
+            repay_ms, repay_exact = _waterfall(name, args.payments)
+            error = abs(_to_cents(total) - exact) if name != "float" else abs(total * 100 - exact)
+            print(f"{name:<16}{sql_ms:>10.1f}ms{fetch_ms:>10.1f}ms{repay_ms:>10.1f}ms  "
+                  f"{error:>10.4f}¢  {'yes' if repay_exact else 'no'}")
+
+    metadata.drop_all(engine)
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
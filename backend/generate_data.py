@@ -0,0 +1,102 @@
+"""
+Synthetic data generator — bulk-loads production-sized users, assets and
+loans for load testing (seed_data.py creates a handful through the per-row
+service calls, which bcrypts and commits every row).
+
+Run from backend/ directory:
+    python generate_data.py --users 100000
+    python generate_data.py --users 2000000 --chunk-size 50000 --assets-per-user 4 --loans-per-user 1.5
+    python generate_data.py --users 50000 --asset-mix property=0.2,crypto=0.6,car=0.2
+    python generate_data.py --users 50000 --loan-states active=0.5,repaid=0.4,rejected=0.1 --max-utilization 0.95
+
+Rows are written with COPY on PostgreSQL and executemany elsewhere, one
+transaction per chunk of users, together with their user_positions and
+user_exposures rows. Every generated user logs in as
+<prefix><n>@load.lenda.com with --password. Runs are reproducible for a
+given --seed and --chunk-size; a second run with the same --email-prefix
+continues the numbering instead of colliding.
+"""
+import argparse
+import sys
+
+from app.database import SessionLocal, engine
+from app.synthetic_data_service import DEFAULT_CHUNK_SIZE, GenerationResult, GeneratorConfig, generate
+
+
+def _weights(text: str) -> dict[str, float]:
+    """'property=0.5,crypto=0.3' → {'property': 0.5, 'crypto': 0.3}"""
+    try:
+        return {key.strip().lower(): float(value) for key, value in (part.split("=") for part in text.split(","))}
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected key=weight[,key=weight...], got '{text}'")
+
+
+def _progress(result: GenerationResult) -> None:
+    rate = result.users / result.elapsed_seconds if result.elapsed_seconds else 0.0
+    print(f"  chunk {result.chunks:,}: {result.users:,} users, {result.assets:,} assets, "
+          f"{result.loans:,} loans ({rate:,.0f} users/s)")
+
+
+def main() -> None:
+    defaults = GeneratorConfig(users=0)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, required=True)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="users per transaction")
+    parser.add_argument("--assets-per-user", type=float, default=defaults.assets_per_user, help="Poisson mean")
+    parser.add_argument("--loans-per-user", type=float, default=defaults.loans_per_user, help="Poisson mean")
+    parser.add_argument("--asset-mix", type=_weights, default=defaults.asset_mix, help="type=weight,...")
+    parser.add_argument("--value-sigma", type=float, default=defaults.value_sigma,
+                        help="log-normal spread of stated values")
+    parser.add_argument("--loan-median", type=float, default=defaults.loan_median_cents / 100,
+                        help="median loan size in dollars")
+    parser.add_argument("--loan-sigma", type=float, default=defaults.loan_sigma)
+    parser.add_argument("--loan-states", type=_weights, default=defaults.loan_states, help="state=weight,...")
+    parser.add_argument("--partially-repaid", type=float, default=defaults.partially_repaid,
+                        help="share of active loans with some principal repaid")
+    parser.add_argument("--max-utilization", type=float, default=defaults.max_utilization,
+                        help="cap on outstanding principal / eligible collateral per user")
+    parser.add_argument("--max-age-days", type=int, default=defaults.max_age_days)
+    parser.add_argument("--password", default=defaults.password)
+    parser.add_argument("--email-prefix", default=defaults.email_prefix)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args()
+
+    try:
+        config = GeneratorConfig(
+            users=args.users,
+            assets_per_user=args.assets_per_user,
+            loans_per_user=args.loans_per_user,
+            asset_mix=args.asset_mix,
+            value_sigma=args.value_sigma,
+            loan_median_cents=round(args.loan_median * 100),
+            loan_sigma=args.loan_sigma,
+            loan_states=args.loan_states,
+            partially_repaid=args.partially_repaid,
+            max_utilization=args.max_utilization,
+            max_age_days=args.max_age_days,
+            password=args.password,
+            email_prefix=args.email_prefix,
+            seed=args.seed,
+        )
+    except ValueError as e:
+        print(f"  ! {e}")
+        sys.exit(1)
+
+    print(f"Generating {config.users:,} users into {engine.url.render_as_string(hide_password=True)}")
+    db = SessionLocal()
+    try:
+        result = generate(db, config, chunk_size=args.chunk_size, on_chunk=None if args.quiet else _progress)
+    finally:
+        db.close()
+
+    rows = result.users * 2 + result.assets + result.loans   # users + positions
+    print(
+        f"\nGenerated {result.users:,} users, {result.assets:,} assets and {result.loans:,} loans "
+        f"in {result.chunks:,} chunk(s), {result.elapsed_seconds:.1f}s "
+        f"({rows / result.elapsed_seconds if result.elapsed_seconds else 0:,.0f} rows/s)."
+    )
+
+
+if __name__ == "__main__":
+    main()
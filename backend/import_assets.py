@@ -0,0 +1,67 @@
+"""
+Bulk asset import — onboards a portfolio from CSV through the same
+validation, valuation and single-transaction insert as POST /assets/bulk.
+
+Run from backend/ directory:
+    python import_assets.py portfolio.csv
+    python import_assets.py portfolio.csv --batch-size 2000
+
+CSV columns (header required):
+    email,type,stated_value,description
+
+Rows are grouped by owner email; each owner's rows are inserted in batches
+of --batch-size, one transaction per batch. Bad rows are reported with their
+CSV line number and skipped.
+"""
+import argparse
+import csv
+import sys
+from collections import defaultdict
+
+from app.database import SessionLocal
+from app.repository import get_user_by_email
+from app.schemas import MAX_BULK_ASSETS
+from app.service import create_assets_bulk
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("csv_path")
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    args = parser.parse_args()
+    batch_size = max(1, min(args.batch_size, MAX_BULK_ASSETS))
+
+    by_owner: dict[str, list[tuple[int, dict]]] = defaultdict(list)
+    with open(args.csv_path, newline="") as f:
+        for line_no, row in enumerate(csv.DictReader(f), start=2):
+            email = (row.pop("email", "") or "").strip().lower()
+            row = {k: v for k, v in row.items() if v not in (None, "")}
+            by_owner[email].append((line_no, row))
+
+    db = SessionLocal()
+    created = failed = 0
+    try:
+        for email, rows in by_owner.items():
+            user = get_user_by_email(db, email)
+            if not user:
+                print(f"  ! {email or '<blank>'}: no such user — skipped {len(rows)} row(s)")
+                failed += len(rows)
+                continue
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                result = create_assets_bulk(db, user.id, [row for _, row in batch])
+                created += len(result.created)
+                failed += len(result.errors)
+                for index, detail in result.errors.items():
+                    print(f"  ! line {batch[index][0]}: {detail}")
+            print(f"  + {email}: {len(rows)} row(s) processed")
+    finally:
+        db.close()
+
+    print(f"\nImport complete. Created {created:,} asset(s), rejected {failed:,}.")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
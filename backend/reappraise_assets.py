@@ -0,0 +1,53 @@
+"""
+Re-appraisal job — pulls the latest marks from the configured price feed
+(PRICE_FEED) and re-appraises every held asset of the types whose mark moved.
+
+Run from backend/ directory:
+    python reappraise_assets.py                  # apply current marks once
+    python reappraise_assets.py --watch          # keep polling, apply moves as they arrive
+    python reappraise_assets.py --watch --interval 2
+
+Each batch of moved marks is one transaction: the assets of those types and
+the position snapshots exposed to them (user_exposures) are updated together,
+and positions left below the safe health factor are listed.
+"""
+import argparse
+import time
+
+from app.config import settings
+from app.database import SessionLocal
+from app.price_feed import MarkCache, provider_from_settings, refresh_marks
+from app.revaluation_service import apply_marks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--watch", action="store_true", help="poll the feed until interrupted")
+    parser.add_argument("--interval", type=float, default=settings.price_refresh_interval, help="seconds between polls")
+    args = parser.parse_args()
+
+    provider = provider_from_settings()
+    cache    = MarkCache(ttl=0)   # always refetch; only used to detect moves between polls
+    db       = SessionLocal()
+    try:
+        while True:
+            moved = refresh_marks(provider, cache, force=True)
+            if moved:
+                result = apply_marks(db, {key: mark.price for key, mark in moved.items()})
+                marks  = ", ".join(f"{k}={v:g}" for k, v in sorted(result.marks.items()))
+                print(f"  {marks}: {result.assets_reappraised:,} asset(s), {result.positions_updated:,} position(s)")
+                for p in result.at_risk:
+                    flag = "  BELOW MINIMUM" if p.below_minimum else ""
+                    print(f"    at risk {p.user_id}: health factor {p.health_factor:.3f} "
+                          f"({p.eligible_collateral:,.2f} / {p.debt:,.2f}){flag}")
+            if not args.watch:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ Run from backend/ directory:
     python reset_db.py
 
 Steps:
-  1. Drop all tables (users, assets, loans)
+  1. Drop all tables (liquidation_events, accrual_runs, idempotency_keys, user_exposures, user_positions, loans, assets, users)
   2. Re-create schema via Alembic migrations (alembic upgrade head)
   3. Run seed_data.py to insert demo data
 
@@ -23,6 +23,11 @@ def reset():
     # Step 1: Drop all data tables (reverse FK order)
     print("Dropping tables...")
     with engine.connect() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS liquidation_events"))
+        conn.execute(text("DROP TABLE IF EXISTS accrual_runs"))
+        conn.execute(text("DROP TABLE IF EXISTS idempotency_keys"))
+        conn.execute(text("DROP TABLE IF EXISTS user_exposures"))
+        conn.execute(text("DROP TABLE IF EXISTS user_positions"))
         conn.execute(text("DROP TABLE IF EXISTS loans"))
         conn.execute(text("DROP TABLE IF EXISTS assets"))
         conn.execute(text("DROP TABLE IF EXISTS users"))
@@ -0,0 +1,53 @@
+"""
+Liquidation scanner — finds positions whose collateral, valued at each asset
+type's liquidation threshold, no longer covers their debt (health factor
+below HEALTH_FACTOR_MIN).
+
+Run from backend/ directory:
+    python scan_liquidations.py                  # flag only: record liquidation_events
+    python scan_liquidations.py --liquidate      # seize collateral and close the loans
+    python scan_liquidations.py --batch-size 20000
+
+Users are scanned in batches, one transaction each, so memory use does not
+grow with the size of the book and an interrupted scan can simply be re-run.
+"""
+import argparse
+
+from app.database import SessionLocal
+from app.liquidation_service import DEFAULT_BATCH_SIZE, FLAG, LIQUIDATE, LiquidationScanResult, scan_liquidations
+
+
+def _progress(result: LiquidationScanResult) -> None:
+    print(
+        f"  batch {result.batches:,}: {result.positions_scanned:,} position(s) scanned, "
+        f"{result.below_threshold:,} below threshold ({result.positions_per_second:,.0f}/s)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--liquidate", action="store_true", help="liquidate instead of only flagging")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="users per transaction")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = scan_liquidations(
+            db,
+            mode=LIQUIDATE if args.liquidate else FLAG,
+            batch_size=args.batch_size,
+            on_batch=None if args.quiet else _progress,
+        )
+    finally:
+        db.close()
+
+    print(f"\nScan {result.scan_id} ({result.mode}) as of {result.as_of.isoformat()}:")
+    print(f"  {result.positions_scanned:,} position(s) in {result.elapsed_seconds:.1f}s "
+          f"({result.positions_per_second:,.0f} positions/s)")
+    print(f"  {result.below_threshold:,} below health factor minimum: "
+          f"{result.flagged:,} flagged, {result.liquidated:,} liquidated, {result.skipped:,} skipped (changed during scan)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Stress test — price shock scenarios against the whole loan book: per
+scenario, how many positions fall below HEALTH_FACTOR_SAFE / HEALTH_FACTOR_MIN
+and the aggregate shortfall.
+
+Run from backend/ directory:
+    python stress_test.py                                          # default grid (225 scenarios)
+    python stress_test.py --scenario crypto=-0.4 --scenario crypto=-0.4,property=-0.15
+    python stress_test.py --grid crypto=-0.9:0:19 --grid property=-0.5:0:11 --grid car=-0.5:0:11
+    python stress_test.py --scenarios shocks.csv --output results.csv
+
+Shocks are fractional price changes (-0.4 = the asset type drops 40%).
+--grid TYPE=START:STOP:N spreads N shocks evenly from START to STOP, and the
+grids of several types are combined into every combination. A --scenarios
+CSV has a `name` column plus one column per asset type; empty cells mean
+no change.
+
+The book is read once (user_positions / user_exposures, in --chunk-size
+chunks; debtors without a snapshot from loans / assets) and every scenario
+is applied to it in memory; nothing is written.
+"""
+import argparse
+import csv
+import sys
+
+import numpy as np
+
+from app.database import SessionLocal
+from app.stress_test_service import (
+    ASSET_TYPES, DEFAULT_BLOCK_SIZE, DEFAULT_CHUNK_SIZE, Scenario, StressTestResult, scenario_grid, stress_test,
+)
+
+DEFAULT_GRID = {
+    "crypto":   [-0.8, -0.7, -0.6, -0.5, -0.4, -0.3, -0.2, -0.1, 0.0],
+    "property": [-0.4, -0.3, -0.2, -0.1, 0.0],
+    "car":      [-0.4, -0.3, -0.2, -0.1, 0.0],
+}
+
+
+def _parse_shocks(spec: str) -> dict[str, float]:
+    shocks = {}
+    for part in spec.split(","):
+        asset_type, _, value = part.partition("=")
+        shocks[asset_type.strip()] = float(value)
+    return shocks
+
+
+def _parse_grid(specs: list[str]) -> dict[str, list[float]]:
+    grid = {}
+    for spec in specs:
+        asset_type, _, bounds = spec.partition("=")
+        start, stop, count = bounds.split(":")
+        grid[asset_type.strip()] = [round(float(x), 6) for x in np.linspace(float(start), float(stop), int(count))]
+    return grid
+
+
+def _read_scenarios(path: str) -> list[Scenario]:
+    with open(path, newline="") as f:
+        return [
+            Scenario(
+                name=row.get("name") or f"row {i + 1}",
+                shocks={t: float(row[t]) for t in ASSET_TYPES if (row.get(t) or "").strip()},
+            )
+            for i, row in enumerate(csv.DictReader(f))
+        ]
+
+
+def _write_results(path: str, result: StressTestResult) -> None:
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", *ASSET_TYPES, "below_safe", "below_minimum", "shortfall", "uncovered_debt"])
+        for r in result.results:
+            writer.writerow([
+                r.scenario.name, *(r.scenario.shocks.get(t, 0.0) for t in ASSET_TYPES),
+                r.below_safe, r.below_minimum, f"{r.shortfall:.2f}", f"{r.uncovered_debt:.2f}",
+            ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", action="append", default=[], metavar="TYPE=SHOCK[,TYPE=SHOCK...]")
+    parser.add_argument("--grid", action="append", default=[], metavar="TYPE=START:STOP:N")
+    parser.add_argument("--scenarios", metavar="CSV", help="scenario file: name plus one column per asset type")
+    parser.add_argument("--top", type=int, default=20, help="worst scenarios to print")
+    parser.add_argument("--output", metavar="CSV", help="write every scenario's result here")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="positions per read")
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE, help="positions × scenarios per block")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args()
+
+    try:
+        scenarios = [Scenario(name=spec, shocks=_parse_shocks(spec)) for spec in args.scenario]
+        if args.grid:
+            scenarios += scenario_grid(_parse_grid(args.grid))
+        if args.scenarios:
+            scenarios += _read_scenarios(args.scenarios)
+        if not scenarios:
+            scenarios = scenario_grid(DEFAULT_GRID)
+    except ValueError as e:
+        sys.exit(f"Invalid scenario: {e}")
+
+    def progress(loaded: int) -> None:
+        print(f"  loaded {loaded:,} position(s)", end="\r")
+
+    db = SessionLocal()
+    try:
+        result = stress_test(
+            db, scenarios,
+            chunk_size=args.chunk_size,
+            block_size=args.block_size,
+            on_chunk=None if args.quiet else progress,
+        )
+    finally:
+        db.close()
+
+    print(f"\nStress test as of {result.as_of.isoformat()}:")
+    print(f"  {result.positions:,} position(s) with debt (${result.total_debt:,.2f}) loaded in {result.load_seconds:.1f}s")
+    if result.without_snapshot:
+        print(f"  {result.without_snapshot:,} of them had no user_positions snapshot; read from loans / assets")
+    print(f"  {len(scenarios):,} scenario(s) in {result.run_seconds:.2f}s "
+          f"({result.positions * len(scenarios) / max(result.run_seconds, 1e-9):,.0f} position-scenarios/s)")
+
+    worst = sorted(result.results, key=lambda r: (r.below_minimum, r.shortfall), reverse=True)[:args.top]
+    if worst:
+        print(f"\n{'scenario':<40}{'< safe':>10}{'< min':>10}{'shortfall':>18}{'uncovered':>18}")
+        for r in worst:
+            print(f"{r.scenario.name[:39]:<40}{r.below_safe:>10,}{r.below_minimum:>10,}"
+                  f"{r.shortfall:>18,.2f}{r.uncovered_debt:>18,.2f}")
+    if args.output:
+        _write_results(args.output, result)
+        print(f"\nAll {len(result.results):,} results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+import uuid
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
@@ -5,6 +7,8 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from app.database import Base, get_db
 from app.main import app
+from app.price_feed import mark_cache
+from app.revaluation_service import apply_marks
 
 # Single connection in-memory DB
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -31,3 +35,37 @@ app.dependency_overrides[get_db] = override_get_db
 @pytest.fixture(scope="function")
 def client():
     yield TestClient(app)
+
+
+@pytest.fixture
+def db():
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def auth_user(client):
+    """Factory: register + log in a fresh user, return (user_id, auth headers)."""
+    def _make(name: str = "Test User"):
+        email = f"{uuid.uuid4().hex[:12]}@test.com"
+        user = client.post(
+            "/auth/register",
+            json={"name": name, "email": email, "password": "password123"},
+        ).json()
+        token = client.post(
+            "/auth/login", json={"email": email, "password": "password123"}
+        ).json()["access_token"]
+        return user["id"], {"Authorization": f"Bearer {token}"}
+
+    return _make
+
+
+@pytest.fixture
+def marks(db):
+    """Shared mark cache, cleared afterwards; crypto assets restored to the base mark."""
+    yield mark_cache
+    mark_cache.clear()
+    apply_marks(db, {"crypto": 1.0})
@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta, timezone
+
+from app.models import Loan
+from app.repository import get_collateral_totals, get_loan_totals, list_assets, list_loans
+from app.rules import AssetStatus, LoanStatus
+from app.service import _compute_accrued_interest, calculate_position
+
+
+def test_aggregates_match_python_sums(client, db, auth_user):
+    user_id, headers = auth_user()
+    client.post("/assets", json={"type": "property", "stated_value": 100_000}, headers=headers)
+    client.post("/assets", json={"type": "crypto", "stated_value": 20_000}, headers=headers)
+    client.post("/loans", json={"amount": 30_000}, headers=headers)
+    client.post("/loans", json={"amount": 10_000}, headers=headers)
+    client.post("/loans", json={"amount": 500_000}, headers=headers)   # rejected
+
+    # Backdate one loan so time-based interest is non-zero
+    loan = db.query(Loan).filter(Loan.user_id == user_id, Loan.amount_cents == 3_000_000).one()
+    loan.activated_at = datetime.now(timezone.utc) - timedelta(days=90, hours=3)
+    loan.accrued_interest_cents = 1_250
+    db.commit()
+
+    now = datetime.now(timezone.utc)
+    collateral = get_collateral_totals(db, user_id)
+    debt = get_loan_totals(db, user_id, now)
+
+    assets = list_assets(db, user_id)
+    active = [l for l in list_loans(db, user_id) if l.status == LoanStatus.active.value]
+    assert collateral.total_deposited == sum(a.stated_value_cents for a in assets)
+    assert collateral.total_eligible == sum(
+        a.appraised_value_cents for a in assets
+        if a.status in (AssetStatus.active.value, AssetStatus.locked.value)
+    )
+    assert debt.principal_outstanding == sum(l.amount_cents - l.amount_repaid_cents for l in active)
+    assert debt.accrued_interest == 1_250
+    assert debt.interest_as_of == sum(_compute_accrued_interest(l) for l in active)
+    assert debt.interest_as_of > 0
+
+
+def test_aggregates_for_user_without_rows(client, db, auth_user):
+    user_id, headers = auth_user()
+    collateral = get_collateral_totals(db, user_id)
+    debt = get_loan_totals(db, user_id, datetime.now(timezone.utc))
+    assert (collateral.total_deposited, collateral.total_eligible) == (0, 0)
+    assert (debt.principal_outstanding, debt.accrued_interest, debt.interest_as_of) == (0, 0, 0)
+
+    position = calculate_position(db, user_id)
+    assert position.health_factor is None
+    assert position.available_credit == 0
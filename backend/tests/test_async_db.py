@@ -0,0 +1,52 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import async_service
+from app.database import Base, to_async_url
+from app.models import User
+from app.rules import LoanStatus
+
+
+def test_to_async_url():
+    assert to_async_url("postgresql://u:p@db:5432/lenda") == "postgresql+asyncpg://u:p@db:5432/lenda"
+    assert to_async_url("sqlite:///./lenda.db") == "sqlite+aiosqlite:///./lenda.db"
+    assert to_async_url("postgresql+asyncpg://db/lenda") == "postgresql+asyncpg://db/lenda"
+
+
+def test_async_service_round_trip(tmp_path):
+    async def scenario():
+        engine = create_async_engine(to_async_url(f"sqlite:///{tmp_path / 'async.db'}"))
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+        async with sessions() as db:
+            user = await async_service.add_user(db, User(name="Async", email="async@test.com"))
+            await async_service.create_asset(db, user.id, "property", 10_000)
+            loan = await async_service.create_loan(db, user.id, 3_000)
+            assert loan.status == LoanStatus.active.value
+
+            loan = await async_service.repay_loan(db, loan.id, user.id, 1_000)
+            assert loan.amount_repaid == 1_000
+
+            position = await async_service.calculate_position(db, user.id)
+            assets = await async_service.get_user_assets(db, user.id)
+
+        await engine.dispose()
+        return position, assets
+
+    position, assets = asyncio.run(scenario())
+    assert len(assets) == 1
+    assert position.total_eligible_collateral == 7_000
+    assert position.total_borrowed == 2_000
+    assert position.available_credit == 5_000
+
+
+def test_routes_run_through_session_runner(client, auth_user):
+    _, headers = auth_user()
+    assert client.post("/assets", json={"type": "car", "stated_value": 5_000}, headers=headers).status_code == 201
+    assert client.post("/loans", json={"amount": 1_000}, headers=headers).status_code == 201
+    position = client.get("/position", headers=headers).json()
+    assert position["total_eligible_collateral"] == 3_000
+    assert position["total_borrowed"] == 1_000
@@ -0,0 +1,39 @@
+import asyncio
+import threading
+
+from app import auth_service
+from app.config import settings
+
+
+def test_password_work_runs_on_bcrypt_pool(monkeypatch):
+    threads = []
+    original = auth_service.hash_password
+
+    def recording_hash(password):
+        threads.append(threading.current_thread().name)
+        return original(password)
+
+    monkeypatch.setattr(auth_service, "hash_password", recording_hash)
+
+    async def scenario():
+        hashed = await auth_service.hash_password_async("s3cret!")
+        return hashed, await auth_service.verify_password_async("s3cret!", hashed)
+
+    hashed, ok = asyncio.run(scenario())
+    assert ok
+    assert threads and threads[0].startswith("bcrypt")
+
+
+def test_login_sheds_load_when_password_pool_is_saturated(client, monkeypatch):
+    monkeypatch.setattr(settings, "password_hash_max_pending", 0)
+    response = client.post("/auth/login", json={"email": "nobody@test.com", "password": "x"})
+    # Unknown email never reaches bcrypt
+    assert response.status_code == 401
+
+    email = "busy@test.com"
+    monkeypatch.setattr(settings, "password_hash_max_pending", 64)
+    client.post("/auth/register", json={"name": "Busy", "email": email, "password": "password123"})
+    monkeypatch.setattr(settings, "password_hash_max_pending", 0)
+    response = client.post("/auth/login", json={"email": email, "password": "password123"})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
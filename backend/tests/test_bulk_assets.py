@@ -0,0 +1,49 @@
+from app.models import UserExposure, UserPosition
+
+
+def test_bulk_insert_reports_bad_rows_without_aborting(client, db, auth_user):
+    user_id, headers = auth_user()
+    response = client.post("/assets/bulk", headers=headers, json={"assets": [
+        {"type": "property", "stated_value": 100_000, "description": "Flat"},
+        {"type": "gold", "stated_value": 5_000},
+        {"type": "crypto", "stated_value": -1},
+        {"type": "Crypto", "stated_value": 20_000},
+        {"stated_value": 1_000},
+        {"type": "car", "stated_value": 10_000},
+    ]})
+    assert response.status_code == 200
+    data = response.json()
+
+    assert [a["type"] for a in data["created"]] == ["property", "crypto", "car"]
+    assert [a["appraised_value"] for a in data["created"]] == [70_000, 10_000, 6_000]
+    assert [e["index"] for e in data["errors"]] == [1, 2, 4]
+    assert "Unsupported asset type 'gold'" in data["errors"][0]["detail"]
+    assert data["errors"][2]["detail"].startswith("type:")
+
+    listed = client.get("/assets", headers=headers).json()
+    assert {a["id"] for a in listed} == {a["id"] for a in data["created"]}
+
+    position = db.get(UserPosition, user_id)
+    assert (position.total_deposited_cents, position.total_eligible_collateral_cents) == (13_000_000, 8_600_000)
+
+
+def test_bulk_request_limits(client, auth_user):
+    _, headers = auth_user()
+    assert client.post("/assets/bulk", headers=headers, json={"assets": []}).status_code == 422
+    only_bad = client.post("/assets/bulk", headers=headers, json={"assets": [{"type": "gold", "stated_value": 1}]})
+    assert only_bad.status_code == 200
+    assert only_bad.json()["created"] == []
+
+
+def test_bulk_insert_with_repeated_type_keeps_one_exposure_row(client, db, auth_user):
+    user_id, headers = auth_user()
+    response = client.post("/assets/bulk", headers=headers, json={"assets": [
+        {"type": "car", "stated_value": 10_000},
+        {"type": "car", "stated_value": 20_000},
+    ]})
+    assert response.status_code == 200
+    assert len(response.json()["created"]) == 2
+
+    exposure = db.get(UserExposure, (user_id, "car"))
+    assert exposure.eligible_collateral_cents == 1_800_000
+    assert exposure.units == 1_800_000
@@ -0,0 +1,105 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Loan, User, UserPosition
+from app.rules import LoanStatus
+from app.service import ConflictError, IntegrityViolation, create_asset, create_loan, repay_loan
+
+
+def _racing_sessions(tmp_path, name):
+    # File-backed DB with a real connection pool, one session per "request"
+    engine = create_engine(
+        f"sqlite:///{tmp_path / name}",
+        connect_args={"check_same_thread": False, "timeout": 60},
+        pool_size=32, max_overflow=0,
+    )
+    Base.metadata.create_all(engine)
+    return engine, sessionmaker(bind=engine, autoflush=False)
+
+
+def test_parallel_borrows_never_exceed_collateral(tmp_path):
+    engine, Session = _racing_sessions(tmp_path, "race.db")
+
+    with Session() as db:
+        user = User(name="Racer", email="racer@test.com")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+        create_asset(db, user_id, "property", 10_000)   # 7,000 eligible
+
+    def borrow(_):
+        with Session() as db:
+            try:
+                return create_loan(db, user_id, 100).status
+            except ConflictError:
+                return "conflict"
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        outcomes = list(pool.map(borrow, range(300)))
+
+    with Session() as db:
+        active_debt = db.query(func.coalesce(func.sum(Loan.amount_cents), 0)).filter(
+            Loan.user_id == user_id, Loan.status == LoanStatus.active.value,
+        ).scalar()
+        position = db.get(UserPosition, user_id)
+
+        assert active_debt <= 700_000   # cents
+        assert outcomes.count(LoanStatus.active.value) == active_debt / 10_000
+        assert position.total_principal_cents == active_debt
+        # Every request was decided; enough retries succeed to fill the headroom
+        assert outcomes.count(LoanStatus.active.value) + outcomes.count(LoanStatus.rejected.value) \
+            + outcomes.count("conflict") == 300
+        assert active_debt == 700_000
+    engine.dispose()
+
+
+def test_parallel_repayments_are_never_lost(tmp_path):
+    engine, Session = _racing_sessions(tmp_path, "repay.db")
+
+    with Session() as db:
+        user = User(name="Repayer", email="repayer@test.com")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+        create_asset(db, user_id, "property", 10_000)
+        loan_id = create_loan(db, user_id, 1_000).id
+
+    def repay(_):
+        with Session() as db:
+            try:
+                return repay_loan(db, loan_id, user_id, 40).status
+            except ConflictError:
+                return None
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        outcomes = list(pool.map(repay, range(20)))
+
+    repaid = (len(outcomes) - outcomes.count(None)) * 4_000
+    with Session() as db:
+        loan     = db.get(Loan, loan_id)
+        position = db.get(UserPosition, user_id)
+
+        assert repaid > 0
+        # Every accepted repayment reached both the loan and the snapshot
+        assert loan.amount_repaid_cents == repaid
+        assert position.total_principal_cents == 100_000 - repaid
+    engine.dispose()
+
+
+def test_integrity_errors_other_than_insert_races_are_not_retried(tmp_path):
+    engine, Session = _racing_sessions(tmp_path, "fk.db")
+    event.listen(engine, "connect", lambda conn, _: conn.execute("PRAGMA foreign_keys=ON"))
+    engine.dispose()   # reconnect with the pragma
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    # A valid token for a user deleted since: the snapshot insert fails its foreign key
+    with Session() as db, pytest.raises(IntegrityViolation, match="Account not found"):
+        create_asset(db, "deleted-user", "property", 10_000)
+
+    assert sum(s.startswith("INSERT INTO user_positions") for s in statements) == 1
+    engine.dispose()
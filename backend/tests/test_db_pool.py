@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app.database import InstrumentedQueuePool, InstrumentedAsyncQueuePool, engine_options, pool_status
+
+
+def test_engine_options_for_postgres_and_sqlite():
+    options = engine_options("postgresql://u@db/lenda")
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert {"pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping"} <= options.keys()
+    assert engine_options("postgresql://u@db/lenda", is_async=True)["poolclass"] is InstrumentedAsyncQueuePool
+    assert engine_options("sqlite:///./lenda.db") == {}
+
+
+def test_pool_stats_track_checkouts_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05,
+    )
+    held = engine.connect()
+    status = pool_status(engine.pool)
+    assert status["checked_out"] == 1
+    assert status["checkouts"] == 1
+
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    status = pool_status(engine.pool)
+    assert status["checkout_timeouts"] == 1
+    assert status["wait_seconds_max"] >= 0.05
+
+    held.close()
+    assert pool_status(engine.pool)["checked_out"] == 0
+    engine.dispose()
+
+
+def test_pool_health_endpoint(client):
+    response = client.get("/health/db-pool")
+    assert response.status_code == 200
+    assert "pool_class" in response.json()["sync"]
@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta, timezone
+
+from app.accrual_service import run_accrual
+from app.etag_service import etag_matches, resource_etag
+from app.models import AccrualRun
+
+
+def _etag(client, headers, path, **params):
+    response = client.get(path, headers=headers, params=params)
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    return response.headers["ETag"]
+
+
+def test_unchanged_resources_answer_304_until_a_write(client, auth_user):
+    _, headers = auth_user()
+    client.post("/assets", headers=headers, json={"type": "property", "stated_value": 100_000})
+    tags = {path: _etag(client, headers, path) for path in ("/position", "/assets", "/loans")}
+
+    for path, tag in tags.items():
+        response = client.get(path, headers={**headers, "If-None-Match": tag})
+        assert response.status_code == 304 and response.content == b""
+        assert response.headers["ETag"] == tag
+        assert client.get(path, headers={**headers, "If-None-Match": f'"other", W/{tag}'}).status_code == 304
+
+    assert _etag(client, headers, "/assets", limit=1) != tags["/assets"]
+
+    # A rejected loan changes nothing but the loan list — which still must not 304
+    client.post("/loans", headers=headers, json={"amount": 10_000_000})
+    for path, tag in tags.items():
+        assert client.get(path, headers={**headers, "If-None-Match": tag}).status_code == 200
+
+    tags = {path: _etag(client, headers, path) for path in ("/assets", "/loans")}
+    client.post("/assets", headers=headers, json={"type": "crypto", "stated_value": 5_000})
+    assert _etag(client, headers, "/assets") != tags["/assets"]
+
+
+def test_accrual_run_invalidates_loans_only(client, db, auth_user):
+    _, headers = auth_user()
+    client.post("/assets", headers=headers, json={"type": "property", "stated_value": 100_000})
+    client.post("/loans", headers=headers, json={"amount": 1_000})
+    assets, loans = _etag(client, headers, "/assets"), _etag(client, headers, "/loans")
+
+    db.query(AccrualRun).delete()
+    db.commit()
+    try:
+        run_accrual(db, as_of=datetime.now(timezone.utc))
+        assert _etag(client, headers, "/assets") == assets
+        assert _etag(client, headers, "/loans") != loans
+    finally:
+        db.query(AccrualRun).delete()
+        db.commit()
+
+
+def test_position_etag_rolls_over_daily(client, db, auth_user):
+    user_id, headers = auth_user()
+    client.post("/assets", headers=headers, json={"type": "property", "stated_value": 100_000})
+    now = datetime.now(timezone.utc)
+    assert resource_etag(db, user_id, "position", now=now) == resource_etag(db, user_id, "position", now=now)
+    assert resource_etag(db, user_id, "position", now=now + timedelta(days=1)) != resource_etag(db, user_id, "position", now=now)
+    assert not etag_matches(None, '"a"') and etag_matches("*", '"a"')
@@ -0,0 +1,36 @@
+def test_batch_matches_single_evaluations_and_finds_max_borrow(client, auth_user):
+    _, headers = auth_user()
+    client.post("/assets", headers=headers, json={"type": "property", "stated_value": 123_456.78})
+    client.post("/loans", headers=headers, json={"amount": 10_000})
+    amounts = [1, 5_000.5, 50_000, 80_000, 1_000_000]
+
+    curve = client.post("/loans/evaluate/batch", headers=headers, json={"amounts": amounts})
+    assert curve.status_code == 200
+    curve = curve.json()
+    for amount, point in zip(amounts, curve["points"]):
+        single = client.post("/loans/evaluate", headers=headers, json={"amount": amount}).json()
+        assert point == {key: single[key] for key in point}
+        assert curve["max_additional_borrow"] == single["max_additional_borrow"]
+
+    max_borrow = curve["max_borrow"]
+    assert max_borrow["approved"]
+    assert max_borrow["requested_amount"] >= curve["max_additional_borrow"] - 0.01
+    over = client.post("/loans/evaluate", headers=headers, json={"amount": max_borrow["requested_amount"] + 0.01})
+    assert not over.json()["approved"]
+    assert client.post("/loans", headers=headers, json={"amount": max_borrow["requested_amount"]}).json()["status"] == "active"
+
+
+def test_cumulative_schedule_and_validation(client, auth_user):
+    _, headers = auth_user()
+    client.post("/assets", headers=headers, json={"type": "property", "stated_value": 100_000})
+    limit = client.post("/loans/evaluate/batch", headers=headers, json={"amounts": [1]}).json()["max_borrow"]["requested_amount"]
+
+    draw = round(limit / 3, 2) + 1
+    schedule = client.post(
+        "/loans/evaluate/batch", headers=headers, json={"amounts": [draw] * 4, "cumulative": True},
+    ).json()["points"]
+    assert [p["requested_amount"] for p in schedule] == [round(draw * n, 2) for n in (1, 2, 3, 4)]
+    assert [p["approved"] for p in schedule] == [True, True, False, False]
+
+    for body in ({"amounts": []}, {"amounts": [100, 0]}, {"amounts": [1] * 1_001}):
+        assert client.post("/loans/evaluate/batch", headers=headers, json=body).status_code == 422
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.idempotency_service import request_fingerprint
+from app.models import IdempotencyKey, Loan
+
+
+def _fund(client, headers, value=100_000):
+    client.post("/assets", headers=headers, json={"type": "property", "stated_value": value})
+
+
+def test_create_loan_replay_returns_stored_response(client, db, auth_user):
+    user_id, headers = auth_user()
+    _fund(client, headers)
+    keyed = {**headers, "Idempotency-Key": "borrow-1"}
+
+    first = client.post("/loans", headers=keyed, json={"amount": 10_000})
+    retry = client.post("/loans", headers=keyed, json={"amount": 10_000})
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert db.query(Loan).filter(Loan.user_id == user_id).count() == 1
+    assert client.get("/position", headers=headers).json()["total_borrowed"] == 10_000
+
+
+def test_key_reused_with_different_body_is_rejected(client, auth_user):
+    _, headers = auth_user()
+    _fund(client, headers)
+    keyed = {**headers, "Idempotency-Key": "borrow-1"}
+
+    assert client.post("/loans", headers=keyed, json={"amount": 10_000}).status_code == 201
+    assert client.post("/loans", headers=keyed, json={"amount": 20_000}).status_code == 422
+
+
+def test_keys_are_scoped_per_user(client, auth_user):
+    _, alice = auth_user()
+    _, bob = auth_user()
+    _fund(client, alice)
+    _fund(client, bob)
+
+    a = client.post("/loans", headers={**alice, "Idempotency-Key": "k"}, json={"amount": 1_000})
+    b = client.post("/loans", headers={**bob, "Idempotency-Key": "k"}, json={"amount": 1_000})
+    assert a.status_code == b.status_code == 201
+    assert a.json()["id"] != b.json()["id"]
+
+
+def test_repay_replay_does_not_repay_twice(client, auth_user):
+    _, headers = auth_user()
+    _fund(client, headers)
+    loan = client.post("/loans", headers=headers, json={"amount": 10_000}).json()
+    keyed = {**headers, "Idempotency-Key": "repay-1"}
+
+    first = client.post(f"/loans/{loan['id']}/repay", headers=keyed, json={"amount": 4_000})
+    retry = client.post(f"/loans/{loan['id']}/repay", headers=keyed, json={"amount": 4_000})
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.json()["amount_repaid"] == first.json()["amount_repaid"] == 4_000
+    listed = client.get("/loans", headers=headers).json()
+    assert listed[0]["amount_repaid"] == 4_000
+
+
+def test_deterministic_rejection_is_replayed(client, db, auth_user):
+    user_id, headers = auth_user()
+    _fund(client, headers)
+    loan = client.post("/loans", headers=headers, json={"amount": 1_000}).json()
+    keyed = {**headers, "Idempotency-Key": "overpay"}
+
+    first = client.post(f"/loans/{loan['id']}/repay", headers=keyed, json={"amount": 5_000})
+    retry = client.post(f"/loans/{loan['id']}/repay", headers=keyed, json={"amount": 5_000})
+    assert first.status_code == retry.status_code == 400
+    assert retry.json() == first.json()
+
+    # The failed waterfall's in-session changes were not committed with the key
+    db.expire_all()
+    assert db.get(Loan, loan["id"]).amount_repaid == 0
+
+
+def test_in_flight_key_conflicts(client, db, auth_user):
+    user_id, headers = auth_user()
+    _fund(client, headers)
+    db.add(IdempotencyKey(
+        user_id=user_id, key="pending", fingerprint=request_fingerprint("create_loan", {"amount": 1.0}),
+        expires_at=datetime.utcnow() + timedelta(hours=1),
+    ))
+    db.commit()
+
+    response = client.post("/loans", headers={**headers, "Idempotency-Key": "pending"}, json={"amount": 1})
+    assert response.status_code == 409
+
+
+def test_expired_key_runs_again(client, db, auth_user):
+    user_id, headers = auth_user()
+    _fund(client, headers)
+    keyed = {**headers, "Idempotency-Key": "old"}
+    client.post("/loans", headers=keyed, json={"amount": 1_000})
+
+    record = db.get(IdempotencyKey, (user_id, "old"))
+    record.expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+
+    again = client.post("/loans", headers=keyed, json={"amount": 1_000})
+    assert again.status_code == 201
+    assert "Idempotent-Replayed" not in again.headers
+    assert db.query(Loan).filter(Loan.user_id == user_id).count() == 2
+
+
+def test_abandoned_claim_is_taken_over_after_its_lease(client, db, auth_user):
+    user_id, headers = auth_user()
+    _fund(client, headers)
+    # Claimed by a worker that died before its loan write committed
+    claimed_at = datetime.utcnow() - timedelta(seconds=settings.idempotency_claim_lease + 1)
+    db.add(IdempotencyKey(
+        user_id=user_id, key="orphan", fingerprint=request_fingerprint("create_loan", {"amount": 1.0}),
+        created_at=claimed_at, expires_at=claimed_at + timedelta(hours=24),
+    ))
+    db.commit()
+    keyed = {**headers, "Idempotency-Key": "orphan"}
+
+    first = client.post("/loans", headers=keyed, json={"amount": 1})
+    retry = client.post("/loans", headers=keyed, json={"amount": 1})
+
+    assert first.status_code == retry.status_code == 201
+    assert "Idempotent-Replayed" not in first.headers
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert db.query(Loan).filter(Loan.user_id == user_id).count() == 1
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.accrual_service import run_accrual
+from app.models import AccrualRun, Loan
+from app.repository import get_loan_totals
+from app.rules import LoanStatus
+
+
+@pytest.fixture
+def accrual_db(db):
+    # Loans left active by other test modules share the in-memory DB; isolate the runs
+    db.query(AccrualRun).delete()
+    db.commit()
+    yield db
+    db.query(AccrualRun).delete()
+    db.commit()
+
+
+def _backdated_loans(client, db, auth_user, amounts, days):
+    user_id, headers = auth_user()
+    client.post("/assets", headers=headers, json={"type": "property", "stated_value": 1_000_000})
+    for amount in amounts:
+        client.post("/loans", headers=headers, json={"amount": amount})
+    loans = db.query(Loan).filter(Loan.user_id == user_id).all()
+    for loan in loans:
+        loan.activated_at = datetime.now(timezone.utc) - timedelta(days=days)
+    db.commit()
+    return user_id, headers, loans
+
+
+def test_accrual_rolls_interest_and_is_idempotent(client, accrual_db, auth_user):
+    db = accrual_db
+    user_id, _, loans = _backdated_loans(client, db, auth_user, [36_500, 73_000], days=10)
+    as_of = datetime.now(timezone.utc)
+    before = get_loan_totals(db, user_id, as_of)
+
+    result = run_accrual(db, as_of=as_of, chunk_size=1)
+    assert not result.resumed
+    assert result.chunks >= 2
+
+    db.expire_all()
+    assert sorted(l.accrued_interest for l in loans) == pytest.approx([50.0, 100.0])
+    assert {l.interest_days_accrued for l in loans} == {10}
+
+    # Outstanding interest is the same whether or not the job has run
+    after = get_loan_totals(db, user_id, as_of)
+    assert after.accrued_interest == 15_000   # cents
+    assert after.interest_as_of == pytest.approx(before.interest_as_of)
+
+    run_accrual(db, as_of=as_of)
+    db.expire_all()
+    assert sum(l.accrued_interest for l in loans) == pytest.approx(150.0)
+
+
+def test_crashed_run_resumes_from_checkpoint(client, accrual_db, auth_user):
+    db = accrual_db
+    _, _, loans = _backdated_loans(client, db, auth_user, [36_500, 36_500, 36_500], days=20)
+    as_of = datetime.now(timezone.utc)
+
+    def crash(run):
+        raise RuntimeError("killed")
+
+    with pytest.raises(RuntimeError):
+        run_accrual(db, as_of=as_of, chunk_size=1, on_chunk=crash)
+    db.rollback()
+
+    with pytest.raises(ValueError):
+        run_accrual(db, as_of=as_of + timedelta(days=1))
+
+    result = run_accrual(db, chunk_size=1)
+    assert result.resumed
+    db.expire_all()
+    assert [l.accrued_interest for l in loans] == pytest.approx([100.0] * 3)
+
+
+def test_repay_after_accrual_does_not_double_count(client, accrual_db, auth_user):
+    db = accrual_db
+    _, headers, [loan] = _backdated_loans(client, db, auth_user, [36_500], days=30)
+    run_accrual(db)
+
+    # 150 of interest accrued: paying 200 clears it and 50 of principal
+    response = client.post(f"/loans/{loan.id}/repay", headers=headers, json={"amount": 200})
+    assert response.status_code == 200
+    assert response.json()["accrued_interest"] == pytest.approx(0.0)
+    assert response.json()["amount_repaid"] == pytest.approx(50.0)
+
+    # Interest paid stays paid: nothing re-accrues for days already covered
+    run_accrual(db)
+    db.expire_all()
+    assert db.get(Loan, loan.id).accrued_interest == pytest.approx(0.0)
+    assert db.get(Loan, loan.id).status == LoanStatus.active.value
+
+
+def test_evaluate_counts_time_based_interest(client, accrual_db, auth_user):
+    db = accrual_db
+    _, headers, _ = _backdated_loans(client, db, auth_user, [36_500], days=100)
+    evaluation = client.post("/loans/evaluate", headers=headers, json={"amount": 1}).json()
+    assert evaluation["outstanding_debt"] == pytest.approx(36_500 + 500)
@@ -0,0 +1,124 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.liquidation_service import FLAG, LIQUIDATE, scan_liquidations
+from app.models import Asset, LiquidationEvent, Loan, UserPosition
+from app.repository import close_out_positions
+from app.revaluation_service import apply_marks
+from app.rules import AssetStatus, LoanStatus
+
+
+def _borrower(client, db, auth_user, stated_value, borrow):
+    user_id, headers = auth_user()
+    client.post("/assets", headers=headers, json={"type": "crypto", "stated_value": stated_value})
+    assert client.post("/loans", headers=headers, json={"amount": borrow}).json()["status"] == "active"
+    return user_id, headers
+
+
+def _crash_collateral(db, user_id, stated_value):
+    """Restate and re-appraise the user's crypto: liquidation collateral = stated_value × 0.65."""
+    db.query(Asset).filter(Asset.user_id == user_id).update(
+        {"stated_value_cents": stated_value * 100, "appraised_value_cents": stated_value * 50}
+    )
+    db.commit()
+
+
+def _events(db, scan_id):
+    return {e.user_id: e for e in db.query(LiquidationEvent).filter(LiquidationEvent.scan_id == scan_id)}
+
+
+def test_flag_mode_records_events_only(client, db, auth_user):
+    healthy, _ = _borrower(client, db, auth_user, 10_000, 4_000)
+    underwater, _ = _borrower(client, db, auth_user, 10_000, 4_000)
+    _crash_collateral(db, underwater, 5_000)          # 3,250 against 4,000 of debt
+
+    result = scan_liquidations(db, mode=FLAG, batch_size=1)
+    events = _events(db, result.scan_id)
+
+    assert underwater in events and healthy not in events
+    assert events[underwater].action == "flagged"
+    assert events[underwater].health_factor == pytest.approx(3_250 / 4_000)
+    assert result.flagged == result.below_threshold >= 1
+    assert result.liquidated == 0
+    assert result.batches == result.positions_scanned
+    assert db.query(Loan).filter(Loan.user_id == underwater).one().status == LoanStatus.active.value
+
+
+def test_liquidate_mode_closes_out_position(client, db, auth_user):
+    healthy, _ = _borrower(client, db, auth_user, 10_000, 4_000)
+    underwater, headers = _borrower(client, db, auth_user, 10_000, 4_000)
+    _crash_collateral(db, underwater, 5_000)
+    version_before = db.get(UserPosition, underwater).version
+
+    result = scan_liquidations(db, mode=LIQUIDATE)
+    events = _events(db, result.scan_id)
+    assert events[underwater].action == "liquidated"
+    assert healthy not in events
+
+    db.expire_all()
+    assert db.query(Loan).filter(Loan.user_id == underwater).one().status == LoanStatus.liquidated.value
+    assert db.query(Asset).filter(Asset.user_id == underwater).one().status == AssetStatus.liquidated.value
+    assert db.query(Loan).filter(Loan.user_id == healthy).one().status == LoanStatus.active.value
+
+    position = db.get(UserPosition, underwater)
+    assert position.version == version_before + 1
+    served = client.get("/position", headers=headers).json()
+    assert (served["total_borrowed"], served["total_eligible_collateral"]) == (0, 0)
+
+    # Nothing left to liquidate on a second pass
+    again = scan_liquidations(db, mode=LIQUIDATE)
+    assert underwater not in _events(db, again.scan_id)
+
+
+def test_liquidates_users_without_a_snapshot(client, db, auth_user):
+    user_id, _ = _borrower(client, db, auth_user, 10_000, 4_000)
+    _crash_collateral(db, user_id, 5_000)
+    db.query(UserPosition).filter(UserPosition.user_id == user_id).delete()
+    db.commit()
+
+    result = scan_liquidations(db, mode=LIQUIDATE)
+    assert _events(db, result.scan_id)[user_id].action == "liquidated"
+    position = db.get(UserPosition, user_id)
+    assert (position.total_deposited_cents, position.total_principal_cents, position.total_eligible_collateral_cents) == (500_000, 0, 0)
+
+
+def test_close_out_skips_positions_changed_since_scan(client, db, auth_user):
+    user_id, _ = _borrower(client, db, auth_user, 10_000, 4_000)
+    stale_version = db.get(UserPosition, user_id).version - 1
+    now = datetime.now(timezone.utc)
+
+    assert close_out_positions(db, {user_id: stale_version}, now) == []
+    db.rollback()
+    assert db.get(UserPosition, user_id).total_principal_cents == 400_000
+
+
+def test_mark_drop_is_flagged(client, db, auth_user, marks):
+    user_id, _ = _borrower(client, db, auth_user, 10_000, 4_900)
+    revaluation = apply_marks(db, {"crypto": 0.4})
+    assert user_id in {p.user_id for p in revaluation.at_risk if p.below_minimum}
+
+    result = scan_liquidations(db, mode=FLAG)
+    events = _events(db, result.scan_id)
+
+    # 10,000 × 0.4 = 4,000 at the new mark; × 0.65 = 2,600 against 4,900 of debt
+    assert events[user_id].health_factor == pytest.approx(2_600 / 4_900)
+    assert events[user_id].liquidation_collateral_cents == 260_000
+
+
+
+def test_mark_drop_is_liquidated_other_types_untouched(client, db, auth_user, marks):
+    underwater, headers = _borrower(client, db, auth_user, 10_000, 4_900)
+    property_owner, owner_headers = auth_user()
+    client.post("/assets", headers=owner_headers, json={"type": "property", "stated_value": 10_000})
+    client.post("/loans", headers=owner_headers, json={"amount": 4_900})
+    apply_marks(db, {"crypto": 0.4})
+
+    result = scan_liquidations(db, mode=LIQUIDATE, batch_size=1)
+    events = _events(db, result.scan_id)
+
+    assert events[underwater].action == "liquidated"
+    assert events[underwater].debt_cents == 490_000
+    assert property_owner not in events          # 8,500 against 4,900 at an unmoved mark
+    served = client.get("/position", headers=headers).json()
+    assert (served["total_borrowed"], served["total_eligible_collateral"]) == (0, 0)
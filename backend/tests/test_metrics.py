@@ -0,0 +1,38 @@
+import re
+
+from app.metrics import registry
+
+
+def _server_timing(response) -> dict[str, str]:
+    return dict(re.findall(r"(\w+);dur=([\d.]+)", response.headers["server-timing"]))
+
+
+def test_server_timing_breaks_request_into_stages(client, auth_user):
+    _, headers = auth_user()
+    client.post("/assets", headers=headers, json={"type": "car", "stated_value": 10_000})
+    response = client.get("/position", headers=headers)
+    assert response.status_code == 200
+
+    stages = _server_timing(response)
+    assert set(stages) == {"auth", "db", "service", "other", "total"}
+    assert float(stages["total"]) >= sum(float(stages[s]) for s in ("auth", "db", "service")) - 0.05
+    # Queries run in the threadpool by the service layer are counted against this request
+    queries = int(re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', response.headers["server-timing"]).group(1))
+    assert queries >= 1
+
+
+def test_metrics_endpoint_exposes_route_template_histograms(client, auth_user):
+    registry.clear()
+    _, headers = auth_user()
+    client.get("/position", headers=headers)
+    client.post("/loans/does-not-exist/repay", headers=headers, json={"amount": 1})
+    client.get("/no-such-route")
+
+    body = client.get("/metrics").text
+    assert "# TYPE lenda_http_request_duration_seconds histogram" in body
+    assert 'lenda_http_request_duration_seconds_count{method="GET",route="/position",status="2xx"} 1' in body
+    assert 'lenda_http_request_duration_seconds_count{method="POST",route="/loans/{loan_id}/repay",status="4xx"} 1' in body
+    assert 'route="<unmatched>",status="4xx"' in body
+    assert 'lenda_http_request_stage_seconds_count{method="GET",route="/position",stage="db"} 1' in body
+    assert re.search(r'lenda_http_request_db_queries_sum\{method="GET",route="/position"\} [1-9]', body)
+    assert 'lenda_http_request_duration_seconds_bucket{method="GET",route="/position",status="2xx",le="+Inf"} 1' in body
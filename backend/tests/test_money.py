@@ -0,0 +1,47 @@
+import pytest
+
+from app.models import Loan, UserPosition
+from app.money import from_cents, round_cents, to_cents
+
+
+def test_cents_conversion_rounds_half_up():
+    assert to_cents(0.1) + to_cents(0.2) == to_cents(0.3) == 30
+    assert to_cents(1.005) == 101      # float 1.005 is 1.00499…; rounded on its decimal repr
+    assert to_cents("19.999") == 2_000
+    assert from_cents(12_345) == 123.45
+    assert (round_cents(2.5), round_cents(3.5), round_cents(-2.5)) == (3, 4, -3)
+
+
+def test_repayment_waterfall_is_exact(client, db, auth_user):
+    user_id, headers = auth_user()
+    client.post("/assets", headers=headers, json={"type": "property", "stated_value": 1_000})
+    loan = client.post("/loans", headers=headers, json={"amount": 0.3}).json()
+
+    # 0.1 three times clears 0.3 exactly; in floats the third payment overpaid
+    for _ in range(3):
+        response = client.post(f"/loans/{loan['id']}/repay", headers=headers, json={"amount": 0.1})
+        assert response.status_code == 200
+    repaid = response.json()
+    assert (repaid["status"], repaid["amount_repaid"]) == ("repaid", 0.3)
+
+    db.expire_all()
+    assert db.get(Loan, loan["id"]).amount_repaid_cents == 30
+    assert db.get(UserPosition, user_id).total_principal_cents == 0
+
+
+def test_overpayment_is_rejected_to_the_cent(client, auth_user):
+    _, headers = auth_user()
+    client.post("/assets", headers=headers, json={"type": "property", "stated_value": 1_000})
+    loan = client.post("/loans", headers=headers, json={"amount": 100}).json()
+
+    response = client.post(f"/loans/{loan['id']}/repay", headers=headers, json={"amount": 100.01})
+    assert response.status_code == 400
+    assert "$100.00" in response.json()["detail"]
+
+
+def test_money_columns_reject_fractional_cents(db, auth_user):
+    user_id, _ = auth_user()
+    db.add(Loan(user_id=user_id, amount_cents=10.5))
+    with pytest.raises(Exception, match="whole cents"):
+        db.flush()
+    db.rollback()
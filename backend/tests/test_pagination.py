@@ -0,0 +1,49 @@
+from app.service import MAX_PAGE_SIZE
+
+
+def _walk(client, path, headers, **params):
+    pages, cursor = [], None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        response = client.get(path, params=query, headers=headers)
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return pages
+
+
+def test_assets_keyset_pages_cover_everything_once(client, auth_user):
+    _, headers = auth_user()
+    for i, asset_type in enumerate(["property", "crypto", "car"] * 3):
+        client.post("/assets", json={"type": asset_type, "stated_value": 1_000 + i}, headers=headers)
+
+    pages = _walk(client, "/assets", headers, limit=4)
+    assert [len(p) for p in pages] == [4, 4, 1]
+    rows = [a for page in pages for a in page]
+    assert len({a["id"] for a in rows}) == 9
+    assert [a["stated_value"] for a in rows] == [1_008 - i for i in range(9)]   # newest first
+
+    crypto = _walk(client, "/assets", headers, limit=2, type="crypto")
+    assert sorted(a["stated_value"] for p in crypto for a in p) == [1_001, 1_004, 1_007]
+
+
+def test_loans_status_filter(client, auth_user):
+    _, headers = auth_user()
+    client.post("/assets", json={"type": "property", "stated_value": 10_000}, headers=headers)
+    client.post("/loans", json={"amount": 1_000}, headers=headers)
+    client.post("/loans", json={"amount": 99_000}, headers=headers)    # rejected
+    client.post("/loans", json={"amount": 2_000}, headers=headers)
+
+    active = client.get("/loans", params={"status": "active"}, headers=headers).json()
+    rejected = client.get("/loans", params={"status": "rejected"}, headers=headers).json()
+    assert [l["amount"] for l in active] == [2_000, 1_000]
+    assert [l["amount"] for l in rejected] == [99_000]
+
+
+def test_pagination_validation(client, auth_user):
+    _, headers = auth_user()
+    assert client.get("/loans", params={"cursor": "not-a-cursor"}, headers=headers).status_code == 400
+    assert client.get("/assets", params={"limit": MAX_PAGE_SIZE + 1}, headers=headers).status_code == 422
+    assert client.get("/assets", params={"type": "gold"}, headers=headers).status_code == 400
+    assert client.get("/loans", params={"status": "bogus"}, headers=headers).status_code == 422
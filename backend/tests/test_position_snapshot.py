@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+
+import app.service
+from app.models import Loan, UserPosition
+from app.money import from_cents
+from app.repository import get_loan_totals
+from app.service import _rebuild_position, calculate_position
+
+
+def _snapshot_columns(position):
+    return (
+        position.total_deposited_cents,
+        position.total_eligible_collateral_cents,
+        position.total_principal_cents,
+        round(position.rate_weighted_principal, 9),
+    )
+
+
+def test_snapshot_tracks_writes(client, db, auth_user):
+    user_id, headers = auth_user()
+    client.post("/assets", json={"type": "property", "stated_value": 100_000}, headers=headers)
+    client.post("/assets", json={"type": "crypto", "stated_value": 40_000}, headers=headers)
+    loan = client.post("/loans", json={"amount": 50_000}, headers=headers).json()
+    client.post("/loans", json={"amount": 10_000}, headers=headers)
+    client.post("/loans", json={"amount": 900_000}, headers=headers)        # rejected
+    client.post(f"/loans/{loan['id']}/repay", json={"amount": 20_000}, headers=headers)
+
+    maintained = _snapshot_columns(db.get(UserPosition, user_id))
+    db.expire_all()
+    rebuilt = _snapshot_columns(_rebuild_position(db, user_id, datetime.now(timezone.utc)))
+    db.rollback()
+
+    assert maintained == rebuilt == (14_000_000, 9_000_000, 4_000_000, 200_000)
+    position = client.get("/position", headers=headers).json()
+    assert position["total_borrowed"] == 40_000
+    assert position["available_credit"] == 50_000
+
+
+def test_interest_accrues_lazily_from_checkpoint(client, db, auth_user):
+    user_id, headers = auth_user()
+    client.post("/assets", json={"type": "property", "stated_value": 100_000}, headers=headers)
+    client.post("/loans", json={"amount": 36_500}, headers=headers)
+
+    position = db.get(UserPosition, user_id)
+    position.interest_as_of = datetime.now(timezone.utc) - timedelta(days=10)
+    position.accrued_interest_cents = 500
+    db.commit()
+
+    # 36,500 × 5% × 10 days / 365 = 50 on top of the checkpointed 5
+    assert client.get("/position", headers=headers).json()["total_interest"] == 55.0
+
+
+def test_position_read_is_a_single_primary_key_query(client, db, auth_user):
+    user_id, headers = auth_user()
+    client.post("/assets", json={"type": "car", "stated_value": 10_000}, headers=headers)
+    engine = db.get_bind()
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        calculate_position(db, user_id)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert len(statements) == 1
+    assert "FROM user_positions" in statements[0]
+
+
+def test_missing_snapshot_is_backfilled_on_read(client, db, auth_user):
+    user_id, headers = auth_user()
+    client.post("/assets", json={"type": "car", "stated_value": 10_000}, headers=headers)
+    db.delete(db.get(UserPosition, user_id))
+    db.commit()
+
+    position = client.get("/position", headers=headers).json()
+    assert position["total_eligible_collateral"] == 6_000
+    assert db.get(UserPosition, user_id) is not None
+
+
+def test_snapshot_interest_matches_loans_across_midnight(client, db, auth_user, monkeypatch):
+    user_id, headers = auth_user()
+    client.post("/assets", json={"type": "property", "stated_value": 200_000}, headers=headers)
+    for amount in (36_500, 73_000):   # $5 and $10 of interest a day
+        client.post("/loans", json={"amount": amount}, headers=headers)
+
+    # Activated at different times of day; the snapshot is rebuilt at a third
+    day = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=5)
+    first, second = sorted(db.query(Loan).filter(Loan.user_id == user_id), key=lambda l: l.amount_cents)
+    first.activated_at  = day + timedelta(hours=22)
+    second.activated_at = day + timedelta(days=1, hours=3)
+    db.delete(db.get(UserPosition, user_id))
+    db.commit()
+
+    class Clock(datetime):
+        at = day + timedelta(days=1, hours=10)
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls.at
+
+    monkeypatch.setattr(app.service, "datetime", Clock)
+    calculate_position(db, user_id)   # backfills the snapshot
+
+    for offset in (timedelta(days=2, hours=5), timedelta(days=2, hours=12), timedelta(days=2, hours=23),
+                   timedelta(days=3, hours=1)):
+        Clock.at = day + offset
+        loans = get_loan_totals(db, user_id, Clock.at)
+        assert calculate_position(db, user_id).total_interest == from_cents(loans.interest_as_of), offset
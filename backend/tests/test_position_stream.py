@@ -0,0 +1,76 @@
+import asyncio
+import json
+
+import httpx
+
+from app.main import app
+from app.position_events import InProcessBroker, LoopbackBroker, position_broker
+
+
+def _events(chunk: bytes) -> list[dict]:
+    return [
+        json.loads(block.split("data: ", 1)[1])
+        for block in chunk.decode().split("\n\n")
+        if block.startswith("event: position")
+    ]
+
+
+def test_stream_pushes_position_after_writes(auth_user):
+    user_id, headers = auth_user()
+
+    async def scenario():
+        chunks: asyncio.Queue[bytes] = asyncio.Queue()
+        disconnected = asyncio.Event()
+
+        async def receive():
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                assert dict(message["headers"])[b"content-type"].startswith(b"text/event-stream")
+            elif message.get("body"):
+                await chunks.put(message["body"])
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0", "spec_version": "2.3"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": "/position/stream", "raw_path": b"/position/stream",
+            "query_string": b"", "root_path": "", "client": ("test", 1), "server": ("test", 80),
+            "headers": [(b"host", b"test"), (b"authorization", headers["Authorization"].encode())],
+        }
+        stream = asyncio.create_task(app(scope, receive, send))
+        received = _events(await asyncio.wait_for(chunks.get(), 5))
+        assert position_broker.has_subscribers(user_id)
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            await http.post("/assets", headers=headers, json={"type": "property", "stated_value": 100_000})
+            received += _events(await asyncio.wait_for(chunks.get(), 5))
+            await http.post("/loans", headers=headers, json={"amount": 10_000})
+            received += _events(await asyncio.wait_for(chunks.get(), 5))
+
+        disconnected.set()
+        await asyncio.wait_for(stream, 5)
+        return received
+
+    initial, after_asset, after_loan = asyncio.run(scenario())
+    assert initial["total_eligible_collateral"] == 0
+    assert after_asset["total_eligible_collateral"] > 0 and after_asset["total_borrowed"] == 0
+    assert after_loan["total_borrowed"] == 10_000 and after_loan["health_factor"]
+    assert not position_broker.has_subscribers(user_id)
+
+
+def test_subscriptions_keep_only_the_latest_payload():
+    async def scenario(broker):
+        slow, other = broker.subscribe("u1"), broker.subscribe("u2")
+        for version in range(3):
+            broker.publish("u1", {"version": version})
+        await asyncio.sleep(0)   # let a dispatcher run
+        latest = await slow.get(timeout=1)
+        idle = await other.get(timeout=0.01)
+        slow.close()
+        other.close()
+        return latest, idle
+
+    for broker in (InProcessBroker(), LoopbackBroker()):
+        assert asyncio.run(scenario(broker)) == ({"version": 2}, None)
+    assert InProcessBroker().has_subscribers("u1") is False
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models import Asset, UserPosition
+from app.price_feed import Mark, MarkCache, PriceProvider, ReplayPriceProvider, refresh_marks
+from app.revaluation_service import apply_marks
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def test_replay_provider_serves_last_tick_at_clock(tmp_path):
+    path = tmp_path / "ticks.csv"
+    path.write_text(
+        "as_of,key,price\n"
+        f"{T0.isoformat()},crypto,1.0\n"
+        f"{(T0 + timedelta(minutes=5)).isoformat()},crypto,0.8\n"
+        f"{T0.isoformat()},property,1.02\n"
+    )
+    now = [T0 + timedelta(minutes=1)]
+    provider = ReplayPriceProvider(str(path), clock=lambda: now[0])
+
+    assert provider.fetch(["crypto", "property", "car"]) == {
+        "crypto": Mark("crypto", 1.0, T0),
+        "property": Mark("property", 1.02, T0),
+    }
+    now[0] += timedelta(minutes=10)
+    assert provider.fetch(["crypto"])["crypto"].price == 0.8
+
+
+def test_replay_provider_reads_json_lines(tmp_path):
+    path = tmp_path / "ticks.jsonl"
+    path.write_text('{"as_of": "2026-01-01T00:00:00", "key": "Car", "price": 0.9}\n')
+    assert ReplayPriceProvider(str(path), clock=lambda: T0).fetch(["car"])["car"].price == 0.9
+
+
+def test_mark_cache_serves_stale_marks_until_refreshed():
+    clock = [0.0]
+    cache = MarkCache(ttl=30, clock=lambda: clock[0])
+    assert cache.price("crypto") == 1.0
+    assert cache.stale_keys(["crypto"]) == ["crypto"]
+
+    assert set(cache.update([Mark("crypto", 0.9, T0), Mark("car", -1, T0)])) == {"crypto"}
+    assert cache.stale_keys(["crypto"]) == []
+    assert cache.update([Mark("crypto", 0.9, T0)]) == {}
+
+    clock[0] = 31
+    assert cache.stale_keys(["crypto"]) == ["crypto"]
+    assert cache.price("crypto") == 0.9
+
+
+def test_refresh_only_fetches_stale_keys():
+    class CountingProvider(PriceProvider):
+        def __init__(self):
+            self.calls = []
+
+        def fetch(self, keys):
+            keys = list(keys)
+            self.calls.append(keys)
+            return {key: Mark(key, 2.0, T0) for key in keys}
+
+    provider = CountingProvider()
+    cache = MarkCache(ttl=60)
+    assert set(refresh_marks(provider, cache, keys=["car", "crypto"])) == {"car", "crypto"}
+    assert refresh_marks(provider, cache, keys=["car", "crypto"]) == {}
+    assert provider.calls == [["car", "crypto"]]
+
+
+def test_preview_reads_cached_mark(client, auth_user, marks):
+    _, headers = auth_user()
+    marks.update([Mark("crypto", 1.25, T0)])
+
+    preview = client.post("/assets/preview", headers=headers, json={"type": "crypto", "stated_value": 1_000})
+    assert preview.status_code == 200
+    assert (preview.json()["mark"], preview.json()["appraised_value"]) == (1.25, 500)
+
+
+def test_apply_marks_reappraises_assets_and_snapshots(client, db, auth_user, marks):
+    user_id, headers = auth_user()
+    client.post("/assets", headers=headers, json={"type": "crypto", "stated_value": 10_000})
+    client.post("/assets", headers=headers, json={"type": "property", "stated_value": 100_000})
+    version = db.get(UserPosition, user_id).version
+
+    result = apply_marks(db, {"crypto": 0.5})
+    assert result.assets_reappraised >= 1 and result.positions_updated >= 1
+
+    db.expire_all()
+    by_type = {a.type: a for a in db.query(Asset).filter(Asset.user_id == user_id)}
+    assert by_type["crypto"].appraised_value == pytest.approx(2_500)
+    assert by_type["property"].appraised_value == pytest.approx(70_000)
+    position = db.get(UserPosition, user_id)
+    assert position.total_eligible_collateral_cents == 7_250_000
+    assert position.version == version + 1
+
+    # A deposit taken at the new mark is appraised relative to it
+    marks.update([Mark("crypto", 0.5, T0)])
+    asset = client.post("/assets", headers=headers, json={"type": "crypto", "stated_value": 1_000}).json()
+    apply_marks(db, {"crypto": 1.0})
+    db.expire_all()
+    assert db.get(Asset, asset["id"]).appraised_value == pytest.approx(1_000)
+    assert db.get(Asset, by_type["crypto"].id).appraised_value == pytest.approx(5_000)
+    assert client.get("/position", headers=headers).json()["total_eligible_collateral"] == pytest.approx(76_000)
@@ -0,0 +1,59 @@
+from app import auth_service
+from app.cache import TTLCache
+from app.models import User
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expiry_and_lru_eviction():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1          # "a" is now most recently used
+    cache.set("c", 3)                   # evicts "b"
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    clock.now = 10.5
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+def test_me_is_served_from_principal_cache(client, auth_user, monkeypatch):
+    user_id, headers = auth_user("Cached")
+    auth_service.principal_cache.clear()
+
+    calls = []
+    original = auth_service.async_service.get_user
+
+    async def counting_get_user(db, uid):
+        calls.append(uid)
+        return await original(db, uid)
+
+    monkeypatch.setattr(auth_service.async_service, "get_user", counting_get_user)
+
+    for _ in range(3):
+        assert client.get("/auth/me", headers=headers).json()["name"] == "Cached"
+    assert calls == [user_id]
+
+    # Id-only routes never load the principal
+    client.get("/position", headers=headers)
+    assert calls == [user_id]
+
+
+def test_user_update_invalidates_principal(client, db, auth_user):
+    user_id, headers = auth_user("Before")
+    assert client.get("/auth/me", headers=headers).json()["name"] == "Before"
+
+    user = db.get(User, user_id)
+    user.name = "After"
+    db.commit()
+
+    assert client.get("/auth/me", headers=headers).json()["name"] == "After"
@@ -0,0 +1,67 @@
+import pytest
+
+from app.liquidation_service import LIQUIDATE, scan_liquidations
+from app.models import Asset, UserExposure, UserPosition
+from app.revaluation_service import apply_marks
+
+
+def _exposures(db, user_id):
+    db.expire_all()
+    return {
+        e.asset_type: (e.units, e.eligible_collateral_cents)
+        for e in db.query(UserExposure).filter(UserExposure.user_id == user_id)
+    }
+
+
+def test_writers_maintain_exposures(client, db, auth_user):
+    user_id, headers = auth_user()
+    client.post("/assets", headers=headers, json={"type": "crypto", "stated_value": 10_000})
+    client.post("/assets/bulk", headers=headers, json={"assets": [
+        {"type": "crypto", "stated_value": 2_000},
+        {"type": "car", "stated_value": 20_000},
+    ]})
+
+    exposures = _exposures(db, user_id)
+    assert exposures["crypto"] == pytest.approx((600_000, 600_000))
+    eligible = sum(a.appraised_value_cents for a in db.query(Asset).filter(Asset.user_id == user_id))
+    assert sum(e for _, e in exposures.values()) == pytest.approx(eligible)
+
+
+def test_tick_touches_only_exposed_positions(client, db, auth_user, marks):
+    crypto_user, crypto_headers = auth_user()
+    property_user, property_headers = auth_user()
+    client.post("/assets", headers=crypto_headers, json={"type": "crypto", "stated_value": 10_000})
+    client.post("/assets", headers=crypto_headers, json={"type": "property", "stated_value": 100_000})
+    client.post("/assets", headers=property_headers, json={"type": "property", "stated_value": 100_000})
+    versions = {u: db.get(UserPosition, u).version for u in (crypto_user, property_user)}
+
+    apply_marks(db, {"crypto": 0.8})
+    apply_marks(db, {"crypto": 0.5})
+
+    db.expire_all()
+    assert db.get(UserPosition, property_user).version == versions[property_user]
+    position = db.get(UserPosition, crypto_user)
+    assert position.version == versions[crypto_user] + 2
+    assert position.total_eligible_collateral_cents == 250_000 + 7_000_000
+    assert _exposures(db, crypto_user)["crypto"] == pytest.approx((500_000, 250_000))
+
+
+def test_tick_reports_at_risk_positions(client, db, auth_user, marks):
+    safe, safe_headers = auth_user()
+    risky, risky_headers = auth_user()
+    client.post("/assets", headers=safe_headers, json={"type": "crypto", "stated_value": 10_000})
+    client.post("/loans", headers=safe_headers, json={"amount": 1_000})
+    client.post("/assets", headers=risky_headers, json={"type": "crypto", "stated_value": 10_000})
+    client.post("/loans", headers=risky_headers, json={"amount": 4_000})
+
+    at_risk = {p.user_id: p for p in apply_marks(db, {"crypto": 0.5}).at_risk}
+    assert safe not in at_risk
+    assert at_risk[risky].health_factor == pytest.approx(2_500 / 4_000, rel=1e-3)
+    assert at_risk[risky].below_minimum
+
+    # Once liquidated, the user no longer moves with crypto
+    db.query(Asset).filter(Asset.user_id == risky).update({"stated_value_cents": 500_000})
+    db.commit()
+    scan_liquidations(db, mode=LIQUIDATE)
+    assert _exposures(db, risky)["crypto"] == (0, 0)
+    assert risky not in {p.user_id for p in apply_marks(db, {"crypto": 0.4}).at_risk}
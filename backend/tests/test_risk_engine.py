@@ -0,0 +1,60 @@
+import numpy as np
+
+from app.risk_engine import (
+    evaluate_loan_eligibility,
+    evaluate_loan_eligibility_batch,
+    calculate_health_factor,
+    calculate_health_factor_batch,
+    calculate_ltv,
+    calculate_ltv_batch,
+    max_borrow_batch,
+)
+
+
+def _random_book(n, seed=7):
+    rng = np.random.default_rng(seed)
+    collateral = rng.uniform(0, 500_000, n)
+    collateral[::17] = 0.0                      # users with no collateral
+    debt = collateral * rng.uniform(0, 1.3, n)
+    debt[::11] = 0.0                            # users with no debt
+    requested = rng.uniform(1, 200_000, n)
+    return requested, collateral, debt
+
+
+def test_batch_matches_scalar_evaluation():
+    requested, collateral, debt = _random_book(5_000)
+    batch = evaluate_loan_eligibility_batch(requested, collateral, debt)
+
+    assert len(batch) == 5_000
+    for i in range(len(batch)):
+        expected = evaluate_loan_eligibility(requested[i], collateral[i], debt[i])
+        assert batch.row(i) == expected
+
+
+def test_batch_health_factor_and_ltv_match_scalar():
+    _, collateral, debt = _random_book(2_000, seed=11)
+    hf  = calculate_health_factor_batch(collateral, debt)
+    ltv = calculate_ltv_batch(debt, collateral)
+    for i in range(len(collateral)):
+        assert hf[i] == calculate_health_factor(collateral[i], debt[i])
+        assert ltv[i] == calculate_ltv(debt[i], collateral[i])
+
+
+def test_batch_broadcasts_amount_curve_for_one_user():
+    amounts = np.linspace(0, 20_000, 41)
+    batch = evaluate_loan_eligibility_batch(amounts, 10_000.0, 4_000.0)
+
+    # Anything up to the remaining 6,000 of headroom is approved
+    assert batch.approved.tolist() == (amounts <= 6_000).tolist()
+    assert np.all(batch.max_additional_borrow == 6_000.0)
+
+
+def test_max_borrow_is_the_approval_boundary():
+    # In cents, as the service calls it: whole numbers keep the boundary exact
+    _, collateral, debt = (np.round(a * 100) for a in _random_book(2_000, seed=3))
+    limit = np.floor(max_borrow_batch(collateral, debt))
+
+    assert np.all(limit[collateral <= 0] == 0.0)
+    headroom = limit > 0
+    assert evaluate_loan_eligibility_batch(limit[headroom], collateral[headroom], debt[headroom]).approved.all()
+    assert not evaluate_loan_eligibility_batch(limit + 1, collateral, debt).approved.any()
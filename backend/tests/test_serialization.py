@@ -0,0 +1,33 @@
+from fastapi.encoders import jsonable_encoder
+
+from app.models import Asset, Loan
+from app.schemas import AssetRead, AssetRecord, LoanRead, LoanRecord
+
+
+def test_records_mirror_read_schemas():
+    assert list(AssetRecord.__annotations__) == list(AssetRead.model_fields)
+    assert list(LoanRecord.__annotations__) == list(LoanRead.model_fields)
+
+
+def test_fast_list_paths_match_response_model_encoding(client, db, auth_user):
+    user_id, headers = auth_user()
+    client.post("/assets", headers=headers, json={"type": "property", "stated_value": 100_000.55, "description": "Flat"})
+    client.post("/assets", headers=headers, json={"type": "crypto", "stated_value": 2_000})
+    loan = client.post("/loans", headers=headers, json={"amount": 1_000.10}).json()
+    client.post(f"/loans/{loan['id']}/repay", headers=headers, json={"amount": 250.05})
+    client.post("/loans", headers=headers, json={"amount": 10_000_000})   # rejected
+
+    def expected(model, read):
+        rows = db.query(model).filter(model.user_id == user_id).order_by(model.created_at.desc(), model.id.desc())
+        return [jsonable_encoder(read.model_validate(row)) for row in rows]
+
+    db.expire_all()
+    assets = client.get("/assets", headers=headers)
+    loans  = client.get("/loans", headers=headers)
+    assert assets.headers["content-type"] == "application/json"
+    assert assets.json() == expected(Asset, AssetRead)
+    assert loans.json() == expected(Loan, LoanRead)
+    assert {l["status"] for l in loans.json()} == {"active", "rejected"}
+
+    page = client.get("/loans", headers=headers, params={"limit": 1})
+    assert len(page.json()) == 1 and page.headers["X-Next-Cursor"]
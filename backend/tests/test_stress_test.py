@@ -0,0 +1,96 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from app.models import UserExposure, UserPosition
+from app.rules import ASSET_TYPE_CONFIG, HEALTH_FACTOR_MIN, HEALTH_FACTOR_SAFE
+from app.stress_test_service import ASSET_TYPES, Book, Scenario, load_book, run_scenarios, scenario_grid
+
+
+def _reference(book, scenario):
+    """Scenario outcome position by position, in float64."""
+    below_safe = below_minimum = 0
+    shortfall = uncovered = 0.0
+    for debt, values in zip(book.debt, book.market_value):
+        shocked = [v * (1 + scenario.shocks.get(t, 0.0)) for t, v in zip(ASSET_TYPES, values)]
+        liquidation = sum(v * ASSET_TYPE_CONFIG[t].liquidation_threshold for t, v in zip(ASSET_TYPES, shocked))
+        health_factor = liquidation / debt
+        below_safe += health_factor < HEALTH_FACTOR_SAFE
+        below_minimum += health_factor < HEALTH_FACTOR_MIN
+        shortfall += max(debt * HEALTH_FACTOR_MIN - liquidation, 0.0)
+        uncovered += max(debt - sum(shocked), 0.0)
+    return below_safe, below_minimum, shortfall / 100, uncovered / 100
+
+
+def test_matrix_run_matches_position_by_position():
+    rng = np.random.default_rng(5)
+    n = 3_000
+    values = np.round(rng.lognormal(13, 1, (n, len(ASSET_TYPES))))
+    values[rng.random((n, len(ASSET_TYPES))) < 0.4] = 0.0
+    debt = np.round(values.sum(axis=1) * rng.uniform(0.05, 1.1, n)) + 1
+    book = Book(datetime.now(timezone.utc), [str(i) for i in range(n)], debt, values)
+    scenarios = scenario_grid({"crypto": [-1.0, -0.4, 0.0], "property": [-0.2, 0.1]}) + [Scenario("car", {"car": -0.5})]
+
+    results = run_scenarios(book, scenarios, block_size=1_000)   # several blocks
+    for result in results:
+        below_safe, below_minimum, shortfall, uncovered = _reference(book, result.scenario)
+        # float32 blocks: a position sitting exactly on a threshold may land either side
+        assert abs(result.below_safe - below_safe) <= 1
+        assert abs(result.below_minimum - below_minimum) <= 1
+        assert result.shortfall == pytest.approx(shortfall, rel=1e-5, abs=1)
+        assert result.uncovered_debt == pytest.approx(uncovered, rel=1e-5, abs=1)
+    assert [r.scenario.name for r in results[:2]] == ["crypto-100%,property-20%", "crypto-100%,property+10%"]
+
+
+def test_book_is_loaded_from_position_snapshots(client, db, auth_user):
+    user_id, headers = auth_user()
+    client.post("/assets", headers=headers, json={"type": "property", "stated_value": 200_000})
+    client.post("/assets", headers=headers, json={"type": "crypto", "stated_value": 50_000})
+    client.post("/loans", headers=headers, json={"amount": 60_000})
+    debt_free, headers = auth_user()
+    client.post("/assets", headers=headers, json={"type": "car", "stated_value": 10_000})
+
+    book = load_book(db, chunk_size=2)
+    assert debt_free not in book.user_ids and book.user_ids == sorted(book.user_ids)
+    i = book.user_ids.index(user_id)
+    assert book.debt[i] == 6_000_000
+    values = dict(zip(ASSET_TYPES, book.market_value[i]))
+    assert values == pytest.approx({"car": 0, "crypto": 5_000_000, "property": 20_000_000})
+
+    # Liquidation collateral 0.85 × 200k + 0.65 × 50k = 202.5k; crypto to zero leaves 170k
+    crash = Scenario("crypto wiped out", {"crypto": -1.0})
+    single = Book(book.as_of, [user_id], book.debt[i:i + 1], book.market_value[i:i + 1])
+    [result] = run_scenarios(single, [crash])
+    assert (result.below_safe, result.below_minimum, result.shortfall) == (0, 0, 0)
+    [result] = run_scenarios(single, [Scenario("both", {"crypto": -1.0, "property": -0.7})])
+    assert result.below_minimum == 1
+    assert result.shortfall == pytest.approx(60_000 - 0.85 * 60_000, abs=0.01)
+    assert result.uncovered_debt == 0
+
+
+def test_debtors_without_a_snapshot_are_read_from_loans_and_assets(client, db, auth_user):
+    user_id, headers = auth_user()
+    client.post("/assets", headers=headers, json={"type": "property", "stated_value": 200_000})
+    client.post("/assets", headers=headers, json={"type": "crypto", "stated_value": 50_000})
+    client.post("/loans", headers=headers, json={"amount": 60_000})
+    with_snapshot = load_book(db)
+    i = with_snapshot.user_ids.index(user_id)
+
+    # As for loans taken before user_positions existed
+    db.query(UserExposure).filter(UserExposure.user_id == user_id).delete()
+    db.query(UserPosition).filter(UserPosition.user_id == user_id).delete()
+    db.commit()
+
+    book = load_book(db, chunk_size=2)
+    assert book.without_snapshot == 1
+    assert book.user_ids == with_snapshot.user_ids
+    assert book.debt[i] == with_snapshot.debt[i]
+    assert book.market_value[i] == pytest.approx(with_snapshot.market_value[i])
+
+
+def test_invalid_scenarios_are_rejected():
+    with pytest.raises(ValueError):
+        Scenario("bad", {"gold": -0.1})
+    with pytest.raises(ValueError):
+        Scenario("bad", {"crypto": -1.5})
@@ -0,0 +1,76 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models import Loan, User, UserExposure, UserPosition
+from app.repository import get_collateral_totals, get_exposure_totals, get_loan_totals, get_rate_weighted_principal
+from app.synthetic_data_service import EMAIL_DOMAIN, GeneratorConfig, generate
+
+
+def _prefix() -> str:
+    return f"gen{uuid.uuid4().hex[:8]}-"
+
+
+def test_generated_snapshots_match_the_base_tables(db):
+    now = datetime(2026, 6, 1, 12, tzinfo=timezone.utc)
+    prefix = _prefix()
+    config = GeneratorConfig(users=60, email_prefix=prefix, max_utilization=0.75, seed=7)
+    result = generate(db, config, chunk_size=25, now=now)
+    assert (result.users, result.chunks) == (60, 3)
+
+    users = db.query(User).filter(User.email.like(f"{prefix}%")).all()
+    assert len(users) == 60
+    statuses = {status for (status,) in db.query(Loan.status).filter(Loan.user_id.in_([u.id for u in users]))}
+    assert statuses == {"active", "repaid", "rejected"}
+
+    for user in users:
+        position   = db.get(UserPosition, user.id)
+        collateral = get_collateral_totals(db, user.id)
+        debt       = get_loan_totals(db, user.id, now)
+        assert position.total_deposited_cents == collateral.total_deposited
+        assert position.total_eligible_collateral_cents == collateral.total_eligible
+        assert position.total_principal_cents == debt.principal_outstanding
+        assert position.accrued_interest_cents == debt.interest_as_of
+        assert position.rate_weighted_principal == pytest.approx(get_rate_weighted_principal(db, user.id))
+        assert position.total_principal_cents <= position.total_eligible_collateral_cents * 0.75 + 1
+
+        exposures = {e.asset_type: e for e in db.query(UserExposure).filter(UserExposure.user_id == user.id)}
+        totals = get_exposure_totals(db, user.id)
+        assert set(exposures) == {row.asset_type for row in totals}
+        for row in totals:
+            assert exposures[row.asset_type].eligible_collateral_cents == row.eligible_collateral_cents
+            assert exposures[row.asset_type].units == pytest.approx(row.units, abs=5)
+
+
+def test_generated_users_can_log_in_and_reruns_continue_numbering(client, db):
+    prefix = _prefix()
+    generate(db, GeneratorConfig(users=3, email_prefix=prefix, password="load-test-pw"))
+    generate(db, GeneratorConfig(users=2, email_prefix=prefix, password="load-test-pw"))
+
+    emails = sorted(email for (email,) in db.query(User.email).filter(User.email.like(f"{prefix}%")))
+    assert emails == [f"{prefix}{i}@{EMAIL_DOMAIN}" for i in range(5)]
+
+    login = client.post("/auth/login", json={"email": emails[-1], "password": "load-test-pw"})
+    assert login.status_code == 200
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    assert client.get("/position", headers=headers).status_code == 200
+
+
+def test_reruns_ignore_users_of_a_longer_prefix(db):
+    prefix = _prefix().replace("-", "_")
+    generate(db, GeneratorConfig(users=3, email_prefix=f"{prefix}x"))
+    generate(db, GeneratorConfig(users=2, email_prefix=f"{prefix[:-1]}-"))
+    generate(db, GeneratorConfig(users=2, email_prefix=prefix))
+
+    emails = {email for (email,) in db.query(User.email).filter(User.email.like(f"{prefix}%@{EMAIL_DOMAIN}"))}
+    assert {f"{prefix}0@{EMAIL_DOMAIN}", f"{prefix}1@{EMAIL_DOMAIN}"} <= emails
+
+
+def test_config_rejects_unknown_keys():
+    with pytest.raises(ValueError, match="Unknown asset mix"):
+        GeneratorConfig(users=1, asset_mix={"gold": 1.0})
+    with pytest.raises(ValueError, match="Unknown loan states"):
+        GeneratorConfig(users=1, loan_states={"pending": 1.0})
+    with pytest.raises(ValueError, match="max_utilization"):
+        GeneratorConfig(users=1, max_utilization=1.5)
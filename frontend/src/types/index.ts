@@ -12,7 +12,7 @@ export interface Asset {
   stated_value: number;
   appraised_value: number;
   ltv_ratio: number;
-  status: "active" | "locked" | "rejected";
+  status: "active" | "locked" | "rejected" | "liquidated";
   created_at: string;
 }
 